@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark deploy.py's copy strategies against an emulated slow removable volume.
+
+Python-level file I/O under the volume root (open/read/write, fsync, os.sync,
+stat, scandir, unlink, rmdir, mkdir, rename, chmod, utime) is wrapped to count
+every call and inject a configurable per-op latency, write bandwidth and fsync
+cost. With --fat-image (Linux, root, mkfs.vfat) the volume is a real loopback
+FAT filesystem and the wrappers are layered on top of it.
+
+Cases (source trees are resolved with the i18n resolver, as a deploy stages them):
+  full    empty volume       -> src/rfsuite (lang A)
+  edit    volume at lang A   -> same tree with one file edited
+  locale  volume at lang A   -> src/rfsuite resolved for lang B
+
+Strategies: mirror (mirror_copy), full (safe_full_copy; its deferred cleanup
+is reported as its own row), copyfile (throttled_copyfile of one large file)
+and rmtree (throttled_rmtree of a deployed tree).
+
+Example:
+  python .vscode/scripts/bench_deploy.py --profile radio --throttle adaptive
+  python .vscode/scripts/bench_deploy.py --case edit --strategy mirror --json out.json
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parents[1]
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import deploy  # noqa: E402
+import resolve_i18n_tags as resolver  # noqa: E402
+
+
+# Latency model per profile: seconds per metadata op / read op / write op,
+# write bandwidth in bytes/s (0 = unlimited) and seconds per fsync or sync.
+PROFILES = {
+    "none": {"op_s": 0.0, "read_s": 0.0, "write_s": 0.0, "write_bps": 0, "fsync_s": 0.0},
+    "radio": {"op_s": 0.002, "read_s": 0.0005, "write_s": 0.001, "write_bps": 6 * 1024 * 1024, "fsync_s": 0.025},
+    "slow": {"op_s": 0.008, "read_s": 0.002, "write_s": 0.004, "write_bps": 2 * 1024 * 1024, "fsync_s": 0.080},
+}
+
+CASES = ("full", "edit", "locale")
+STRATEGIES = ("mirror", "full", "copyfile", "rmtree")
+COUNTED_OPS = ("open", "read", "write", "fsync", "sync", "stat", "scandir", "unlink",
+               "rmdir", "mkdir", "rename", "chmod", "utime")
+CLEANUP_THREAD = "deploy-cleanup"
+
+
+class _VolumeRaw(io.RawIOBase):
+    """Raw file on the volume: counts and delays each read/write call (~ one syscall)."""
+
+    def __init__(self, volume, raw):
+        super().__init__()
+        self._volume = volume
+        self._raw = raw
+        self.name = raw.name
+
+    def readable(self):
+        return self._raw.readable()
+
+    def writable(self):
+        return self._raw.writable()
+
+    def seekable(self):
+        return self._raw.seekable()
+
+    def seek(self, pos, whence=0):
+        return self._raw.seek(pos, whence)
+
+    def tell(self):
+        return self._raw.tell()
+
+    def truncate(self, size=None):
+        return self._raw.truncate(size)
+
+    def fileno(self):
+        return self._raw.fileno()
+
+    def readinto(self, buf):
+        n = self._raw.readinto(buf)
+        self._volume._op("read", n or 0)
+        return n
+
+    def write(self, data):
+        n = self._raw.write(data)
+        self._volume._op("write", n if n is not None else len(data))
+        return n
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._volume._fds.discard(self._raw.fileno())
+            except (ValueError, OSError):
+                pass
+            self._raw.close()
+        super().close()
+
+
+class SlowVolume:
+    """
+    Emulated slow volume rooted at `root`: installs wrappers around the
+    Python-level os/builtins I/O functions while active. Counters are kept
+    per bucket; calls from the deferred-cleanup thread go to "cleanup".
+    """
+
+    def __init__(self, root, op_s=0.0, read_s=0.0, write_s=0.0, write_bps=0, fsync_s=0.0):
+        self.root = os.path.normpath(os.path.abspath(root))
+        self.op_s, self.read_s, self.write_s = op_s, read_s, write_s
+        self.write_bps, self.fsync_s = write_bps, fsync_s
+        self.active = False
+        self._fds = set()
+        self._lock = threading.Lock()
+        self._saved = {}
+        self.reset()
+
+    # --- accounting ---------------------------------------------------------
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+
+    def _bucket(self):
+        bucket_name = "cleanup" if threading.current_thread().name == CLEANUP_THREAD else "main"
+        bucket = self.counters.get(bucket_name)
+        if bucket is None:
+            bucket = self.counters[bucket_name] = {op: 0 for op in COUNTED_OPS}
+            bucket.update(bytes_read=0, bytes_written=0, io_s=0.0)
+        return bucket
+
+    def _op(self, op, nbytes=0):
+        if op == "write":
+            delay = self.write_s + (nbytes / self.write_bps if self.write_bps else 0.0)
+        elif op == "read":
+            delay = self.read_s
+        elif op in ("fsync", "sync"):
+            delay = self.fsync_s
+        else:
+            delay = self.op_s
+        with self._lock:
+            bucket = self._bucket()
+            bucket[op] += 1
+            bucket["io_s"] += delay
+            if op == "read":
+                bucket["bytes_read"] += nbytes
+            elif op == "write":
+                bucket["bytes_written"] += nbytes
+        if delay > 0:
+            time.sleep(delay)
+
+    def snapshot(self, bucket="main"):
+        with self._lock:
+            data = dict(self.counters.get(bucket) or {})
+        if data:
+            data["io_s"] = round(data["io_s"], 4)
+        return data
+
+    # --- path matching --------------------------------------------------------
+    def _on_volume(self, path):
+        if not self.active:
+            return False
+        if isinstance(path, int):
+            return path in self._fds
+        try:
+            path = os.fsdecode(os.fspath(path))
+        except TypeError:
+            return False
+        full = os.path.normpath(os.path.abspath(path))
+        return full == self.root or full.startswith(self.root + os.sep)
+
+    # --- wrappers ---------------------------------------------------------------
+    def _install(self):
+        real = self._saved
+        real.update(
+            open=builtins.open, os_open=os.open, close=os.close, fsync=os.fsync, sync=getattr(os, "sync", None),
+            stat=os.stat, lstat=os.lstat, scandir=os.scandir, unlink=os.unlink, remove=os.remove,
+            rmdir=os.rmdir, mkdir=os.mkdir, replace=os.replace, rename=os.rename, chmod=os.chmod,
+            utime=os.utime, sendfile=getattr(shutil, "_USE_CP_SENDFILE", None),
+        )
+        vol = self
+
+        def _open(file, mode="r", buffering=-1, encoding=None, errors=None, newline=None,
+                  closefd=True, opener=None):
+            if not vol._on_volume(file):
+                return real["open"](file, mode, buffering, encoding, errors, newline, closefd, opener)
+            # Rebuild io.open()'s layering on top of a counting raw file.
+            raw_mode = mode.replace("t", "") + ("" if "b" in mode else "b")
+            raw = _VolumeRaw(vol, real["open"](file, raw_mode, 0, closefd=closefd, opener=opener))
+            vol._op("open")
+            vol._fds.add(raw.fileno())
+            if "b" in mode and buffering == 0:
+                return raw
+            size = buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE
+            if "+" in mode:
+                buf = io.BufferedRandom(raw, size)
+            elif any(c in mode for c in "wax"):
+                buf = io.BufferedWriter(raw, size)
+            else:
+                buf = io.BufferedReader(raw, size)
+            if "b" in mode:
+                return buf
+            return io.TextIOWrapper(buf, encoding, errors, newline, line_buffering=buffering == 1)
+
+        def _os_open(path, flags, *args, **kwargs):
+            fd = real["os_open"](path, flags, *args, **kwargs)
+            if vol._on_volume(path):
+                vol._op("open")
+                vol._fds.add(fd)
+            return fd
+
+        def _close(fd):
+            vol._fds.discard(fd)
+            return real["close"](fd)
+
+        def _fsync(fd):
+            if vol._on_volume(fd if isinstance(fd, int) else fd.fileno()):
+                vol._op("fsync")
+            return real["fsync"](fd)
+
+        def _sync():
+            if vol.active:
+                vol._op("sync")
+            return real["sync"]()
+
+        def _wrap(name, op):
+            fn = real[name]
+
+            def wrapper(path, *args, **kwargs):
+                if vol._on_volume(path):
+                    vol._op(op)
+                return fn(path, *args, **kwargs)
+            return wrapper
+
+        def _wrap2(name, op):
+            fn = real[name]
+
+            def wrapper(src, dst, *args, **kwargs):
+                if vol._on_volume(src) or vol._on_volume(dst):
+                    vol._op(op)
+                return fn(src, dst, *args, **kwargs)
+            return wrapper
+
+        builtins.open = _open
+        os.open = _os_open
+        os.close = _close
+        os.fsync = _fsync
+        if real["sync"] is not None:
+            os.sync = _sync
+        os.stat = _wrap("stat", "stat")
+        os.lstat = _wrap("lstat", "stat")
+        os.scandir = _wrap("scandir", "scandir")
+        os.unlink = _wrap("unlink", "unlink")
+        os.remove = _wrap("remove", "unlink")
+        os.rmdir = _wrap("rmdir", "rmdir")
+        os.mkdir = _wrap("mkdir", "mkdir")
+        os.chmod = _wrap("chmod", "chmod")
+        os.utime = _wrap("utime", "utime")
+        os.replace = _wrap2("replace", "rename")
+        os.rename = _wrap2("rename", "rename")
+        # sendfile() would bypass the write wrapper.
+        if real["sendfile"] is not None:
+            shutil._USE_CP_SENDFILE = False
+
+    def _uninstall(self):
+        real = self._saved
+        builtins.open = real["open"]
+        os.open, os.close, os.fsync = real["os_open"], real["close"], real["fsync"]
+        if real["sync"] is not None:
+            os.sync = real["sync"]
+        os.stat, os.lstat, os.scandir = real["stat"], real["lstat"], real["scandir"]
+        os.unlink, os.remove, os.rmdir, os.mkdir = real["unlink"], real["remove"], real["rmdir"], real["mkdir"]
+        os.chmod, os.utime, os.replace, os.rename = real["chmod"], real["utime"], real["replace"], real["rename"]
+        if real["sendfile"] is not None:
+            shutil._USE_CP_SENDFILE = real["sendfile"]
+        self._saved = {}
+
+    def __enter__(self):
+        self._install()
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+        self._uninstall()
+
+    @contextlib.contextmanager
+    def measuring(self):
+        """Activate latency/counters for the enclosed block."""
+        self.reset()
+        self.active = True
+        try:
+            yield
+        finally:
+            self.active = False
+
+
+# --- loopback FAT image ------------------------------------------------------------
+
+@contextlib.contextmanager
+def fat_volume(size_mb):
+    """Mount a fresh loopback FAT image; yields its mountpoint or None when unavailable."""
+    reason = None
+    if platform.system() != "Linux":
+        reason = "not Linux"
+    elif os.geteuid() != 0:
+        reason = "needs root for mount -o loop"
+    elif not shutil.which("mkfs.vfat"):
+        reason = "mkfs.vfat not found"
+    if reason:
+        print(f"[BENCH] FAT image unavailable ({reason}); using a plain temp directory.")
+        yield None
+        return
+
+    work = tempfile.mkdtemp(prefix="rfsuite-bench-fat-")
+    image = os.path.join(work, "volume.img")
+    mnt = os.path.join(work, "mnt")
+    os.makedirs(mnt)
+    mounted = False
+    try:
+        with open(image, "wb") as f:
+            f.truncate(size_mb * 1024 * 1024)
+        subprocess.run(["mkfs.vfat", "-F", "32", "-n", "RFBENCH", image], check=True, capture_output=True)
+        subprocess.run(["mount", "-o", "loop", "-t", "vfat", image, mnt], check=True, capture_output=True)
+        mounted = True
+        print(f"[BENCH] Using loopback FAT32 image ({size_mb} MB) at {mnt}")
+        yield mnt
+    except subprocess.CalledProcessError as e:
+        print(f"[BENCH] FAT image setup failed ({e.stderr.decode(errors='replace').strip()}); "
+              "using a plain temp directory.")
+        yield None
+    finally:
+        if mounted:
+            subprocess.run(["umount", mnt], capture_output=True)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# --- source trees -------------------------------------------------------------------
+
+def _resolved_tree(dst, lang, quiet=True):
+    shutil.copytree(REPO_ROOT / "src" / "rfsuite", dst)
+    json_path = Path(dst) / "i18n" / f"{lang}.json"
+    with _quiet(quiet):
+        resolver.resolve_tree(Path(dst), resolver.load_translations(json_path))
+    return dst
+
+
+def prepare_sources(work, lang_a, lang_b):
+    """Source trees for each case: {"base", "full", "edit", "locale"}."""
+    base = _resolved_tree(os.path.join(work, f"src-{lang_a}", "rfsuite"), lang_a)
+    edit = os.path.join(work, "src-edit", "rfsuite")
+    shutil.copytree(base, edit)
+    with open(os.path.join(edit, "main.lua"), "a", encoding="utf-8") as f:
+        f.write("\n-- bench edit\n")
+    locale = _resolved_tree(os.path.join(work, f"src-{lang_b}", "rfsuite"), lang_b)
+    return {"base": base, "full": base, "edit": edit, "locale": locale}
+
+
+@contextlib.contextmanager
+def _quiet(enabled):
+    if not enabled:
+        yield
+        return
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        yield
+
+
+# --- runs -------------------------------------------------------------------------------
+
+def _reset_deploy_state(throttle):
+    deploy.DEPLOY_TO_RADIO = True
+    deploy.THROTTLE_MODE = throttle
+    deploy._copy_throttle.current = None
+
+
+def _measure(volume, label, fn, quiet):
+    sleep0 = deploy.TIMING.sleep_s
+    with volume.measuring():
+        t0 = time.perf_counter()
+        with _quiet(quiet):
+            fn()
+        wall = time.perf_counter() - t0
+    row = {"run": label, "wall_s": round(wall, 4), "sleep_s": round(deploy.TIMING.sleep_s - sleep0, 4)}
+    row.update(volume.snapshot("main"))
+    return row, volume.snapshot("cleanup")
+
+
+def run_case(volume, sources, case, strategies, throttle, quiet):
+    rows = []
+    case_root = os.path.join(volume.root, case)
+
+    def _fresh(name):
+        # Baseline install (unmeasured): empty for "full", lang A otherwise.
+        dest = os.path.join(case_root, name)
+        shutil.rmtree(dest, ignore_errors=True)
+        os.makedirs(dest)
+        out_dir = os.path.join(dest, "rfsuite")
+        if case != "full":
+            with _quiet(True):
+                deploy.mirror_copy(sources["base"], out_dir, radio=False)
+        return out_dir
+
+    src = sources[case]
+    for strategy in strategies:
+        _reset_deploy_state(throttle)
+        if strategy == "mirror":
+            out_dir = _fresh("mirror")
+            rows.append(_measure(volume, f"{case}/mirror_copy",
+                                 lambda: deploy.mirror_copy(src, out_dir, radio=True), quiet)[0])
+        elif strategy == "full":
+            out_dir = _fresh("full")
+            row, background = _measure(volume, f"{case}/safe_full_copy",
+                                       lambda: deploy.safe_full_copy(src, out_dir), quiet)
+            rows.append(row)
+            # Deferred cleanup of <tgt>.old: the wait after the copy, plus every
+            # op the background thread issued during and after it.
+            wait, after = _measure(volume, f"{case}/safe_full_copy cleanup",
+                                   lambda: deploy.CLEANUP.finish(None), quiet)
+            for key, value in after.items():
+                background[key] = background.get(key, 0) + value
+            if background:
+                wait.update(background)
+                wait["io_s"] = round(wait["io_s"], 4)
+                rows.append(wait)
+        elif strategy == "copyfile" and case == "full":
+            largest = max((os.path.join(r, f) for r, _, fs in os.walk(src) for f in fs), key=os.path.getsize)
+            dst = os.path.join(case_root, "copyfile", os.path.basename(largest))
+            shutil.rmtree(os.path.dirname(dst), ignore_errors=True)
+            rows.append(_measure(volume, f"{case}/throttled_copyfile ({os.path.getsize(largest) // 1024} KiB)",
+                                 lambda: deploy.throttled_copyfile(largest, dst), quiet)[0])
+        elif strategy == "rmtree" and case == "full":
+            out_dir = os.path.join(case_root, "rmtree", "rfsuite")
+            shutil.rmtree(os.path.dirname(out_dir), ignore_errors=True)
+            with _quiet(True):
+                deploy.mirror_copy(src, out_dir, radio=False)
+            rows.append(_measure(volume, f"{case}/throttled_rmtree",
+                                 lambda: deploy.throttled_rmtree(out_dir), quiet)[0])
+    return rows
+
+
+def print_table(rows):
+    cols = ("wall_s", "io_s", "sleep_s", "open", "write", "fsync", "sync", "stat", "scandir", "unlink", "rmdir")
+    print(f"{'run':<44} " + " ".join(f"{c:>8}" for c in cols) + f" {'MB w':>7} {'MB r':>7}")
+    for row in rows:
+        cells = []
+        for c in cols:
+            v = row.get(c, 0)
+            cells.append(f"{v:>8.2f}" if isinstance(v, float) else f"{v:>8}")
+        print(f"{row['run'][:44]:<44} " + " ".join(cells)
+              + f" {row.get('bytes_written', 0) / 1048576:>7.2f} {row.get('bytes_read', 0) / 1048576:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deploy copy strategies on an emulated slow volume.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="radio",
+                        help="Latency model for the emulated volume (default: radio).")
+    parser.add_argument("--op-ms", type=float, help="Override per metadata-op latency (ms).")
+    parser.add_argument("--fsync-ms", type=float, help="Override fsync/sync cost (ms).")
+    parser.add_argument("--write-mbps", type=float, help="Override write bandwidth (MB/s, 0 = unlimited).")
+    parser.add_argument("--case", dest="cases", action="append", choices=CASES,
+                        help="Case to run; repeatable (default: all).")
+    parser.add_argument("--strategy", dest="strategies", action="append", choices=STRATEGIES,
+                        help="Strategy to run; repeatable (default: all).")
+    parser.add_argument("--throttle", choices=deploy.THROTTLE_MODES, default="adaptive")
+    parser.add_argument("--no-defer-cleanup", action="store_true",
+                        help="Benchmark safe_full_copy with blocking .old deletion.")
+    parser.add_argument("--lang-a", default="en")
+    parser.add_argument("--lang-b", default="de", help="Locale for the locale-switch case (default: de).")
+    parser.add_argument("--fat-image", type=int, metavar="MB", default=0,
+                        help="Run on a loopback FAT32 image of this size (Linux, root).")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON ('-' for stdout).")
+    parser.add_argument("--verbose", action="store_true", help="Show deploy.py output during runs.")
+    args = parser.parse_args()
+
+    model = dict(PROFILES[args.profile])
+    if args.op_ms is not None:
+        model["op_s"] = args.op_ms / 1000.0
+    if args.fsync_ms is not None:
+        model["fsync_s"] = args.fsync_ms / 1000.0
+    if args.write_mbps is not None:
+        model["write_bps"] = int(args.write_mbps * 1024 * 1024)
+    deploy.DEFER_CLEANUP = not args.no_defer_cleanup
+    cases = args.cases or list(CASES)
+    strategies = args.strategies or list(STRATEGIES)
+
+    work = tempfile.mkdtemp(prefix="rfsuite-bench-")
+    rows = []
+    try:
+        print(f"[BENCH] Preparing source trees ({args.lang_a}, {args.lang_b}) in {work}...")
+        sources = prepare_sources(work, args.lang_a, args.lang_b)
+        with contextlib.ExitStack() as stack:
+            root = stack.enter_context(fat_volume(args.fat_image)) if args.fat_image else None
+            root = root or os.path.join(work, "volume")
+            os.makedirs(root, exist_ok=True)
+            volume = stack.enter_context(SlowVolume(root, **model))
+            print(f"[BENCH] Volume {root}: profile={args.profile} {json.dumps(model)} throttle={args.throttle}")
+            for case in cases:
+                rows.extend(run_case(volume, sources, case, strategies, args.throttle, not args.verbose))
+                shutil.rmtree(os.path.join(root, case), ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print_table(rows)
+    if args.json:
+        payload = {"profile": args.profile, "model": model, "throttle": args.throttle,
+                   "fat_image_mb": args.fat_image, "runs": rows}
+        if args.json == "-":
+            print(json.dumps(payload, indent=2))
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            print(f"[BENCH] Wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,12 +3,14 @@
 """
 Ethos Radio USB HID and deployment interface (cross-platform).
 
-This module provides a unified interface for radio control on Windows and macOS.
-Platform-specific drive management is handled by connect_windows.py or connect_macos.py.
+This module provides a unified interface for radio control on Windows, macOS and Linux.
+Platform-specific drive management is handled by connect_windows.py, connect_macos.py or
+connect_linux.py.
 
 Public API (stable across platforms):
   - RadioInterface: Main class for radio HID control and drive discovery
   - RadioInformation: Dataclass with board and storage info
+  - RadioSession: Keeps one RadioInterface open across calls (reopens on re-enumeration)
   - flash_device(): Flash a .frsk device file
   - flash_firmware(): Flash a firmware.bin image
 """
@@ -20,7 +22,7 @@ import argparse
 import time
 
 # Import base and platform-independent constants
-from connect_base import RadioInformation
+from connect_base import RadioInformation, RadioSession
 
 # Select platform-specific implementation
 if platform.system() == "Windows":
@@ -35,9 +37,12 @@ elif platform.system() == "Darwin":
     def unmount_drive(drive):
         """Unmount via diskutil; called by RadioInterface.unmount_drives()."""
         pass
+elif platform.system() == "Linux":
+    from connect_linux import LinuxRadioInterface as RadioInterface, lock_drive
 else:
     raise SystemExit("System/OS not yet supported")
 
+__all__ = ["RadioInterface", "RadioInformation", "RadioSession", "flash_device", "flash_firmware"]
 
 
 def flash_device(frsk):
@@ -87,8 +92,13 @@ def massstorage_test():
 
         print("  stop the debug session ...")
         radio = RadioInterface()
-        radio.stop_usb_debug()
-        time.sleep(1)
+        with radio.switch_usb_mode("storage") as switch:
+            drives = switch.wait(10)
+        radio.close()
+        if drives:
+            print(f"  storage mode after {switch.latency_s:.2f}s: {drives}")
+        else:
+            print("  storage mode not observed within 10s")
 
 
 def main():
@@ -3,14 +3,17 @@
 """
 Cross-platform HID protocol and state management for Ethos radio.
 
-This module contains the platform-neutral RadioInterface base class and
-the HID protocol constants. Platform-specific drive management is delegated
-to connect_windows.py or connect_macos.py.
+This module contains the platform-neutral RadioInterface base class, the
+RadioSession that keeps one of them open across a deploy, and the HID
+protocol constants. Platform-specific drive management is delegated
+to connect_windows.py, connect_macos.py or connect_linux.py.
 """
 
 from dataclasses import dataclass
 import time
 
+from hotplug import ModeSwitch
+
 try:
     import hid
 except ModuleNotFoundError:
@@ -37,6 +40,11 @@ ETHOS_VENDOR_ID = 0x0483
 # 0x5740 is seen on some devices/firmware states during re-enumeration.
 ETHOS_PRODUCT_IDS = (0x5750, 0x5740)
 
+# Upper bound for the post-open readiness probe (formerly a fixed 1 s sleep).
+READY_TIMEOUT_S = 1.0
+READY_POLL_MS = 50
+ALIVE_TIMEOUT_MS = 50
+
 
 @dataclass
 class RadioInformation:
@@ -68,8 +76,9 @@ class RadioInterfaceBase(hid.Device):
                     summary = self._summarize_ethos_candidates()
                     raise RuntimeError(f"No Ethos compatible HID device found ({summary})") from last_error
 
-        # Give the platform a moment to finish enumerating/mounting
-        time.sleep(1)
+        # Ready as soon as the radio answers an information request, instead
+        # of a fixed 1 s settle.
+        self.information = self.probe_ready(READY_TIMEOUT_S)
 
         self.drives = {}
 
@@ -143,6 +152,37 @@ class RadioInterfaceBase(hid.Device):
         except Exception:
             return "unable to enumerate HID devices"
 
+    def probe_ready(self, timeout=READY_TIMEOUT_S):
+        """
+        Poll the radio with information requests until it answers or
+        `timeout` passes. Returns the RadioInformation, or None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            try:
+                self.write(bytes([0x00, ETHOS_SUITE_INFORMATION_REQUEST, 6]))
+                result = self.read(256, max(1, min(READY_POLL_MS, remaining_ms)))
+            except Exception:
+                result = None
+            if result:
+                board = result[2]
+                return RadioInformation(
+                    board=board,
+                    default_storage="sdcard" if board in [4, 5, 6, 11] else "radio",
+                )
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.02)
+
+    def is_alive(self, timeout_ms=ALIVE_TIMEOUT_MS):
+        """Cheap revalidation: True if the open handle still gets an answer."""
+        try:
+            self.write(bytes([0x00, ETHOS_SUITE_INFORMATION_REQUEST, 6]))
+            return bool(self.read(256, timeout_ms))
+        except Exception:
+            return False
+
     def request_information(self):
         """Query radio board and storage info via HID."""
         self.write(bytes([0x00, ETHOS_SUITE_INFORMATION_REQUEST, 6]))
@@ -174,6 +214,35 @@ class RadioInterfaceBase(hid.Device):
         """Switch radio to mass-storage mode via HID."""
         self.write(bytes([0x00, ETHOS_SUITE_USB_MODE_REQUEST, 0x69]))
 
+    def switch_usb_mode(self, target, probe=None, watcher=None):
+        """
+        Request "serial" (USB debug) or "storage" mode and return a
+        hotplug.ModeSwitch: its wait(timeout) resolves once `probe` observes
+        the new mode and records the latency. Serial needs a probe for the
+        ACM port (pyserial is not a dependency here); storage defaults to
+        this interface's drive scan and mount watcher.
+
+            with radio.switch_usb_mode("storage") as switch:
+                drives = switch.wait(10)
+        """
+        if target == "serial":
+            if probe is None:
+                raise ValueError("serial mode switch needs a probe for the ACM port")
+            switch = ModeSwitch(target, probe, watcher)
+            self.start_usb_debug()
+        elif target == "storage":
+            if watcher is None:
+                watcher = self._mount_watcher()
+            switch = ModeSwitch(target, probe or self.scan_for_drives, watcher)
+            self.stop_usb_debug()
+        else:
+            raise ValueError(f"Unknown USB mode: {target}")
+        return switch
+
+    def _mount_watcher(self):
+        """Watcher that wakes on volume mounts, or None to poll the drive scan."""
+        return None
+
     def flash_frsk(self):
         """Trigger .frsk flash via HID."""
         self.write(bytes([0x00, ETHOS_SUITE_FLASH_FRSK_REQUEST]))
@@ -181,3 +250,73 @@ class RadioInterfaceBase(hid.Device):
     def flash_firmware(self):
         """Trigger firmware flash via HID."""
         self.write(bytes([0x00, ETHOS_SUITE_FLASH_FIRMWARE_REQUEST]))
+
+
+def _hid_signature():
+    """Identity of the Ethos HID interfaces currently enumerated (changes on re-enumeration)."""
+    try:
+        return tuple(sorted(
+            (str(d.get("path")), d.get("product_id"))
+            for d in hid.enumerate()
+            if d.get("vendor_id") == ETHOS_VENDOR_ID
+        ))
+    except Exception:
+        return None
+
+
+class RadioSession:
+    """
+    One RadioInterface for a whole deploy.
+
+    get() hands out the open interface after a cheap is_alive() check and
+    reopens only when the handle is dead. After a failed open it does not
+    retry until the Ethos HID enumeration changes, so repeated calls while
+    no radio is attached return immediately. Call invalidate() after a USB
+    mode switch: the radio re-enumerates and the handle goes stale. A
+    long-lived owner calls forget_failure() when a new deploy starts, so
+    one deploy's failed open is never replayed to the next.
+    """
+
+    def __init__(self, factory, retries=10, retry_delay=0.5):
+        self.factory = factory
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.opens = 0
+        self._radio = None
+        self._failed_signature = None
+        self._failed_error = None
+
+    def get(self):
+        radio = self._radio
+        if radio is not None:
+            if radio.is_alive():
+                return radio
+            self.invalidate()
+        signature = _hid_signature()
+        if self._failed_error is not None and signature == self._failed_signature:
+            raise self._failed_error
+        try:
+            self._radio = self.factory(retries=self.retries, retry_delay=self.retry_delay)
+        except Exception as e:
+            self._failed_signature = signature
+            self._failed_error = e
+            raise
+        self._failed_signature = self._failed_error = None
+        self.opens += 1
+        return self._radio
+
+    def forget_failure(self):
+        """Clear the failed-open cache so the next get() tries again; an open handle is kept."""
+        self._failed_signature = self._failed_error = None
+
+    def invalidate(self):
+        """Drop the handle; the next get() reopens."""
+        radio, self._radio = self._radio, None
+        self._failed_signature = self._failed_error = None
+        if radio is not None:
+            try:
+                radio.close()
+            except Exception:
+                pass
+
+    close = invalidate
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Linux-specific drive management for Ethos radio deployment.
+
+Discovers radio volumes in one pass over /proc/self/mountinfo, matching the
+flash/sdcard/radio .cpuid markers (or radio.bin) on each mounted filesystem,
+wherever the desktop automounted them (/media/$USER, /run/media/$USER, ...).
+Unmounting goes through udisksctl, which works unprivileged for automounted
+volumes, with umount as fallback. There is no volume lock on Linux; lock_drive
+flushes pending writes instead.
+"""
+
+import os
+import subprocess
+from connect_base import RadioInterfaceBase
+import hotplug
+
+
+def mountinfo_path():
+    """Mount table to read; env DEPLOY_MOUNTINFO points at a fake table for tests."""
+    return os.environ.get("DEPLOY_MOUNTINFO") or hotplug.MOUNTINFO
+
+
+def _run(cmd):
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, f"{type(e).__name__}: {e}"
+    return result.returncode == 0, (result.stderr or result.stdout or "").strip()
+
+
+def unmount_drive(drive, source=None):
+    """Flush and unmount one radio volume: udisksctl first, then umount."""
+    os.sync()
+    errors = []
+    if source and source.startswith("/dev/"):
+        ok, msg = _run(["udisksctl", "unmount", "--no-user-interaction", "-b", source])
+        if ok:
+            return True
+        errors.append(f"udisksctl: {msg}")
+    ok, msg = _run(["umount", drive])
+    if ok:
+        return True
+    errors.append(f"umount: {msg}")
+    print(f"[Linux] Unmount {drive} failed ({'; '.join(errors)}); continuing anyway.")
+    return False
+
+
+def lock_drive(drive):
+    """No volume lock on Linux: flush pending writes so the radio sees complete files."""
+    os.sync()
+
+
+class LinuxRadioInterface(RadioInterfaceBase):
+    """Linux implementation: drive discovery via the mount table."""
+
+    def __init__(self, retries=10, retry_delay=0.5, mountinfo=None):
+        self.mountinfo = mountinfo
+        self.sources = {}
+        super().__init__(retries=retries, retry_delay=retry_delay)
+        self._scan_drives_internal()
+
+    def unmount_drives(self):
+        """
+        Unmount all discovered drives before a USB mode switch.
+
+        Best-effort, like macOS: pending writes are flushed first, and a
+        failed unmount does not stop the HID mode switch.
+        """
+        for key, drive in sorted(self.drives.items()):
+            unmount_drive(drive, self.sources.get(drive))
+
+    def _scan_drives_internal(self):
+        """Populate self.drives from the cpuid markers of mounted volumes."""
+        mounts = hotplug.read_mounts(self.mountinfo or mountinfo_path())
+        self.drives = hotplug.find_radio_volumes(mounts)
+        sources = {os.path.normpath(mp): src for mp, _, src in mounts}
+        self.sources = {d: sources.get(d, "") for d in self.drives.values()}
+
+    def _mount_watcher(self):
+        """Mount-table watcher, so storage mode switches resolve on the mount event."""
+        try:
+            return hotplug.MountWatcher(self.mountinfo or mountinfo_path())
+        except Exception:
+            return None
+
+    def scan_for_drives(self):
+        """
+        Public API for deploy tooling.
+        Rereads the mount table for cpuid markers and returns self.drives.
+        """
+        self._scan_drives_internal()
+        return self.drives
+
+    def get_scripts_dir(self):
+        """Return the mounted scripts directory, or None."""
+        self.scan_for_drives()
+
+        # Prefer sdcard / radio over flash
+        for key in ("sdcard", "radio", "flash"):
+            root = self.drives.get(key)
+            if root:
+                scripts = os.path.join(root, "scripts")
+                if os.path.isdir(scripts):
+                    return os.path.normpath(scripts)
+
+        return None
@@ -2,14 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import csv
 import glob
 import json
 import os
 import platform
 import subprocess
 import sys
+import threading
 import time
 
+import hotplug
+
 
 ETHOS_VENDOR_ID = 0x0483
 
@@ -54,6 +58,21 @@ def _list_volumes():
                         "scripts": os.path.isdir(os.path.join(root, "scripts")),
                     }
                 )
+    # Linux automounts live one level deeper (/media/$USER/..., /run/media/$USER/...).
+    if os.path.exists(hotplug.MOUNTINFO):
+        seen = {v["root"] for v in volumes}
+        by_root = {}
+        for key, root in hotplug.find_radio_volumes(hotplug.read_mounts()).items():
+            by_root.setdefault(root, []).append(key)
+        for root, markers in sorted(by_root.items()):
+            if root not in seen:
+                volumes.append(
+                    {
+                        "root": root,
+                        "markers": [k for k in ("flash", "sdcard", "radio") if k in markers],
+                        "scripts": os.path.isdir(os.path.join(root, "scripts")),
+                    }
+                )
     return volumes
 
 
@@ -173,6 +192,187 @@ def _switch_usb_mode(action, wait_s):
     return result
 
 
+# --- trace mode --------------------------------------------------------------
+#
+# Samples volumes, serial ports and Ethos HID interfaces in a tight loop and
+# records when each one appears or disappears, optionally around a mode
+# switch requested on a second thread. The timeline shows how long a given
+# radio takes to drop HID, mount its volumes or bring up the ACM port, which
+# is what the deploy timeouts and retry cadences should be sized from.
+
+TRACE_FIELDS = ("t_ms", "source", "event", "id", "detail")
+
+
+def _trace_hid():
+    hid_state = _list_hid_devices()
+    if hid_state.get("error"):
+        raise RuntimeError(hid_state["error"])
+    return {
+        f"{d['vendor_id']:04x}:{d['product_id']:04x} {d['path']}": d.get("product_string") or ""
+        for d in hid_state["devices"]
+    }
+
+
+def _trace_serial():
+    serial_state = _list_serial_ports()
+    if serial_state.get("error"):
+        raise RuntimeError(serial_state["error"])
+    return {
+        p["device"]: (f"{p['vid']:04x}:{p['pid']:04x} " if p["vid"] is not None else "") + (p["description"] or "")
+        for p in serial_state["ports"]
+    }
+
+
+def _trace_volumes():
+    return {v["root"]: ",".join(v["markers"]) + (" scripts" if v["scripts"] else "") for v in _list_volumes()}
+
+
+TRACE_SOURCES = (("hid", _trace_hid), ("serial", _trace_serial), ("volume", _trace_volumes))
+
+
+class _TraceSwitch(threading.Thread):
+    """Open the radio and request the mode switch, timestamping each step."""
+
+    def __init__(self, action, clock):
+        super().__init__(daemon=True)
+        self.action = action
+        self.clock = clock
+        self.steps = []
+        self.radio = None
+
+    def mark(self, step, detail=""):
+        self.steps.append((self.clock(), step, detail))
+
+    def run(self):
+        self.mark("open")
+        radio = None
+        try:
+            import connect
+            radio = connect.RadioInterface()
+            info = getattr(radio, "information", None)
+            if info is not None:
+                self.radio = {"board": info.board, "default_storage": info.default_storage}
+            self.mark("opened", type(radio).__name__)
+            self.mark("request", self.action)
+            if self.action == "start":
+                radio.start_usb_debug()
+            else:
+                radio.stop_usb_debug()
+            self.mark("sent")
+        except Exception as exc:
+            self.mark("error", f"{type(exc).__name__}: {exc}")
+        finally:
+            try:
+                if radio is not None:
+                    radio.close()
+            except Exception:
+                pass
+
+
+def _trace(duration, interval_ms, action=None, lead_s=0.2):
+    started = time.perf_counter()
+
+    def clock():
+        return (time.perf_counter() - started) * 1000.0
+
+    events = []
+    errors = {}
+    stats = {}
+    state = {}
+    for name, sampler in TRACE_SOURCES:
+        try:
+            state[name] = sampler()
+        except Exception as exc:
+            errors[name] = str(exc)
+        stats[name] = {"samples": 0, "last_ms": None, "max_gap_ms": 0.0, "total_ms": 0.0}
+    initial = {name: sorted(items) for name, items in state.items()}
+
+    switch = None
+    interval = max(0.0, interval_ms / 1000.0)
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        if action and switch is None and time.perf_counter() - started >= lead_s:
+            switch = _TraceSwitch(action, clock)
+            switch.start()
+        for name, sampler in TRACE_SOURCES:
+            if name in errors:
+                continue
+            t0 = clock()
+            try:
+                items = sampler()
+            except Exception:
+                # Enumeration can fail transiently while the device re-enumerates.
+                continue
+            t = clock()
+            st = stats[name]
+            st["samples"] += 1
+            st["total_ms"] += t - t0
+            if st["last_ms"] is not None:
+                st["max_gap_ms"] = max(st["max_gap_ms"], t - st["last_ms"])
+            st["last_ms"] = t
+            before = state[name]
+            for key in sorted(before.keys() - items.keys()):
+                events.append((t, name, "disappeared", key, before[key]))
+            for key in sorted(items.keys() - before.keys()):
+                events.append((t, name, "appeared", key, items[key]))
+            state[name] = items
+        if interval:
+            time.sleep(interval)
+    if switch is not None:
+        switch.join(timeout=5.0)
+        events.extend((t, "switch", step, "", detail) for t, step, detail in switch.steps)
+    events.sort(key=lambda e: e[0])
+
+    timeline = [dict(zip(TRACE_FIELDS, (round(e[0], 1),) + e[1:])) for e in events]
+    resolution = {
+        name: {
+            "samples": st["samples"],
+            "mean_sample_ms": round(st["total_ms"] / st["samples"], 2) if st["samples"] else None,
+            "max_gap_ms": round(st["max_gap_ms"], 1),
+        }
+        for name, st in stats.items() if name not in errors
+    }
+
+    # First change per device after the request: the numbers to size waits from.
+    summary = {}
+    sent = next((e["t_ms"] for e in timeline if e["source"] == "switch" and e["event"] == "request"), None)
+    if sent is not None:
+        for e in timeline:
+            if e["source"] == "switch" or e["t_ms"] < sent:
+                continue
+            summary.setdefault(f"{e['source']} {e['event']}", {}).setdefault(e["id"], round(e["t_ms"] - sent, 1))
+
+    return {
+        "switch": action,
+        "duration_s": duration,
+        "interval_ms": interval_ms,
+        "radio": switch.radio if switch is not None else None,
+        "initial": initial,
+        "errors": errors,
+        "resolution": resolution,
+        "after_request_ms": summary,
+        "timeline": timeline,
+    }
+
+
+def _write_trace(trace, out=None, fmt=None):
+    fmt = fmt or ("csv" if out and out.lower().endswith(".csv") else "json")
+    f = open(out, "w", newline="", encoding="utf-8") if out else sys.stdout
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=TRACE_FIELDS)
+            writer.writeheader()
+            writer.writerows(trace["timeline"])
+        else:
+            json.dump(trace, f, indent=2)
+            f.write("\n")
+    finally:
+        if out:
+            f.close()
+    if out:
+        print(f"[TRACE] {len(trace['timeline'])} event(s) written to {out}", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Debug Ethos radio USB/HID/serial state")
     parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
@@ -187,8 +387,27 @@ def main():
         default=3.0,
         help="Seconds to wait after --switch before collecting post-switch state.",
     )
+    parser.add_argument(
+        "--trace",
+        type=float,
+        metavar="SECONDS",
+        help="Sample volumes, serial ports and HID devices for SECONDS (around --switch, if given) "
+             "and emit a timeline of appear/disappear events.",
+    )
+    parser.add_argument("--trace-interval", type=float, default=10.0, metavar="MS",
+                        help="Pause between trace samples in ms (default: 10).")
+    parser.add_argument("--trace-out", metavar="FILE",
+                        help="Write the trace to FILE (.csv for CSV, otherwise JSON) instead of stdout.")
+    parser.add_argument("--trace-format", choices=("json", "csv"),
+                        help="Trace output format (default: from --trace-out, else JSON).")
     args = parser.parse_args()
 
+    if args.trace:
+        trace = _trace(args.trace, args.trace_interval, action=args.switch)
+        trace["platform"] = {"system": platform.system(), "release": platform.release()}
+        _write_trace(trace, args.trace_out, args.trace_format)
+        return 0
+
     payload = {
         "platform": {
             "system": platform.system(),
@@ -7,6 +7,10 @@ try:
     import subprocess_conout
 except Exception:
     subprocess_conout = None
+import hotplug
+import serial_log
+import serial_metrics
+import verify_pool
 import sys
 import stat
 try:
@@ -26,13 +30,165 @@ except Exception:
     def tqdm(*args, **kwargs):
         return _NoopTqdm(**kwargs)
 import re
+import fnmatch
 import shlex
 import time
 import atexit, signal, tempfile
+import copy
+import threading
 import platform
 from hashlib import md5
 from glob import glob
 from pathlib import Path
+from contextlib import contextmanager
+
+
+# === Timing report ==============================================================
+# Every deploy records wall time, sleep time, files and bytes per phase
+# (config, lock, mount wait, staging, each step, verify, copy, stale delete,
+# settle). Printed with --timing-report json|table, appended as one JSON line
+# per deploy with --timing-history FILE.
+
+class DeployTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.records = []
+        self.sleep_s = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._emitted = False
+
+    @property
+    def _stack(self):
+        # Phases nest per thread (targets deploy concurrently).
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _new_record(self, name, files=0, nbytes=0):
+        rec = {"name": name, "depth": len(self._stack), "wall_s": 0.0, "sleep_s": 0.0,
+               "files": files, "bytes": nbytes}
+        label = getattr(self._local, "label", None)
+        if label:
+            rec["target"] = label
+        self.records.append(rec)
+        return rec
+
+    def set_label(self, label, background=False):
+        """Tag phases recorded by the current thread with a target name."""
+        self._local.label = label
+        self._local.background = background
+
+    @contextmanager
+    def phase(self, name, files=0, nbytes=0):
+        """Time a phase; the yielded dict's 'files'/'bytes' may be updated inside."""
+        rec = self._new_record(name, files, nbytes)
+        self._stack.append(rec)
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["wall_s"] = time.perf_counter() - t0
+            self._stack.remove(rec)
+
+    def record(self, name, wall_s, files=0, nbytes=0):
+        """Record an already-measured phase."""
+        self._new_record(name, files, nbytes)["wall_s"] = wall_s
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        if not getattr(self._local, "background", False):
+            # Background work does not hold up the deploy.
+            with self._lock:
+                self.sleep_s += seconds
+        for rec in self._stack:
+            rec["sleep_s"] += seconds
+
+    def summary(self):
+        return {
+            "time": self.started_at,
+            "argv": sys.argv[1:],
+            "total_s": round(time.perf_counter() - self.started, 4),
+            "sleep_s": round(self.sleep_s, 4),
+            "phases": [dict(r, wall_s=round(r["wall_s"], 4), sleep_s=round(r["sleep_s"], 4))
+                       for r in self.records],
+        }
+
+    def emit(self, fmt=None, history=None):
+        """Print the report (once) and append it to the history file."""
+        if self._emitted or (not fmt and not history):
+            return
+        self._emitted = True
+        data = self.summary()
+        if fmt == "json":
+            print(json.dumps(data, indent=2))
+        elif fmt == "table":
+            print(f"[TIMING] {'phase':<34} {'wall(s)':>8} {'sleep(s)':>8} {'files':>6} {'bytes':>11}")
+            for r in data["phases"]:
+                name = r["name"] + (f" [{r['target']}]" if r.get("target") else "")
+                name = ("  " * r["depth"] + name)[:34]
+                print(f"[TIMING] {name:<34} {r['wall_s']:>8.2f} {r['sleep_s']:>8.2f} "
+                      f"{r['files'] or '-':>6} {r['bytes'] or '-':>11}")
+            print(f"[TIMING] {'total':<34} {data['total_s']:>8.2f} {data['sleep_s']:>8.2f}")
+        if history:
+            try:
+                with open(history, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, separators=(",", ":")) + "\n")
+            except Exception as e:
+                print(f"[TIMING] Could not append to {history}: {e}")
+
+
+TIMING = DeployTimer()
+
+
+def deliberate_sleep(seconds):
+    """time.sleep for intentional pauses/settles, accounted in the timing report."""
+    TIMING.sleep(seconds)
+
+
+# === Per-run exit hooks ==========================================================
+# Lock release, the timing report and pid files belong to one deploy run. A
+# normal run hands them to atexit; deploy_daemon.py runs many deploys in one
+# process, so inside daemon_request() they are collected and run when the
+# request ends instead.
+_run_exit_hooks = None
+
+
+def at_run_exit(fn, *args):
+    if _run_exit_hooks is None:
+        atexit.register(fn, *args)
+    else:
+        _run_exit_hooks.append((fn, args))
+
+
+def in_daemon_request():
+    return _run_exit_hooks is not None
+
+
+@contextmanager
+def daemon_request():
+    """Scope one deploy inside a long-lived process: fresh timing, exit hooks run at the end."""
+    global _run_exit_hooks, TIMING
+    _run_exit_hooks = []
+    TIMING = DeployTimer()
+    if _radio_session is not None:
+        # The radio may have been plugged in since the last request failed to open it.
+        _radio_session.forget_failure()
+    try:
+        yield
+    finally:
+        hooks, _run_exit_hooks = _run_exit_hooks, None
+        for fn, args in reversed(hooks):
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[DAEMON] Exit hook {getattr(fn, '__name__', fn)} failed: {e}")
+        _cleanup_stage_roots()
+        del _STAGE_ROOTS[:]
 
 
 # === Optional direct radio control (no Ethos Suite needed) =====================
@@ -62,19 +218,52 @@ def _load_connect_module():
     _connect_mod = False
     return _connect_mod
 
+_radio_session = None
+
+def _connect_radio(mod):
+    """
+    The deploy's shared RadioInterface (connect.RadioSession): one HID handle
+    for every mode switch and drive scan, revalidated cheaply on each use and
+    reopened only after re-enumeration. The open handle outlives a single
+    deploy inside deploy_daemon.py; a failed open is only remembered until
+    the next daemon_request().
+    """
+    global _radio_session
+    if _radio_session is None:
+        session_cls = getattr(mod, "RadioSession", None)
+        if session_cls is None:
+            return mod.RadioInterface()
+        _radio_session = session_cls(mod.RadioInterface)
+    return _radio_session.get()
+
+def _release_radio(ri, stale=False):
+    """Hand an interface back: close it if it is not session-managed, or drop a stale session handle."""
+    if ri is None:
+        return
+    if _radio_session is None:
+        try:
+            ri.close()
+        except Exception:
+            pass
+    elif stale:
+        _radio_session.invalidate()
+
 def _connect_usb_debug(action: str):
     """Start/stop USB debug (serial) using connect.py if available."""
     mod = _load_connect_module()
     if not mod:
         return False
     ri = None
+    switched = False
     try:
-        ri = mod.RadioInterface()
+        ri = _connect_radio(mod)
         if action == 'start':
             print("[CONNECT] Starting USB debug (serial)...")
+            switched = True
             ri.start_usb_debug()
         elif action == 'stop':
             print("[CONNECT] Stopping USB debug (serial)...")
+            switched = True
             ri.stop_usb_debug()
         else:
             raise ValueError(f"Unknown action: {action}")
@@ -90,20 +279,18 @@ def _connect_usb_debug(action: str):
             print(f"[CONNECT] USB debug {action} failed ({type(e).__name__}: {e})")
         return False
     finally:
-        try:
-            if ri is not None:
-                ri.close()
-        except Exception:
-            pass
+        # A mode switch makes the radio re-enumerate, so that handle is done.
+        _release_radio(ri, stale=switched)
 
-def _connect_find_scripts_dir():
+def _connect_find_scripts_dir(quiet=False):
     """Return mounted scripts dir using connect.py drive markers, or None."""
     mod = _load_connect_module()
     if not mod:
         return None
     ri = None
+    failed = False
     try:
-        ri = mod.RadioInterface()
+        ri = _connect_radio(mod)
         ri.scan_for_drives()
         # Prefer sdcard/radio volumes if present; Ethos maps SCRIPTS to the mounted media root + /scripts
         for key in ('sdcard', 'radio', 'flash'):
@@ -111,13 +298,11 @@ def _connect_find_scripts_dir():
             if root and os.path.isdir(os.path.join(root, 'scripts')):
                 return os.path.normpath(os.path.join(root, 'scripts'))
     except BaseException as e:
-        print(f"[CONNECT] Drive scan failed ({type(e).__name__}: {e})")
+        failed = True
+        if not quiet:
+            print(f"[CONNECT] Drive scan failed ({type(e).__name__}: {e})")
     finally:
-        try:
-            if ri is not None:
-                ri.close()
-        except Exception:
-            pass
+        _release_radio(ri, stale=failed)
     return None
 
 MIN_ETHOSSUITE_VERSION = "1.7.0"
@@ -132,6 +317,51 @@ THROTTLE_PAUSE_EVERY = 64 * 1024    # pause+fsync every 64 KiB written
 THROTTLE_PAUSE_S = 0.1              # 100 ms
 COPY_SETTLE_S = float(os.environ.get("DEPLOY_COPY_SETTLE_S", "0.10"))  # 100 ms
 
+# Throttle mode for radio copies (--throttle or env DEPLOY_THROTTLE):
+#   fixed    - constants above, exactly as before (default)
+#   adaptive - start from the constants, then grow/shrink chunk, fsync window
+#              and pauses from measured write+fsync latency
+#   off      - plain chunked copy with a single fsync per file
+THROTTLE_MODES = ("fixed", "adaptive", "off")
+
+def _env_throttle_mode():
+    # Validated here so importers (bench_deploy, deploy_daemon) get the same fallback as main().
+    mode = os.environ.get("DEPLOY_THROTTLE", "").strip().lower() or "fixed"
+    if mode not in THROTTLE_MODES:
+        print(f"[WARN] Unknown DEPLOY_THROTTLE={mode!r}; using 'fixed'.")
+        mode = "fixed"
+    return mode
+
+THROTTLE_MODE = _env_throttle_mode()
+THROTTLE_TARGET_LATENCY_S = 0.25    # a healthy fsync window completes faster than this
+THROTTLE_EWMA_ALPHA = 0.2           # weight of the newest fsync window in the smoothed latency
+THROTTLE_MIN_SAMPLES = 4            # fsync windows seen before a latency can count as a spike
+THROTTLE_MAX_CHUNK = 1024 * 1024    # 1 MiB
+THROTTLE_MAX_PAUSE_EVERY = 4 * 1024 * 1024
+THROTTLE_MAX_PAUSE_S = 0.5
+
+# --- persistent hash index (avoid reading back from slow media) ---------------
+# mirror_copy keeps a small JSON record per deployed tree with the size, mtime
+# and MD5 of every file it wrote. A destination file whose stat still matches
+# its record is trusted without re-reading it from the radio.
+DEPLOY_INDEX_ENABLED = os.environ.get("DEPLOY_INDEX", "1").strip().lower() not in ("0", "false", "no", "off")
+DEPLOY_INDEX_VERSION = 1
+LEGACY_INDEX_SUFFIX = ".deploy-index.json"  # older builds wrote this beside the tree
+
+# Host-side bookkeeping (hash index, git state) lives under DEPLOY_STATE_DIR,
+# never on the radio volume. Records are keyed by the radio's cpuid marker plus
+# the path inside the volume, so a radio maps to the same state wherever it is
+# mounted, and by the absolute path for local (simulator, staging) trees.
+DEPLOY_STATE_DIR = os.environ.get("DEPLOY_STATE_DIR") or os.path.join(tempfile.gettempdir(), "rfsuite-deploy-state")
+VOLUME_MARKER_KEYS = ("sdcard", "radio", "flash")
+
+# --- verify engine ------------------------------------------------------------
+# Number of threads used to stat/hash files while planning a mirror copy.
+# None = auto: 1 for radio targets (slow FAT media hates concurrent reads),
+# several for the simulator and local staging. Override with --verify-workers
+# or env DEPLOY_VERIFY_WORKERS.
+VERIFY_WORKERS = None
+
 # --- staging (run steps locally then copy to radio) --------------------------
 STAGING_ENABLED = True  # can be disabled via --no-stage or env DEPLOY_STAGE=0
 STAGING_KEEP = False    # set env DEPLOY_STAGE_KEEP=1 to keep staging folder for debugging
@@ -163,7 +393,167 @@ def _cleanup_stage_roots():
         except Exception:
             pass
 
-atexit.register(_cleanup_stage_roots)
+# Persistent staging cache: one staged tree per project/target/language that is
+# updated incrementally from the repo instead of re-created with mkdtemp.
+# Disable with --no-stage-cache or env DEPLOY_STAGE_CACHE=0.
+STAGE_CACHE_ENABLED = os.environ.get("DEPLOY_STAGE_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+STAGE_MANIFEST_NAME = "stage-manifest.json"
+STAGE_MANIFEST_VERSION = 1
+
+def _stage_cache_root(git_src, tgt, target_name, lang):
+    proj_key = md5(os.path.abspath(git_src).encode("utf-8")).hexdigest()[:8]
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', f"{target_name}-{tgt}-{lang}")
+    return os.path.join(tempfile.gettempdir(), f"rfsuite-stage-{proj_key}-{safe_name}")
+
+def _stage_signature(git_src, tgt, lang, steps):
+    """
+    Inputs that invalidate every staged file when they change: the step list,
+    the locale JSON, the step/resolver scripts themselves and whatever a
+    step module reports through step_signature(git_src, lang) (e.g. the
+    soundpack it copies).
+    """
+    scripts_dir = os.path.join(git_src, ".vscode", "scripts")
+    inputs = [os.path.join(git_src, "src", tgt, "i18n", f"{lang}.json"),
+              os.path.join(scripts_dir, "resolve_i18n_tags.py")]
+    for step in steps or ():
+        if step.endswith(".py") or os.sep in step or "/" in step:
+            inputs.append(step if os.path.isabs(step) else os.path.join(git_src, step))
+        else:
+            inputs.append(os.path.join(scripts_dir, f"deploy_step_{step}.py"))
+    digests = {}
+    for path in inputs:
+        try:
+            digests[os.path.relpath(path, git_src).replace(os.sep, "/")] = file_md5(path)
+        except OSError:
+            digests[os.path.relpath(path, git_src).replace(os.sep, "/")] = None
+    step_inputs = {}
+    for step in steps or ():
+        step_sig = _step_attr(step, "step_signature", None)
+        if callable(step_sig):
+            try:
+                step_inputs[step] = step_sig(git_src, lang)
+            except Exception as e:
+                print(f"[STAGE][WARN] step_signature of '{step}' failed: {e}")
+                step_inputs[step] = None
+    return {"lang": lang, "steps": list(steps or ()), "inputs": digests, "step_inputs": step_inputs}
+
+def _load_stage_manifest(stage_root):
+    try:
+        with open(os.path.join(stage_root, STAGE_MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != STAGE_MANIFEST_VERSION:
+        return None
+    return data
+
+def _save_stage_manifest(stage_root, signature, files):
+    path = os.path.join(stage_root, STAGE_MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": STAGE_MANIFEST_VERSION, "signature": signature, "files": files},
+                  f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+def stage_incremental(src_dir, stage_root, staged_out_dir, signature):
+    """
+    Bring staged_out_dir up to date with src_dir.
+
+    Files whose source size/mtime match the manifest are left alone (they
+    already carry their step output); new or modified files are copied in and
+    files removed from the repo are removed from the stage. Files created by
+    steps that never existed in the repo are kept. A signature change
+    restages everything.
+
+    Returns (changed_rels, full_restage, files); changed_rels includes files
+    removed from the stage. The manifest is removed
+    while updating; pass `files` to commit_stage_manifest() once steps
+    succeed, so an interrupted deploy restages from scratch next time.
+    """
+    manifest = _load_stage_manifest(stage_root)
+    full = (
+        manifest is None
+        or manifest.get("signature") != signature
+        or not os.path.isdir(staged_out_dir)
+    )
+    if full:
+        if os.path.isdir(staged_out_dir):
+            shutil.rmtree(staged_out_dir, onerror=on_rm_error)
+        recorded = {}
+    else:
+        recorded = manifest.get("files") or {}
+    try:
+        os.remove(os.path.join(stage_root, STAGE_MANIFEST_NAME))
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(staged_out_dir, exist_ok=True)
+    current = {}
+    changed = []
+    for r, _, fs in os.walk(src_dir):
+        for f in fs:
+            srcf = os.path.join(r, f)
+            rel = os.path.relpath(srcf, src_dir).replace(os.sep, "/")
+            try:
+                st = os.stat(srcf)
+            except OSError:
+                continue
+            current[rel] = [st.st_size, st.st_mtime_ns]
+            dstf = os.path.join(staged_out_dir, rel)
+            if recorded.get(rel) == current[rel] and os.path.exists(dstf):
+                continue
+            os.makedirs(os.path.dirname(dstf), exist_ok=True)
+            shutil.copy2(srcf, dstf)
+            changed.append(rel)
+
+    for rel in recorded:
+        if rel not in current:
+            changed.append(rel)
+            try:
+                os.remove(os.path.join(staged_out_dir, rel))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[STAGE][WARN] Could not remove {rel} from stage: {e}")
+    _remove_empty_dirs(staged_out_dir)
+
+    return changed, full, current
+
+def stage_delta(src_dir, stage_root, staged_out_dir, signature, changed, deleted):
+    """
+    Apply a known change set (see plan_git_delta) to the staging cache
+    without walking src_dir. Returns the updated manifest files, or None when
+    the cache is missing or stale and stage_incremental() must run instead.
+    """
+    manifest = _load_stage_manifest(stage_root)
+    if manifest is None or manifest.get("signature") != signature or not os.path.isdir(staged_out_dir):
+        return None
+    files = dict(manifest.get("files") or {})
+    try:
+        os.remove(os.path.join(stage_root, STAGE_MANIFEST_NAME))
+    except FileNotFoundError:
+        pass
+    for rel in changed:
+        srcf = os.path.join(src_dir, rel)
+        dstf = os.path.join(staged_out_dir, rel)
+        os.makedirs(os.path.dirname(dstf), exist_ok=True)
+        shutil.copy2(srcf, dstf)
+        st = os.stat(srcf)
+        files[rel] = [st.st_size, st.st_mtime_ns]
+    for rel in deleted:
+        files.pop(rel, None)
+        try:
+            os.remove(os.path.join(staged_out_dir, rel))
+        except FileNotFoundError:
+            pass
+    return files
+
+def commit_stage_manifest(stage_root, signature, files):
+    """Persist the manifest for a staged tree whose steps completed."""
+    try:
+        _save_stage_manifest(stage_root, signature, files)
+    except Exception as e:
+        print(f"[STAGE][WARN] Could not write stage manifest: {e}")
 
 # --- single-instance lock helpers --------------------------------------------
 LOCK_DEFAULT_NAME = "deploy.single.lock"
@@ -243,7 +633,10 @@ class SingleInstance:
             self.fd.flush(); os.fsync(self.fd.fileno())
         except Exception:
             pass
-        atexit.register(self.release)
+        at_run_exit(self.release)
+        if in_daemon_request():
+            # The daemon owns its signals; a client disconnect interrupts the request instead.
+            return
         for sig in (signal.SIGINT, signal.SIGTERM):
             try:
                 signal.signal(sig, self._signal_and_release)
@@ -356,52 +749,159 @@ def _record_tail_pid_and_cleanup():
             f.write(str(os.getpid()))
     except Exception:
         pass
-    atexit.register(lambda: os.path.exists(SERIAL_PIDFILE) and os.remove(SERIAL_PIDFILE))
+    at_run_exit(lambda: os.path.exists(SERIAL_PIDFILE) and os.remove(SERIAL_PIDFILE))
+
+
+class CopyThrottle:
+    """
+    Pacing state for throttled_copyfile, shared by every file of a deploy.
+
+    In 'adaptive' mode every fsync window is timed into a smoothed (EWMA)
+    latency; a single write that stalls past THROTTLE_TARGET_LATENCY_S is
+    judged against that average without entering it. While latency stays
+    under the target the chunk size and fsync window double and the pauses
+    halve. After THROTTLE_MIN_SAMPLES windows, a spike (slower than twice both
+    the target and the average, or over the target while the average is too)
+    halves the window and restores at least the fixed pauses, so one moderate
+    outlier on fast media does not shrink the batch. 'fixed' and 'off' never
+    change their settings.
+    """
+
+    def __init__(self, mode="fixed"):
+        if mode not in THROTTLE_MODES:
+            raise ValueError(f"Unknown throttle mode: {mode}")
+        self.mode = mode
+        self.chunk = THROTTLE_CHUNK
+        self.pause_every = THROTTLE_PAUSE_EVERY
+        self.pause_s = THROTTLE_PAUSE_S
+        self.settle_s = COPY_SETTLE_S
+        if mode == "off":
+            self.chunk = THROTTLE_MAX_CHUNK
+            self.pause_every = None
+            self.pause_s = 0.0
+            self.settle_s = 0.0
+        self.avg_latency = None
+        self.samples = 0
+        self.spikes = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.bytes = 0
+        self.files = 0
+        self.elapsed = 0.0
+
+    def observe(self, latency, sample=True):
+        """
+        Feed one measured latency (seconds) into the controller: an fsync
+        window (sample=True), or a stalled single write (sample=False).
+        """
+        if self.mode != "adaptive":
+            return
+        avg = self.avg_latency
+        if sample:
+            self.samples += 1
+            self.avg_latency = latency if avg is None else (
+                (1 - THROTTLE_EWMA_ALPHA) * avg + THROTTLE_EWMA_ALPHA * latency)
+        target = THROTTLE_TARGET_LATENCY_S
+        spike = (avg is not None and self.samples >= THROTTLE_MIN_SAMPLES and latency > target
+                 and (latency > 2 * max(avg, target) or self.avg_latency > target))
+        if spike:
+            self.spikes += 1
+            self.pause_every = max(THROTTLE_PAUSE_EVERY, self.pause_every // 2)
+            self.chunk = max(THROTTLE_CHUNK, min(self.chunk // 2, self.pause_every))
+            self.pause_s = min(THROTTLE_MAX_PAUSE_S, max(THROTTLE_PAUSE_S, self.pause_s * 2))
+            self.settle_s = max(COPY_SETTLE_S, self.settle_s)
+        elif sample and latency < target:
+            self.pause_every = min(THROTTLE_MAX_PAUSE_EVERY, self.pause_every * 2)
+            self.chunk = min(THROTTLE_MAX_CHUNK, self.chunk * 2, self.pause_every)
+            self.pause_s = self.pause_s / 2 if self.pause_s > 0.005 else 0.0
+            self.settle_s = self.settle_s / 2 if self.settle_s > 0.005 else 0.0
+
+    def report(self, reset=True):
+        """Print effective throughput for the files copied since the last report."""
+        if self.files:
+            secs = max(self.elapsed, 1e-6)
+            mbps = self.bytes / secs / (1024 * 1024)
+            extra = ""
+            if self.mode == "adaptive":
+                extra = (f", final chunk {self.chunk // 1024} KiB / fsync every {self.pause_every // 1024} KiB"
+                         f" / pause {self.pause_s * 1000:.0f} ms, {self.spikes} latency spike(s)")
+            print(f"[IO] Wrote {self.bytes / (1024 * 1024):.2f} MB in {self.files} file(s), "
+                  f"{secs:.1f}s -> {mbps:.2f} MB/s ({self.mode}{extra})")
+        if reset:
+            self.reset_stats()
+
+
+_copy_throttle = threading.local()
+
+def copy_throttle():
+    """Return the CopyThrottle for THROTTLE_MODE (one per thread, i.e. per target)."""
+    throttle = getattr(_copy_throttle, "current", None)
+    if throttle is None or throttle.mode != THROTTLE_MODE:
+        throttle = _copy_throttle.current = CopyThrottle(THROTTLE_MODE)
+    return throttle
+
+
+def _fsync_timed(fdst, throttle):
+    fdst.flush()
+    t0 = time.perf_counter()
+    try:
+        os.fsync(fdst.fileno())
+    except OSError:
+        pass
+    throttle.observe(time.perf_counter() - t0)
 
 
 def throttled_copyfile(src, dst):
+    CLEANUP.note_foreground_io()
+    throttle = copy_throttle()
+    started = time.perf_counter()
     os.makedirs(os.path.dirname(dst), exist_ok=True)
     written_since_pause = 0
+    written = 0
     with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb', buffering=0) as fdst:
         while True:
-            chunk = fsrc.read(THROTTLE_CHUNK)
+            chunk = fsrc.read(throttle.chunk)
             if not chunk:
                 break
+            t0 = time.perf_counter()
             fdst.write(chunk)
+            write_s = time.perf_counter() - t0
+            if write_s > THROTTLE_TARGET_LATENCY_S:
+                throttle.observe(write_s, sample=False)
             written_since_pause += len(chunk)
-            if written_since_pause >= THROTTLE_PAUSE_EVERY:
-                fdst.flush()
-                try:
-                    os.fsync(fdst.fileno())
-                except OSError:
-                    pass
-                time.sleep(THROTTLE_PAUSE_S)
+            written += len(chunk)
+            if throttle.pause_every and written_since_pause >= throttle.pause_every:
+                _fsync_timed(fdst, throttle)
+                if throttle.pause_s > 0:
+                    deliberate_sleep(throttle.pause_s)
                 written_since_pause = 0
 
-        fdst.flush()
-        try:
-            os.fsync(fdst.fileno())
-        except OSError:
-            pass
+        _fsync_timed(fdst, throttle)
 
     try:
         shutil.copymode(src, dst)
     except Exception:
         pass
-    if COPY_SETTLE_S > 0:
-        time.sleep(COPY_SETTLE_S)
+    if throttle.settle_s > 0:
+        deliberate_sleep(throttle.settle_s)
+    throttle.bytes += written
+    throttle.files += 1
+    throttle.elapsed += time.perf_counter() - started
 
-def scan_usb_drives_for_radio():
+def scan_usb_drives_for_radio(quiet=False):
     """
     Strong fallback: scan mounted drives for:
       - radio.bin (file)
       - scripts/  (directory)
-    Returns the scripts directory path or None.
+    Returns the scripts directory path or None. `quiet` drops the progress
+    lines (used when polled while waiting for a mode switch).
     """
     import string
     candidates = []
 
-    print("[ETHOS] Performing fallback USB drive scan for radio...")
+    if not quiet:
+        print("[ETHOS] Performing fallback USB drive scan for radio...")
 
     if os.name == "nt":
         for letter in string.ascii_uppercase:
@@ -430,7 +930,8 @@ def scan_usb_drives_for_radio():
                     pass
 
     if candidates:
-        print(f"[ETHOS] Fallback USB scan found radio at: {candidates[0]}")
+        if not quiet:
+            print(f"[ETHOS] Fallback USB scan found radio at: {candidates[0]}")
         return candidates[0]
     return None
 
@@ -514,7 +1015,7 @@ def get_ethos_scripts_dir(ethossuite_bin, retries=1, delay=5):
             last_err = e
             if attempt < retries:
                 print(f"[ETHOS] Could not get SCRIPTS path (attempt {attempt+1}/{retries+1}). Retrying in {delay}s...")
-                time.sleep(delay)
+                deliberate_sleep(delay)
             else:
                 raise last_err
 
@@ -557,81 +1058,493 @@ def flush_fs():
         print(f"[WARN] os.sync failed: {e}")
 
 
-DELETE_BATCH = 1
+def _env_number(name, default, cast=float):
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        print(f"[WARN] Ignoring invalid {name}={raw!r}")
+        return default
+
+
+# --- batched durability --------------------------------------------------------
+# Instead of a system-wide os.sync() (plus a sleep) after every file, radio
+# writes and deletes are grouped into batches. A batch closes after
+# SYNC_BATCH_FILES files, SYNC_BATCH_BYTES bytes or SYNC_BATCH_S seconds,
+# whichever comes first; closing it fsyncs just the touched files/directories
+# and pauses once.
+SYNC_BATCH_FILES = _env_number("DEPLOY_SYNC_BATCH_FILES", 16, int)
+SYNC_BATCH_BYTES = _env_number("DEPLOY_SYNC_BATCH_BYTES", 1024 * 1024, int)
+SYNC_BATCH_S = _env_number("DEPLOY_SYNC_BATCH_S", 2.0)
+SYNC_BATCH_PAUSE_S = _env_number("DEPLOY_SYNC_BATCH_PAUSE_S", 0.10)
+
+
+def _fsync_path(path, directory=False):
+    """fsync a file or directory by path; returns False where unsupported."""
+    flags = os.O_RDONLY
+    if directory and hasattr(os, "O_DIRECTORY"):
+        flags |= os.O_DIRECTORY
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return False
+    try:
+        os.fsync(fd)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+class DurabilityBatch:
+    """
+    Collects written/deleted paths and issues one durability barrier per batch.
+
+    add(path, nbytes, fsync_file) records a write or delete; the barrier fsyncs
+    files that were not already synced by their writer plus every affected
+    parent directory. Where directory fsync is unavailable (Windows) the
+    barrier falls back to flush_fs(), still only once per batch.
+    """
+
+    def __init__(self, max_files=None, max_bytes=None, max_age_s=None, pause_s=None):
+        self.max_files = SYNC_BATCH_FILES if max_files is None else max_files
+        self.max_bytes = SYNC_BATCH_BYTES if max_bytes is None else max_bytes
+        self.max_age_s = SYNC_BATCH_S if max_age_s is None else max_age_s
+        self.pause_s = SYNC_BATCH_PAUSE_S if pause_s is None else pause_s
+        self.barriers = 0
+        self._reset()
+
+    def _reset(self):
+        self._files = set()
+        self._dirs = set()
+        self._count = 0
+        self._bytes = 0
+        self._opened = None
+
+    def add(self, path, nbytes=0, fsync_file=False):
+        if self._opened is None:
+            self._opened = time.monotonic()
+        if fsync_file:
+            self._files.add(path)
+        self._dirs.add(os.path.dirname(os.path.abspath(path)))
+        self._count += 1
+        self._bytes += nbytes
+        if (
+            (self.max_files and self._count >= self.max_files)
+            or (self.max_bytes and self._bytes >= self.max_bytes)
+            or (self.max_age_s and time.monotonic() - self._opened >= self.max_age_s)
+        ):
+            self.barrier()
+
+    def barrier(self):
+        if not self._count:
+            return
+        ok = True
+        for f in self._files:
+            if os.path.exists(f):
+                ok = _fsync_path(f) and ok
+        if os.name == "nt":
+            ok = False
+        else:
+            for d in sorted(self._dirs, key=len, reverse=True):
+                if os.path.isdir(d):
+                    ok = _fsync_path(d, directory=True) and ok
+        if not ok:
+            flush_fs()
+        self.barriers += 1
+        self._reset()
+        if self.pause_s > 0:
+            deliberate_sleep(self.pause_s)
+
+    def close(self):
+        self.barrier()
+
+
+DELETE_BATCH = max(1, _env_number("DEPLOY_DELETE_BATCH", 64, int))  # max unlinks per barrier inside a directory
 DELETE_PAUSE_S = 0.10  # 100ms
+# Pacing: one barrier + DELETE_PAUSE_S after this many directories or bytes freed.
+DELETE_PACE_DIRS = _env_number("DEPLOY_DELETE_PACE_DIRS", 4, int)
+DELETE_PACE_BYTES = _env_number("DEPLOY_DELETE_PACE_BYTES", 4 * 1024 * 1024, int)
 
-def throttled_rmtree(root, batch=DELETE_BATCH, pause=DELETE_PAUSE_S):
-    if not os.path.exists(root):
-        return
-    files = []
-    for dp, _, fs in os.walk(root):
-        for f in fs:
-            files.append(os.path.join(dp, f))
+def plan_rmtree(root):
+    """
+    Scan root once with os.scandir and return its directories deepest first
+    as (dir, [(file, size), ...], nbytes); root itself comes last. Entry
+    types come from the directory listing; sizes from the entry's cached stat
+    (free on Windows, one lstat elsewhere).
+    """
+    plan = []
 
-    bar = tqdm(total=len(files), desc="Deleting")
-    for i, p in enumerate(files, 1):
+    def _scan(path, depth):
+        files, subdirs, nbytes = [], [], 0
         try:
-            os.chmod(p, stat.S_IWRITE)
-        except Exception:
-            pass
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        size = 0
+                    files.append((entry.path, size))
+                    nbytes += size
+        except FileNotFoundError:
+            return
+        for d in subdirs:
+            _scan(d, depth + 1)
+        plan.append((depth, path, files, nbytes))
 
-        attempt = 0
-        while True:
-            try:
-                os.unlink(p)
-                break
-            except FileNotFoundError:
-                break
-            except OSError as oe:
-                if getattr(oe, "winerror", 0) in (5, 32, 483) and attempt < 5:
-                    time.sleep(pause * (attempt + 1))
-                    attempt += 1
-                    continue
-                break
+    _scan(root, 0)
+    plan.sort(key=lambda item: item[0], reverse=True)
+    return [(path, files, nbytes) for _, path, files, nbytes in plan]
 
-        bar.update(1)
-        if i % batch == 0:
-            flush_fs()
-            time.sleep(pause)
+def _unlink_retry(path, pause):
+    """Unlink path, clearing a read-only flag once and retrying transient Windows sharing errors."""
+    for attempt in range(6):
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as oe:
+            if attempt == 0 and isinstance(oe, PermissionError):
+                try:
+                    os.chmod(path, stat.S_IWRITE)
+                except OSError:
+                    pass
+                continue
+            if getattr(oe, "winerror", 0) in (5, 32, 483):
+                deliberate_sleep(pause * attempt)
+                continue
+            return False
+    return False
 
+def throttled_rmtree(root, batch=DELETE_BATCH, pause=DELETE_PAUSE_S, gate=None, progress=True,
+                     pace_dirs=DELETE_PACE_DIRS, pace_bytes=DELETE_PACE_BYTES):
+    """
+    Delete root bottom-up, one directory at a time, from a single scandir
+    plan. Unlinks inside a directory are batched (a barrier every `batch`
+    files); after every `pace_dirs` directories or `pace_bytes` freed there
+    is a barrier plus a `pause`. `gate`, when given, is called between
+    directories (and batches) and may block to yield to other I/O or return
+    False to stop early. `progress` only controls the bar; the files/s
+    summary is always printed. Returns the number of files deleted.
+    """
+    if not os.path.exists(root):
+        return 0
+    batch = max(1, int(batch))
+    plan = plan_rmtree(root)
+    total_files = sum(len(files) for _, files, _ in plan)
+
+    durability = DurabilityBatch(max_files=batch, max_bytes=0, max_age_s=0, pause_s=0)
+    bar = tqdm(total=total_files, desc="Deleting", disable=not progress)
+    started = time.perf_counter()
+    deleted = freed = dirs_done = 0
+    paced_dirs = paced_bytes = 0
+    stopped = False
+    for path, files, nbytes in plan:
+        if gate is not None and not gate():
+            stopped = True
+            break
+        for i, (f, size) in enumerate(files, 1):
+            if _unlink_retry(f, pause):
+                deleted += 1
+                freed += size
+                durability.add(f)
+            if i % batch == 0 and gate is not None and not gate():
+                stopped = True
+                break
+        bar.update(len(files))
+        if stopped:
+            break
+        try:
+            os.rmdir(path)
+            durability.add(path)
+        except OSError:
+            pass
+        dirs_done += 1
+        paced_dirs += 1
+        paced_bytes += nbytes
+        if (pace_dirs and paced_dirs >= pace_dirs) or (pace_bytes and paced_bytes >= pace_bytes):
+            durability.barrier()
+            deliberate_sleep(pause)
+            paced_dirs = paced_bytes = 0
+    durability.close()
     bar.close()
 
-    for dp, dns, _ in sorted(os.walk(root), key=lambda t: t[0], reverse=True):
-        for d in dns:
-            try:
-                os.rmdir(os.path.join(dp, d))
-            except Exception:
-                pass
-    try:
-        os.rmdir(root)
-    except Exception:
-        pass
-    flush_fs()
-    time.sleep(pause)
+    elapsed = time.perf_counter() - started
+    if deleted:
+        rate = deleted / elapsed if elapsed > 0 else float("inf")
+        print(f"[IO] Deleted {deleted} file(s) in {dirs_done} dir(s), {freed / (1024 * 1024):.2f} MB, "
+              f"{elapsed:.1f}s -> {rate:.0f} files/s (pause {pause * 1000:.0f} ms every "
+              f"{pace_dirs} dir(s) / {pace_bytes // 1024} KiB, {durability.barriers} barrier(s))"
+              f"{'; stopped early' if stopped else ''}")
+    return deleted
 
 
 def delete_tree(path):
     if not os.path.isdir(path):
         return
-    if DEPLOY_TO_RADIO:
-        throttled_rmtree(path)
-    else:
-        shutil.rmtree(path, onerror=on_rm_error)
-        flush_fs()
-        time.sleep(DELETE_PAUSE_S)
+    with TIMING.phase(f"delete {os.path.basename(path)}") as timing:
+        if DEPLOY_TO_RADIO:
+            timing["files"] = throttled_rmtree(path)
+        else:
+            timing["files"] = count_files(path)
+            shutil.rmtree(path, onerror=on_rm_error)
+            flush_fs()
+            deliberate_sleep(DELETE_PAUSE_S)
 
 
-def safe_full_copy(srcall, out_dir):
-    """Safer full-copy for slow FAT32 targets."""
+# Deferred cleanup: safe_full_copy moves the previous install into a trash
+# folder, <volume>/.rfsuite-trash beside scripts/ (same volume, so it is a
+# rename, and outside the scripts/ folder Ethos loads from), and starts copying
+# straight away; the trash is deleted by a low-priority worker thread that
+# backs off while foreground copies are writing, after the copy or at the
+# start of the next deploy. Everything in the trash is garbage, so no journal
+# is kept: the next deploy (from any machine) resumes from its contents, and
+# it can always be deleted by hand. The folder is removed once empty.
+# DEPLOY_DEFER_CLEANUP=0 or --no-defer-cleanup restores the blocking deletes.
+DEFER_CLEANUP = os.environ.get("DEPLOY_DEFER_CLEANUP", "1").strip().lower() not in ("0", "false", "no", "off")
+CLEANUP_TRASH_NAME = ".rfsuite-trash"
+LEGACY_CLEANUP_JOURNAL_NAME = ".deploy-cleanup.json"  # older builds journalled beside the trees
+CLEANUP_IDLE_S = 0.5          # foreground quiet time before the worker deletes again
+CLEANUP_WAIT_S = _env_number("DEPLOY_CLEANUP_WAIT_S", 5.0)  # grace before the volume is released
+CLEANUP_MAX_PENDING = 2       # older backlog is deleted synchronously before another rename
+
+
+def _trash_dir(scripts_dir):
+    """Trash folder for installs replaced under scripts_dir: its sibling on the same volume."""
+    return os.path.join(os.path.dirname(os.path.normpath(os.path.abspath(scripts_dir))), CLEANUP_TRASH_NAME)
+
+
+def _read_legacy_journal(parent):
+    """Tree names an older build journalled in parent, or []."""
+    try:
+        with open(os.path.join(parent, LEGACY_CLEANUP_JOURNAL_NAME), "r", encoding="utf-8") as f:
+            names = json.load(f).get("pending") or []
+    except Exception:
+        return []
+    return [n for n in names if isinstance(n, str) and os.sep not in n and "/" not in n]
+
+
+def _remove_legacy_journal(parent):
+    for path in (os.path.join(parent, LEGACY_CLEANUP_JOURNAL_NAME),
+                 os.path.join(parent, LEGACY_CLEANUP_JOURNAL_NAME + ".tmp")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[CLEANUP][WARN] Could not remove {path}: {e}")
+
+
+class DeferredCleanup:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_foreground = 0.0
+        self.deleted = 0
+
+    # --- queueing -----------------------------------------------------------
+    def defer(self, tree):
+        """Queue `tree` for background deletion and make sure the worker runs."""
+        tree = os.path.normpath(os.path.abspath(tree))
+        with self._lock:
+            if tree not in self._pending:
+                self._pending.append(tree)
+        self._start()
+
+    def resume(self, scripts_dir):
+        """Queue whatever an interrupted cleanup left in the trash beside scripts_dir."""
+        scripts_dir = os.path.normpath(os.path.abspath(scripts_dir))
+        trash = _trash_dir(scripts_dir)
+        try:
+            names = sorted(n for n in os.listdir(trash) if os.path.isdir(os.path.join(trash, n)))
+        except OSError:
+            names = []
+        _remove_legacy_journal(trash)
+        # Older deploys parked the trees inside scripts/ itself, where Ethos
+        # still finds them: move those into the trash first. Their journal is
+        # kept until every one of them has moved.
+        moved_all = True
+        for n in _read_legacy_journal(scripts_dir):
+            if os.path.isdir(os.path.join(scripts_dir, n)):
+                try:
+                    names.append(os.path.basename(_rename_aside(os.path.join(scripts_dir, n))))
+                except Exception as e:
+                    print(f"[CLEANUP][WARN] Could not move {n} out of {scripts_dir}: {e}")
+                    self.defer(os.path.join(scripts_dir, n))
+                    moved_all = False
+        if moved_all:
+            _remove_legacy_journal(scripts_dir)
+        if names:
+            print(f"[CLEANUP] Resuming deletion of {', '.join(names)} in {trash} in the background...")
+        for n in names:
+            self.defer(os.path.join(trash, n))
+        if not names:
+            try:
+                os.rmdir(trash)
+            except OSError:
+                pass
+
+    def backlog(self):
+        with self._lock:
+            return len(self._pending)
+
+    def note_foreground_io(self):
+        """Called by foreground copies; the worker yields for CLEANUP_IDLE_S."""
+        self._last_foreground = time.perf_counter()
+
+    # --- worker ---------------------------------------------------------------
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, name="deploy-cleanup", daemon=True)
+        self._thread.start()
+
+    def _gate(self):
+        while not self._stop.is_set():
+            idle = time.perf_counter() - self._last_foreground
+            if idle >= CLEANUP_IDLE_S:
+                return True
+            self._stop.wait(CLEANUP_IDLE_S - idle)
+        return False
+
+    def _worker(self):
+        TIMING.set_label("background", background=True)
+        try:
+            # Only Linux accepts a thread id here; elsewhere it would renice a pid.
+            if sys.platform.startswith("linux"):
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except Exception:
+            pass
+        started = time.perf_counter()
+        deleted = 0
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._pending:
+                    break
+                tree = self._pending[0]
+            deleted += throttled_rmtree(tree, pause=DELETE_PAUSE_S * 2, gate=self._gate, progress=False)
+            if os.path.exists(tree):
+                if not self._stop.is_set():
+                    print(f"[CLEANUP][WARN] Could not fully delete {tree}; will retry next deploy.")
+                break
+            parent = os.path.dirname(tree)
+            with self._lock:
+                self._pending.remove(tree)
+                if os.path.basename(parent) == CLEANUP_TRASH_NAME:
+                    try:
+                        os.rmdir(parent)
+                    except OSError:
+                        pass
+        self.deleted += deleted
+        TIMING.record("cleanup", time.perf_counter() - started, files=deleted)
+
+    def finish(self, wait_s=None):
+        """
+        Wait up to wait_s (None = until done) for pending deletes, then stop
+        the worker; whatever is left stays in the trash for the next deploy.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        thread.join(wait_s)
+        if thread.is_alive():
+            self._stop.set()
+            thread.join()
+        with self._lock:
+            left = list(self._pending)
+        if left:
+            print(f"[CLEANUP] {len(left)} old tree(s) still pending; deletion resumes on the next deploy, "
+                  f"or delete them by hand:")
+            for tree in left:
+                print(f"[CLEANUP]   {tree}")
+
+
+CLEANUP = DeferredCleanup()
+
+
+def _shutdown(wait_s=0):
+    """
+    Stop the cleanup worker, drop the staging folders and close the radio
+    session. Runs at process exit; deploy_daemon.py also calls it before
+    reloading this module, whose reload replaces all three.
+    """
+    CLEANUP.finish(wait_s)
+    _cleanup_stage_roots()
+    del _STAGE_ROOTS[:]
+    if _radio_session is not None:
+        _radio_session.close()
+
+# A reload keeps this module's globals, so the hook is registered once per
+# process and always sees the current objects.
+if not globals().get("_shutdown_registered"):
+    atexit.register(lambda: _shutdown())
+    _shutdown_registered = True
+
+
+def _rename_aside(tree):
+    """Move tree into the trash beside its scripts/ folder as a free '<tgt>.old[-N]'; returns it."""
+    trash = _trash_dir(os.path.dirname(os.path.normpath(os.path.abspath(tree))))
+    os.makedirs(trash, exist_ok=True)
+    base = os.path.basename(os.path.normpath(tree)).split(".old", 1)[0]
+    old_dir = os.path.join(trash, base + ".old")
+    n = 1
+    while os.path.lexists(old_dir):
+        old_dir = os.path.join(trash, f"{base}.old-{n}")
+        n += 1
+    print(f"Moving existing to {os.path.relpath(old_dir, os.path.dirname(trash))}...")
+    os.replace(tree, old_dir)
+    return old_dir
+
+
+def safe_full_copy(srcall, out_dir, defer_cleanup=None):
+    """
+    Safer full-copy for slow FAT32 targets.
+
+    With deferred cleanup (default) the previous install is only renamed
+    aside before copying; CLEANUP deletes it in the background afterwards.
+    """
     global pbar
-    if os.path.isdir(out_dir):
+    if defer_cleanup is None:
+        defer_cleanup = DEFER_CLEANUP
+    if os.path.isdir(out_dir) and defer_cleanup:
+        CLEANUP.resume(os.path.dirname(out_dir))
+        if os.path.isdir(out_dir + ".old"):
+            # A backup from a blocking-mode deploy is garbage as well.
+            try:
+                CLEANUP.defer(_rename_aside(out_dir + ".old"))
+            except Exception as e:
+                print(f"[WARN] Could not move {out_dir}.old out of scripts ({e}); deleting it now.")
+                delete_tree(out_dir + ".old")
+        if CLEANUP.backlog() >= CLEANUP_MAX_PENDING:
+            with TIMING.phase("cleanup backlog"):
+                print("[CLEANUP] Finishing deletion of older backups first...")
+                CLEANUP.finish(None)
+        try:
+            CLEANUP.defer(_rename_aside(out_dir))
+        except Exception as e:
+            print(f"[WARN] Rename failed ({e}). Falling back to direct delete.")
+            print("Deleting files...")
+            delete_tree(out_dir)
+        CLEANUP.note_foreground_io()
+
+    elif os.path.isdir(out_dir):
         old_dir = out_dir + ".old"
 
         if os.path.isdir(old_dir):
             print("Deleting previous backup...")
             delete_tree(old_dir)
             flush_fs()
-            time.sleep(2)
+            deliberate_sleep(2)
 
         try:
             print(f"Renaming existing to {os.path.basename(old_dir)}...")
@@ -641,19 +1554,31 @@ def safe_full_copy(srcall, out_dir):
             print("Deleting files...")
             delete_tree(out_dir)
         flush_fs()
-        time.sleep(2)
+        deliberate_sleep(2)
 
         if os.path.isdir(old_dir):
             print("Deleting files...")
             delete_tree(old_dir)
             flush_fs()
-            time.sleep(2)
+            deliberate_sleep(2)
 
+    global _copy_durability
     print("Copying files...")
+    CLEANUP.note_foreground_io()
     total = count_files(srcall)
-    pbar = tqdm(total=total)
-    shutil.copytree(srcall, out_dir, dirs_exist_ok=True, copy_function=copy_verbose)
-    pbar.close()
+    with TIMING.phase("copy", files=total, nbytes=tree_bytes(srcall)):
+        pbar = tqdm(total=total)
+        _copy_durability = DurabilityBatch() if DEPLOY_TO_RADIO else None
+        try:
+            shutil.copytree(srcall, out_dir, dirs_exist_ok=True, copy_function=copy_verbose)
+        finally:
+            if _copy_durability:
+                _copy_durability.close()
+            _copy_durability = None
+        pbar.close()
+        if DEPLOY_TO_RADIO:
+            copy_throttle().report()
+    rebuild_deploy_index(srcall, out_dir)
 
 
 def _needs_copy_with_md5(srcf, dstf, ts_slack=2.0):
@@ -681,6 +1606,176 @@ def _needs_copy_with_md5(srcf, dstf, ts_slack=2.0):
         return True
 
 
+def _volume_identity(path, levels=4):
+    """(volume root, marker digest) of the Ethos volume holding path, or (None, None)."""
+    cur = os.path.normpath(os.path.abspath(path))
+    for _ in range(levels):
+        for key in VOLUME_MARKER_KEYS:
+            try:
+                with open(os.path.join(cur, key + ".cpuid"), "rb") as f:
+                    return cur, md5(key.encode("ascii") + b"\0" + f.read(4096)).hexdigest()[:12]
+            except OSError:
+                continue
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            break
+        cur = parent
+    return None, None
+
+
+def _host_state_path(out_dir, kind):
+    """Host-side file holding out_dir's `kind` record ("index", "git")."""
+    out_dir = os.path.normpath(os.path.abspath(out_dir))
+    root, volume = _volume_identity(out_dir)
+    where = f"{volume}:{os.path.relpath(out_dir, root)}" if volume else out_dir
+    key = md5(where.replace(os.sep, "/").encode("utf-8")).hexdigest()[:16]
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', os.path.basename(out_dir))
+    return os.path.join(DEPLOY_STATE_DIR, f"{safe_name}-{key}.{kind}.json")
+
+
+def _remove_legacy_sidecar(out_dir, suffix):
+    """Drop a record an older build left beside the tree (on the radio)."""
+    path = os.path.normpath(out_dir) + suffix
+    for p in (path, path + ".tmp"):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[STATE][WARN] Could not remove legacy {p}: {e}")
+
+
+def _index_path(dst_dir):
+    return _host_state_path(dst_dir, "index")
+
+
+def _load_deploy_index(dst_dir):
+    """Load the hash index for dst_dir; returns {rel: {size, mtime_ns, md5}}."""
+    if not DEPLOY_INDEX_ENABLED:
+        return {}
+    try:
+        with open(_index_path(dst_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"[INDEX] Ignoring unreadable index ({type(e).__name__}: {e})")
+        return {}
+    if not isinstance(data, dict) or data.get("version") != DEPLOY_INDEX_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_deploy_index(dst_dir, files):
+    if not DEPLOY_INDEX_ENABLED:
+        return
+    _remove_legacy_sidecar(dst_dir, LEGACY_INDEX_SUFFIX)
+    path = _index_path(dst_dir)
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(DEPLOY_STATE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": DEPLOY_INDEX_VERSION, "files": files}, f, separators=(",", ":"), sort_keys=True)
+            f.flush()
+            try:
+                os.fsync(f.fileno())
+            except OSError:
+                pass
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[INDEX] Could not write index {path}: {e}")
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+
+
+def _index_entry(dstf, digest):
+    """Build an index record for dstf as it is on disk now, or None."""
+    try:
+        ds = os.stat(dstf)
+    except OSError:
+        return None
+    return {"size": ds.st_size, "mtime_ns": ds.st_mtime_ns, "md5": digest}
+
+
+def _index_lookup(index, rel, dstf):
+    """Return the recorded MD5 for dstf if its size and mtime still match the record."""
+    entry = index.get(rel.replace(os.sep, "/"))
+    if not isinstance(entry, dict):
+        return None
+    try:
+        ds = os.stat(dstf)
+    except OSError:
+        return None
+    if entry.get("size") != ds.st_size or entry.get("mtime_ns") != ds.st_mtime_ns:
+        return None
+    return entry.get("md5")
+
+
+def _needs_copy_indexed(rel, srcf, dstf, index, ts_slack=2.0):
+    """
+    Like _needs_copy_with_md5, but consult the persistent index before reading
+    the destination. Returns (needs_copy, src_md5_or_None).
+    """
+    try:
+        ss = os.stat(srcf)
+    except FileNotFoundError:
+        return False, None
+    try:
+        ds = os.stat(dstf)
+    except FileNotFoundError:
+        return True, None
+
+    if ss.st_size != ds.st_size:
+        return True, None
+
+    recorded = _index_lookup(index, rel, dstf)
+    if recorded:
+        try:
+            digest = file_md5(srcf)
+        except Exception:
+            return True, None
+        return digest != recorded, digest
+
+    if abs(ss.st_mtime - ds.st_mtime) <= ts_slack:
+        return False, None
+    try:
+        digest = file_md5(srcf)
+        return digest != file_md5(dstf), digest
+    except Exception:
+        return True, None
+
+
+def verify_workers(radio=None):
+    """Resolve the verify worker count for a radio (slow) or local (fast) target."""
+    if radio is None:
+        radio = DEPLOY_TO_RADIO
+    return verify_pool.resolve_workers(VERIFY_WORKERS, radio=radio)
+
+
+run_verify = verify_pool.run_verify
+
+
+def rebuild_deploy_index(src_dir, dst_dir):
+    """Record a fresh index for dst_dir after a full copy from src_dir (hashes the local source only)."""
+    if not DEPLOY_INDEX_ENABLED or not os.path.isdir(dst_dir):
+        return
+    files = {}
+    for r, _, fs in os.walk(src_dir):
+        for f in fs:
+            srcf = os.path.join(r, f)
+            rel = os.path.relpath(srcf, src_dir)
+            try:
+                entry = _index_entry(os.path.join(dst_dir, rel), file_md5(srcf))
+            except Exception:
+                entry = None
+            if entry:
+                files[rel.replace(os.sep, "/")] = entry
+    _save_deploy_index(dst_dir, files)
+
+
 def _remove_empty_dirs(root):
     if not os.path.isdir(root):
         return
@@ -693,16 +1788,36 @@ def _remove_empty_dirs(root):
             pass
 
 
-def mirror_copy(src_dir, dst_dir, delete_stale=True, ts_slack=2.0):
+def mirror_copy(src_dir, dst_dir, delete_stale=True, ts_slack=2.0, workers=None, radio=None, label=None,
+                exts=None, stale_exts=None):
     """
     Incremental mirror copy similar to:
       rsync -avh src/ dst/ --delete
+
+    `workers` bounds the verify (stat + MD5) concurrency; None picks the
+    default for the current target via verify_workers(). `radio` selects
+    throttled, batched-durability writes (default: DEPLOY_TO_RADIO);
+    `label` prefixes progress output when several targets run at once.
+
+    `exts` limits the mirror to source files with those extensions and
+    `stale_exts` (default: exts) to the destination files it may delete;
+    other files are left alone. A compiled companion (<file>c, e.g. .luac)
+    is kept while its source is present and unchanged.
     """
+    exts = tuple(exts) if exts else None
+    stale_exts = tuple(stale_exts) if stale_exts else exts
+    if radio is None:
+        radio = DEPLOY_TO_RADIO
+    if workers is None:
+        workers = verify_workers(radio=radio)
+    prefix = f"[{label}] " if label else ""
     os.makedirs(dst_dir, exist_ok=True)
 
     src_files = {}
     for r, _, files in os.walk(src_dir):
         for f in files:
+            if exts and not f.endswith(exts):
+                continue
             srcf = os.path.join(r, f)
             rel = os.path.relpath(srcf, src_dir)
             src_files[rel] = srcf
@@ -711,57 +1826,272 @@ def mirror_copy(src_dir, dst_dir, delete_stale=True, ts_slack=2.0):
     if os.path.isdir(dst_dir):
         for r, _, files in os.walk(dst_dir):
             for f in files:
+                if stale_exts and not f.endswith(stale_exts):
+                    continue
                 dstf = os.path.join(r, f)
                 rel = os.path.relpath(dstf, dst_dir)
                 dst_files[rel] = dstf
 
+    index = _load_deploy_index(dst_dir)
+    # Index entries outside the filter belong to files this run does not touch.
+    new_index = {k: v for k, v in index.items() if not k.endswith(exts)} if exts else {}
+
+    def _verify(item):
+        rel, srcf = item
+        dstf = os.path.join(dst_dir, rel)
+        os.makedirs(os.path.dirname(dstf), exist_ok=True)
+        needs, digest = _needs_copy_indexed(rel, srcf, dstf, index, ts_slack=ts_slack)
+        entry = None
+        if not needs:
+            try:
+                entry = _index_entry(dstf, digest or file_md5(srcf))
+            except Exception:
+                entry = None
+        return rel, srcf, dstf, needs, digest, entry
+
     to_copy = []
-    if src_files:
-        bar_verify = tqdm(total=len(src_files), desc="Verifying (MD5)")
-        for rel, srcf in src_files.items():
-            dstf = os.path.join(dst_dir, rel)
-            os.makedirs(os.path.dirname(dstf), exist_ok=True)
-            if _needs_copy_with_md5(srcf, dstf, ts_slack=ts_slack):
-                to_copy.append((rel, srcf, dstf))
-            bar_verify.update(1)
-        bar_verify.close()
+    with TIMING.phase("verify", files=len(src_files)):
+        for rel, srcf, dstf, needs, digest, entry in run_verify(src_files.items(), _verify, workers=workers,
+                                                                desc=f"{prefix}Verifying (MD5)"):
+            if needs:
+                to_copy.append((rel, srcf, dstf, digest))
+            elif entry:
+                new_index[rel.replace(os.sep, "/")] = entry
+
+    durability = DurabilityBatch() if radio else None
 
     if to_copy:
-        bar_update = tqdm(total=len(to_copy), desc="Updating files")
-        for rel, srcf, dstf in to_copy:
-            if DEPLOY_TO_RADIO:
-                throttled_copyfile(srcf, dstf)
-                flush_fs()
-                time.sleep(0.05)
-            else:
-                shutil.copy2(srcf, dstf)
-            if not rel.replace(os.sep, "/").endswith("tasks/logger/init.lua"):
-                print(f"Copy {rel}")
-            bar_update.update(1)
-        bar_update.close()
+        with TIMING.phase("copy", files=len(to_copy)) as timing:
+            bar_update = tqdm(total=len(to_copy), desc=f"{prefix}Updating files")
+            for rel, srcf, dstf, digest in to_copy:
+                if radio:
+                    throttled_copyfile(srcf, dstf)
+                    durability.add(dstf, os.path.getsize(dstf))
+                else:
+                    shutil.copy2(srcf, dstf)
+                try:
+                    entry = _index_entry(dstf, digest or file_md5(srcf))
+                except Exception:
+                    entry = None
+                if entry:
+                    new_index[rel.replace(os.sep, "/")] = entry
+                    timing["bytes"] += entry["size"]
+                if not rel.replace(os.sep, "/").endswith("tasks/logger/init.lua"):
+                    print(f"{prefix}Copy {rel}")
+                bar_update.update(1)
+            bar_update.close()
+            if radio:
+                durability.close()
+                copy_throttle().report()
+
+    if to_copy or new_index != index:
+        _save_deploy_index(dst_dir, new_index)
+
+    removed = 0
+    if delete_stale and dst_files:
+        stale = [rel for rel in dst_files.keys() if rel not in src_files]
+        if stale_exts:
+            # Keep compiled companions whose source is present and unchanged.
+            copied = {rel for rel, _, _, _ in to_copy}
+            stale = [rel for rel in stale if not (rel[:-1] in src_files and rel[:-1] not in copied)]
+        if stale:
+            with TIMING.phase("delete stale", files=len(stale)):
+                bar_delete = tqdm(total=len(stale), desc=f"{prefix}Deleting stale")
+                for rel in stale:
+                    p = os.path.join(dst_dir, rel)
+                    try:
+                        os.remove(p)
+                        removed += 1
+                        if durability:
+                            durability.add(p)
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        print(f"{prefix}[WARN] Failed to delete stale file {rel}: {e}")
+                    bar_delete.update(1)
+                if durability:
+                    durability.close()
+                bar_delete.close()
+                _remove_empty_dirs(dst_dir)
+
+    if not to_copy and removed == 0:
+        print(f"{prefix}Fast deploy: nothing to update.")
+    elif removed:
+        print(f"{prefix}Removed {removed} stale file(s).")
+
+def apply_delta(src_dir, dst_dir, changed, deleted, radio=None, label=None):
+    """
+    Copy `changed` and delete `deleted` (relative paths) from src_dir to
+    dst_dir without walking either tree, keeping the deploy index in step.
+    Returns the number of files copied plus deleted.
+    """
+    if radio is None:
+        radio = DEPLOY_TO_RADIO
+    prefix = f"[{label}] " if label else ""
+    index = _load_deploy_index(dst_dir)
+    durability = DurabilityBatch() if radio else None
+    copied = removed = 0
+
+    if changed:
+        with TIMING.phase("copy", files=len(changed)) as timing:
+            for rel in changed:
+                srcf = os.path.join(src_dir, rel)
+                dstf = os.path.join(dst_dir, rel)
+                key = rel.replace(os.sep, "/")
+                if not os.path.isfile(srcf):
+                    continue
+                if radio:
+                    throttled_copyfile(srcf, dstf)
+                    durability.add(dstf, os.path.getsize(dstf))
+                else:
+                    os.makedirs(os.path.dirname(dstf), exist_ok=True)
+                    shutil.copy2(srcf, dstf)
+                copied += 1
+                try:
+                    index[key] = _index_entry(dstf, file_md5(srcf))
+                    timing["bytes"] += index[key]["size"]
+                except Exception:
+                    index.pop(key, None)
+                print(f"{prefix}Copy {rel}")
+            if radio:
+                durability.close()
+                copy_throttle().report()
+
+    if deleted:
+        with TIMING.phase("delete stale", files=len(deleted)):
+            for rel in deleted:
+                dstf = os.path.join(dst_dir, rel)
+                index.pop(rel.replace(os.sep, "/"), None)
+                try:
+                    os.remove(dstf)
+                    removed += 1
+                    if durability:
+                        durability.add(dstf)
+                    print(f"{prefix}Delete {rel}")
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    print(f"{prefix}[WARN] Failed to delete stale file {rel}: {e}")
+                    continue
+                # Prune directories the delete emptied, without walking dst_dir.
+                parent = os.path.dirname(dstf)
+                while os.path.normpath(parent) != os.path.normpath(dst_dir):
+                    try:
+                        os.rmdir(parent)
+                    except OSError:
+                        break
+                    parent = os.path.dirname(parent)
+            if durability:
+                durability.close()
+
+    if copied or deleted:
+        _save_deploy_index(dst_dir, index)
+    if not copied and not removed:
+        print(f"{prefix}Delta deploy: nothing to update.")
+    return copied + removed
+
+# --- git-aware delta deploy ---------------------------------------------------
+# After a successful deploy the git revision plus the md5 of every path that
+# differed from it (dirty, untracked or deleted) is recorded for the target on
+# the host (DEPLOY_STATE_DIR, see _host_state_path). The next fast deploy diffs
+# the working tree against that revision and only stages, steps and copies the
+# paths that changed. Files ignored by git, edits made on the radio and deploys
+# from another machine are not seen this way; --full-verify (or env
+# DEPLOY_GIT_DELTA=0) forces the full walk.
+GIT_DELTA_ENABLED = os.environ.get("DEPLOY_GIT_DELTA", "1").strip().lower() not in ("0", "false", "no", "off")
+GIT_STATE_VERSION = 1
+LEGACY_GIT_STATE_SUFFIX = ".deploy-git.json"  # older builds wrote this beside the tree
+
+def _git(cwd, *args):
+    try:
+        res = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return res.stdout.decode("utf-8", "surrogateescape")
+
+def _git_changed_paths(repo_src, rev):
+    """Paths under repo_src ('/'-separated) that differ from rev in the working tree, or are untracked."""
+    diff = _git(repo_src, "diff", "--relative", "--name-only", "--no-renames", "-z", rev, "--", ".")
+    untracked = _git(repo_src, "ls-files", "--others", "--exclude-standard", "-z", "--", ".")
+    if diff is None or untracked is None:
+        return None
+    return {p for p in (diff + untracked).split("\0") if p}
+
+def _md5_or_none(repo_src, rel, hashes):
+    if rel not in hashes:
+        try:
+            hashes[rel] = file_md5(os.path.join(repo_src, rel))
+        except OSError:
+            hashes[rel] = None
+    return hashes[rel]
+
+def git_snapshot(repo_src, hashes):
+    """
+    {"rev": HEAD, "dirty": {rel: md5 or None}} for repo_src, or None when it
+    is not a git checkout. `hashes` caches file digests across calls.
+    """
+    rev = _git(repo_src, "rev-parse", "--verify", "-q", "HEAD")
+    if not rev:
+        return None
+    rev = rev.strip()
+    paths = _git_changed_paths(repo_src, rev)
+    if paths is None:
+        return None
+    return {"rev": rev, "dirty": {rel: _md5_or_none(repo_src, rel, hashes) for rel in sorted(paths)}}
+
+def _git_state_path(out_dir):
+    return _host_state_path(out_dir, "git")
+
+def clear_git_state(out_dir):
+    """Forget the recorded state; called before a target is modified."""
+    _remove_legacy_sidecar(out_dir, LEGACY_GIT_STATE_SUFFIX)
+    try:
+        os.remove(_git_state_path(out_dir))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[DELTA][WARN] Could not remove {_git_state_path(out_dir)}: {e}")
 
-    removed = 0
-    if delete_stale and dst_files:
-        stale = [rel for rel in dst_files.keys() if rel not in src_files]
-        if stale:
-            bar_delete = tqdm(total=len(stale), desc="Deleting stale")
-            for rel in stale:
-                p = os.path.join(dst_dir, rel)
-                try:
-                    os.remove(p)
-                    removed += 1
-                except FileNotFoundError:
-                    pass
-                except Exception as e:
-                    print(f"[WARN] Failed to delete stale file {rel}: {e}")
-                bar_delete.update(1)
-            bar_delete.close()
-            _remove_empty_dirs(dst_dir)
+def record_git_state(out_dir, signature, snapshot):
+    """Record what out_dir now holds: `snapshot` processed by steps with `signature`."""
+    if snapshot is None:
+        return
+    path = _git_state_path(out_dir)
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(DEPLOY_STATE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": GIT_STATE_VERSION, "signature": signature, **snapshot},
+                      f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[DELTA][WARN] Could not write {path}: {e}")
 
-    if not to_copy and removed == 0:
-        print("Fast deploy: nothing to update.")
-    elif removed:
-        print(f"Removed {removed} stale file(s).")
+def plan_git_delta(repo_src, out_dir, signature, hashes):
+    """
+    (changed, deleted) paths since out_dir's recorded deploy, or None when a
+    full verify is needed (no/foreign state, other steps or locale, unknown
+    revision).
+    """
+    try:
+        with open(_git_state_path(out_dir), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    if (not isinstance(state, dict) or state.get("version") != GIT_STATE_VERSION
+            or state.get("signature") != signature or not os.path.isdir(out_dir)):
+        return None
+    paths = _git_changed_paths(repo_src, state.get("rev") or "")
+    if paths is None:
+        return None
+    recorded = state.get("dirty") or {}
+    changed, deleted = [], []
+    for rel in sorted(paths | set(recorded)):
+        digest = _md5_or_none(repo_src, rel, hashes)
+        if rel in recorded and recorded[rel] == digest:
+            continue
+        (changed if digest is not None else deleted).append(rel)
+    return changed, deleted
 
 # --- config: derive repo root and load deploy.json ----------------------------
 ROOT = Path(__file__).resolve().parents[2]
@@ -785,6 +2115,7 @@ else:
 # NEW: Debug which base config file we are using
 print(f"[CONFIG] Using base config file: {cfg_path}")
 
+_config_t0 = time.perf_counter()
 try:
     with open(cfg_path, "r") as f:
         user_cfg = json.load(f)
@@ -800,6 +2131,7 @@ if "tgt_name" not in config or not config["tgt_name"]:
     sys.exit(1)
 
 CONFIG_PATH = str(cfg_path)
+TIMING.record("config", time.perf_counter() - _config_t0, files=1)
 
 pbar = None
 
@@ -859,6 +2191,15 @@ DEFAULT_SERIAL_BAUD = 115200
 DEFAULT_SERIAL_RETRIES = 30
 DEFAULT_SERIAL_DELAY = 1.0
 
+# Where the radio's ACM port shows up; changes here wake the serial waiter.
+if sys.platform.startswith("linux"):
+    SERIAL_WATCH_DIRS = ("/dev/serial/by-id", "/dev")
+elif sys.platform == "darwin":
+    SERIAL_WATCH_DIRS = ("/dev",)
+else:
+    SERIAL_WATCH_DIRS = ()      # Windows: no device directory; re-enumerate on a short poll
+SERIAL_POLL_S = 0.25
+
 def ethos_serial(ethossuite_bin, action, radio=None):
     # Ethos Suite is optional. Prefer connect.py HID mode switching when available.
     if not ethossuite_bin:
@@ -886,25 +2227,143 @@ def ethos_serial(ethossuite_bin, action, radio=None):
         return 1, "", str(e)
 
 
-def wait_for_scripts_mount(ethossuite_bin=None, attempts=10, delay=2):
+# A mode switch is done when its effect is observed (hotplug.ModeSwitch): the
+# ACM port appearing for 'start', a radio volume mounting for 'stop'. The
+# timeout only bounds a switch the radio missed; the latency is recorded in
+# the timing report as a "usb serial" / "usb storage" phase.
+USB_SWITCH_TIMEOUT_S = 8.0
+
+
+def _serial_switch(vid_hex=DEFAULT_SERIAL_VID, pid_hex=DEFAULT_SERIAL_PID, name_hint="Serial"):
+    """ModeSwitch resolved by the serial debug port appearing."""
+    watcher = hotplug.DirWatcher(SERIAL_WATCH_DIRS) if SERIAL_WATCH_DIRS else None
+    return hotplug.ModeSwitch(
+        "serial",
+        lambda: _find_serial_debug_port(vid_hex=vid_hex, pid_hex=pid_hex, name_hint=name_hint),
+        watcher, poll_interval=SERIAL_POLL_S)
+
+
+def _storage_probe():
+    # connect.py's cpuid markers keep the sdcard > radio > flash order; the
+    # loose scan (any drive with scripts/) is only for when it is unavailable.
+    if _load_connect_module():
+        return _connect_find_scripts_dir(quiet=True)
+    return scan_usb_drives_for_radio(quiet=True)
+
+
+def _storage_switch(watcher=None):
+    """
+    ModeSwitch resolved by a radio SCRIPTS dir mounting: from the mount table
+    when `watcher` is given (Linux), otherwise by polling the drive scan.
+    """
+    if watcher is not None:
+        return hotplug.ModeSwitch("storage", lambda: _mounted_scripts_dir(watcher.mounts()), watcher)
+    return hotplug.ModeSwitch("storage", _storage_probe, poll_interval=STORAGE_POLL_S)
+
+
+def _config_serial_ids(config):
+    """(vid_hex, pid_hex, name_hint) of the serial debug port from the deploy config."""
+    return (str(config.get('serial_vid', DEFAULT_SERIAL_VID)),
+            str(config.get('serial_pid', DEFAULT_SERIAL_PID)),
+            str(config.get('serial_name_hint', "Serial")))
+
+
+def switch_usb_mode(ethossuite_bin, action, timeout=USB_SWITCH_TIMEOUT_S, serial_ids=(), watcher=None):
+    """
+    ethos_serial(action), then wait until the new mode is observed. Returns
+    the serial port ('start') or SCRIPTS dir ('stop'), or None on timeout.
+    `serial_ids` is (vid_hex, pid_hex, name_hint) for the port to expect;
+    `watcher` is a mount watcher the caller already holds open.
+    """
+    if action == 'start':
+        owned = True
+        switch = _serial_switch(*serial_ids)
+    else:
+        owned = watcher is None
+        switch = _storage_switch(_open_mount_watcher() if owned else watcher)
+    try:
+        rc, _, _ = ethos_serial(ethossuite_bin, action)
+        # A rejected request will not switch; just check the current state.
+        result = switch.wait(timeout if rc == 0 else 0)
+    finally:
+        if owned:
+            switch.close()
+    if result:
+        print(f"[USB] {switch.target} mode after {switch.latency_s:.2f}s ({result})")
+        TIMING.record(f"usb {switch.target}", switch.latency_s)
+    elif rc == 0:
+        print(f"[USB] {switch.target} mode not observed within {timeout:g}s")
+    return result
+
+
+# Linux: wait_for_scripts_mount follows the mount table instead of sleeping
+# between attempts. DEPLOY_MOUNTINFO points it at a fake table (any OS), so a
+# harness can "mount" a temp directory holding radio.bin/<key>.cpuid + scripts/.
+MOUNTINFO_PATH = os.environ.get("DEPLOY_MOUNTINFO") or hotplug.MOUNTINFO
+MOUNT_WATCH_ENABLED = sys.platform.startswith("linux") or bool(os.environ.get("DEPLOY_MOUNTINFO"))
+# Elsewhere the drive scan is polled at this interval.
+STORAGE_POLL_S = 0.25
+
+
+def _mounted_scripts_dir(mounts):
+    """SCRIPTS dir of a radio volume in `mounts` (hotplug.read_mounts output), or None."""
+    drives = hotplug.find_radio_volumes(mounts)
+    for key in ('sdcard', 'radio', 'flash'):
+        root = drives.get(key)
+        if root and os.path.isdir(os.path.join(root, 'scripts')):
+            return os.path.normpath(os.path.join(root, 'scripts'))
+    return None
+
+
+def _open_mount_watcher():
+    if not MOUNT_WATCH_ENABLED or not os.path.exists(MOUNTINFO_PATH):
+        return None
+    try:
+        return hotplug.MountWatcher(MOUNTINFO_PATH)
+    except Exception as e:
+        print(f"[MOUNT] Mount table watch unavailable ({type(e).__name__}: {e}); polling instead.")
+        return None
+
+
+def wait_for_scripts_mount(ethossuite_bin=None, attempts=10, delay=2, serial_ids=()):
     """
-    Poll Ethos Suite for the mounted SCRIPTS directory.
+    Poll Ethos Suite for the mounted SCRIPTS directory. Call it after
+    switch_usb_mode(..., 'stop') did not observe the mount.
 
     Behaviour:
       - Try Ethos Suite up to `attempts` times.
       - If still not mounted, perform a final USB drive scan fallback.
+      - The waits between attempts end the moment a radio volume mounts:
+        on Linux from /proc/self/mountinfo, elsewhere by polling the drive scan.
+    `serial_ids` (see _config_serial_ids) identifies the debug port the
+    recovery bounce waits for.
     Debug:
       - Set DEPLOY_DEBUG_MOUNT=1 to print the returned path / exception each attempt.
     """
+    watcher = _open_mount_watcher()
+    try:
+        return _wait_for_scripts_mount(ethossuite_bin, attempts, delay, watcher, serial_ids)
+    finally:
+        if watcher is not None:
+            watcher.close()
+
+
+def _wait_for_scripts_mount(ethossuite_bin, attempts, delay, watcher, serial_ids=()):
     debug_mount = os.environ.get("DEPLOY_DEBUG_MOUNT", "").strip().lower() in ("1", "true", "yes", "on")
 
     last_err = None
     last_path = None
     recovery_cycle_done = False
 
-    # Give the radio a moment after switching from USB debug to mass-storage.
-    if delay > 0:
-        time.sleep(min(delay, 2))
+    def _mount_wait(seconds):
+        mounted = _storage_switch(watcher).wait(seconds)
+        if mounted:
+            print(f"[MOUNT] Radio drive mounted: {mounted}")
+        return mounted
+
+    def _request_storage():
+        # Storage request that returns as soon as the volume mounts.
+        return switch_usb_mode(ethossuite_bin, 'stop', timeout=delay, watcher=watcher)
 
     for i in range(attempts):
         # Re-assert mass-storage mode if mount does not appear quickly.
@@ -912,7 +2371,9 @@ def wait_for_scripts_mount(ethossuite_bin=None, attempts=10, delay=2):
         if i > 0 and i % 3 == 0:
             try:
                 print(f"[ETHOS] Re-requesting mass-storage mode ({i+1}/{attempts})...")
-                ethos_serial(ethossuite_bin, 'stop')
+                mounted = _request_storage()
+                if mounted:
+                    return mounted
             except Exception:
                 pass
 
@@ -920,13 +2381,22 @@ def wait_for_scripts_mount(ethossuite_bin=None, attempts=10, delay=2):
         if i >= max(2, attempts // 2) and not recovery_cycle_done:
             try:
                 print("[ETHOS] Radio drive still missing; forcing USB mode reinit (debug -> storage)...")
-                ethos_serial(ethossuite_bin, 'start')
-                time.sleep(1.0)
-                ethos_serial(ethossuite_bin, 'stop')
+                # Go back to storage once debug mode is up rather than after a fixed pause.
+                switch_usb_mode(ethossuite_bin, 'start', timeout=delay, serial_ids=serial_ids)
                 recovery_cycle_done = True
+                mounted = _request_storage()
+                if mounted:
+                    return mounted
             except Exception:
                 pass
 
+        # Mount table first: no HID handle or directory scan needed.
+        if watcher is not None:
+            mounted = _mounted_scripts_dir(watcher.mounts())
+            if mounted:
+                print(f"[MOUNT] Radio drive mounted: {mounted}")
+                return mounted
+
         # First: direct connect.py drive discovery
         path = _connect_find_scripts_dir()
         if path and os.path.isdir(path):
@@ -961,7 +2431,9 @@ def wait_for_scripts_mount(ethossuite_bin=None, attempts=10, delay=2):
             if debug_mount:
                 print(f"[ETHOS][DEBUG] attempt {i+1}/{attempts} failed: {type(e).__name__}: {e}")
             print(f"[ETHOS] Waiting for radio drive ({i+1}/{attempts})...")
-            time.sleep(delay)
+            mounted = _mount_wait(delay)
+            if mounted:
+                return mounted
 
     # Final fallback: explicit USB scan (only after Ethos Suite polling is exhausted)
     print("[ETHOS] Ethos Suite polling exhausted; attempting USB drive scan fallback...")
@@ -986,23 +2458,45 @@ def _find_com_port_by_vid_pid(vid_hex, pid_hex):
         return None
 
 
-def _find_com_port(vid_hex=None, pid_hex=None, name_hint=None, allow_fuzzy_if_no_vidpid=True, prefer_pid_from_hwid=True):
+_last_port_listing = None
+_SERIAL_PORT_CACHE = {}     # (vid_hex, pid_hex, name_hint) -> device
+
+
+def _list_com_ports():
     try:
         from serial.tools import list_ports
     except Exception:
         print("[SERIAL] pyserial not installed. Install with: pip install pyserial")
         return None
+    return list(list_ports.comports())
 
-    ports = list(list_ports.comports())
-    if not ports:
-        print("[SERIAL] No serial ports detected.")
-        return None
 
+def _print_port_listing(ports):
+    """Print the detected ports, but only when they differ from the last print. Returns True if printed."""
+    global _last_port_listing
+    listing = tuple((p.device, p.vid, p.pid, p.description or '', getattr(p, 'interface', None) or '', p.hwid)
+                    for p in ports)
+    if listing == _last_port_listing:
+        return False
+    _last_port_listing = listing
+    if not listing:
+        print("[SERIAL] No serial ports detected.")
+        return True
     print("[SERIAL] Detected ports:")
-    for p in ports:
-        desc = p.description or ''
-        iface = getattr(p, 'interface', None) or ''
-        print(f"  - device={p.device} vid={p.vid} pid={p.pid} desc='{desc}' iface='{iface}' hwid='{p.hwid}'")
+    for device, vid, pid, desc, iface, hwid in listing:
+        print(f"  - device={device} vid={vid} pid={pid} desc='{desc}' iface='{iface}' hwid='{hwid}'")
+    return True
+
+
+def _find_com_port(vid_hex=None, pid_hex=None, name_hint=None, allow_fuzzy_if_no_vidpid=True, prefer_pid_from_hwid=True,
+                   ports=None):
+    if ports is None:
+        ports = _list_com_ports()
+        if ports is None:
+            return None
+    verbose = _print_port_listing(ports)
+    if not ports:
+        return None
 
     def _pid_from_hwid(hw):
         try:
@@ -1029,7 +2523,8 @@ def _find_com_port(vid_hex=None, pid_hex=None, name_hint=None, allow_fuzzy_if_no
                         return p.device
                 except Exception:
                     pass
-            print(f"[SERIAL] No exact VID:PID match yet ({vid_hex}:{pid_hex}). Will keep scanning.")
+            if verbose:
+                print(f"[SERIAL] No exact VID:PID match yet ({vid_hex}:{pid_hex}). Will keep scanning.")
             return None
 
     if vid_hex and not pid_hex:
@@ -1065,103 +2560,206 @@ def _find_com_port(vid_hex=None, pid_hex=None, name_hint=None, allow_fuzzy_if_no
     return None
 
 
+def _cached_port_still_valid(device, vid_hex, pid_hex):
+    """
+    Cheap check that a cached match still names the same device, without
+    re-enumerating. Linux compares the USB ids in sysfs; other POSIX systems
+    only check the node exists; Windows always re-enumerates.
+    """
+    if os.name != "posix" or not os.path.exists(device):
+        return False
+    if not sys.platform.startswith("linux") or not (vid_hex and pid_hex):
+        return True
+    usb = os.path.join("/sys/class/tty", os.path.basename(os.path.realpath(device)), "device", "..")
+    try:
+        with open(os.path.join(usb, "idVendor")) as f:
+            vid = int(f.read().strip(), 16)
+        with open(os.path.join(usb, "idProduct")) as f:
+            pid = int(f.read().strip(), 16)
+        return vid == int(vid_hex, 16) and pid == int(pid_hex, 16)
+    except (OSError, ValueError):
+        return False
+
+
 def _find_serial_debug_port(vid_hex=None, pid_hex=None, name_hint=None):
     """Return a likely serial debug device, preferring exact VID:PID matches."""
+    key = (vid_hex, pid_hex, name_hint)
+    cached = _SERIAL_PORT_CACHE.get(key)
+    if cached and _cached_port_still_valid(cached, vid_hex, pid_hex):
+        return cached
+
+    ports = _list_com_ports()
+    if ports is None:
+        return None
     port = _find_com_port(
         vid_hex=vid_hex,
         pid_hex=pid_hex,
         name_hint=name_hint,
         allow_fuzzy_if_no_vidpid=False,
+        ports=ports,
     )
+    if not port:
+        # macOS sometimes reports incomplete metadata during re-enumeration.
+        port = _find_com_port(
+            vid_hex=None,
+            pid_hex=None,
+            name_hint=name_hint,
+            allow_fuzzy_if_no_vidpid=True,
+            ports=ports,
+        )
     if port:
-        return port
+        _SERIAL_PORT_CACHE[key] = port
+    else:
+        _SERIAL_PORT_CACHE.pop(key, None)
+    return port
 
-    # macOS sometimes reports incomplete metadata during re-enumeration.
-    return _find_com_port(
-        vid_hex=None,
-        pid_hex=None,
-        name_hint=name_hint,
-        allow_fuzzy_if_no_vidpid=True,
-    )
+
+def wait_for_serial_debug_port(vid_hex=None, pid_hex=None, name_hint=None, timeout=30.0):
+    """
+    Return the serial debug port as soon as it appears, or None after
+    `timeout` seconds. Rescans only when the device directories change
+    (inotify on Linux, directory polling on macOS, short re-enumeration
+    polls on Windows) instead of on a fixed retry tick.
+    """
+    with _serial_switch(vid_hex, pid_hex, name_hint) as switch:
+        port = switch.wait(0)
+        if port:
+            return port
+        print(f"[SERIAL] Waiting up to {timeout:.0f}s for the serial port...")
+        return switch.wait(timeout)
 
 
 def tail_serial_debug(vid=DEFAULT_SERIAL_VID, pid=DEFAULT_SERIAL_PID,
                       baud=DEFAULT_SERIAL_BAUD, retries=DEFAULT_SERIAL_RETRIES,
-                      delay=DEFAULT_SERIAL_DELAY, newline=b'\n', name_hint="Serial"):
+                      delay=DEFAULT_SERIAL_DELAY, newline=b'\n', name_hint="Serial",
+                      timestamps="wall", include=None, exclude=None, color="auto",
+                      log_file=None, log_max_bytes=10 * 1024 * 1024, log_backups=5,
+                      record=None, dashboard=False, dashboard_interval=1.0, events_file=None):
+    """
+    Tail the radio's serial debug port through serial_log.SerialPipeline:
+    host timestamps, optional include/exclude regexes, console colouring and
+    an optional rotating log file written on its own thread. `record` saves
+    the raw stream as a capture that --replay can play back; `dashboard` /
+    `events_file` add MSP and memory metrics (see _serial_pipeline).
+    """
     try:
         import serial
     except Exception:
         print("[SERIAL] pyserial not installed. Install with: pip install pyserial")
         return 2
 
-    time.sleep(1.5)
-
-    port = None
-    for i in range(retries):
-        port = _find_serial_debug_port(vid_hex=vid, pid_hex=pid, name_hint=name_hint)
-        if port:
-            break
-        print(f"[SERIAL] Waiting for serial port ({i+1}/{retries})...")
-        time.sleep(delay)
-
+    port = wait_for_serial_debug_port(vid_hex=vid, pid_hex=pid, name_hint=name_hint,
+                                      timeout=retries * delay)
     if not port:
         print("[SERIAL] No suitable COM port found. See the detected ports above.")
         return 3
 
     print(f"[SERIAL] Connecting to {port} @ {baud} ...")
     open_attempts = 8
+    # A freshly created ACM node can refuse opens until udev has applied its
+    # permissions, so early retries are quick and back off towards `delay`.
+    backoff = 0.1
     for attempt in range(1, open_attempts+1):
         try:
             s = serial.Serial(port=port, baudrate=baud, timeout=0.5)
             break
         except FileNotFoundError as e:
             print(f"[SERIAL] Open attempt {attempt}/{open_attempts} -> device vanished; rescanning...")
-            port = _find_serial_debug_port(vid_hex=vid, pid_hex=pid, name_hint=name_hint)
-            if not port:
-                import time as _t; _t.sleep(delay)
+            _SERIAL_PORT_CACHE.clear()
+            port = wait_for_serial_debug_port(vid_hex=vid, pid_hex=pid, name_hint=name_hint,
+                                              timeout=delay) or port
             continue
         except Exception as e:
             print(f"[SERIAL] Open attempt {attempt}/{open_attempts} failed: {e}")
-            import time as _t; _t.sleep(delay)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, delay)
             continue
     else:
         print("[SERIAL] Could not open any matching COM port after multiple attempts.")
         return 4
 
+    pipeline = _serial_pipeline(newline=newline, timestamps=timestamps, include=include,
+                                exclude=exclude, color=color, log_file=log_file,
+                                log_max_bytes=log_max_bytes, log_backups=log_backups,
+                                dashboard=dashboard, dashboard_interval=dashboard_interval,
+                                events_file=events_file)
+    capture = None
+    if record:
+        capture = serial_log.CaptureWriter(record, meta={"port": port, "baud": baud})
+        print(f"[SERIAL] Recording raw stream to {record}")
     try:
         with s:
             print("- Serial connected. Press Ctrl+C to stop -")
-            buf = b""
-            while True:
-                try:
-                    data = s.read(1024)
-                    if data:
-                        buf += data
-                        while True:
-                            if newline in buf:
-                                line, buf = buf.split(newline, 1)
-                                try:
-                                    print(line.decode('utf-8', errors='replace'))
-                                except Exception:
-                                    print(line)
-                            else:
-                                break
-                except KeyboardInterrupt:
-                    print("[SERIAL] Stopped by user.")
-                    return 0
+            serial_log.read_serial(s, pipeline, on_chunk=capture)
     except KeyboardInterrupt:
         print("[SERIAL] Stopped by user.")
         return 0
     except Exception as e:
         print(f"[SERIAL] Error: {e}")
         return 4
+    finally:
+        pipeline.close()
+        if capture is not None:
+            capture.close()
+
+
+def _serial_pipeline(newline=b'\n', log_file=None, log_max_bytes=10 * 1024 * 1024, log_backups=5,
+                     dashboard=False, dashboard_interval=1.0, events_file=None, **options):
+    """
+    Build the SerialPipeline shared by the live tail and --replay. With
+    `dashboard` the raw lines stay off the console (they still reach the log
+    file) and a rolling MSP/memory summary is drawn instead; `events_file`
+    (.csv or .json) receives the parsed [msp]/[mem] events.
+    """
+    log = None
+    if log_file:
+        log = serial_log.RotatingLogWriter(log_file, max_bytes=log_max_bytes, backups=log_backups)
+        print(f"[SERIAL] Logging to {log_file} (rotating at {log_max_bytes // (1024 * 1024)} MB, {log_backups} backup(s))")
+    pipeline = serial_log.SerialPipeline(newline=newline, log=log, echo=not dashboard, **options)
+    if dashboard or events_file:
+        out = pipeline.out
+        redraw = dashboard and bool(getattr(out, "isatty", None) and out.isatty())
+        pipeline.consumers.append(serial_metrics.MspMetrics(
+            dashboard=dashboard, interval=dashboard_interval, export=events_file, out=out, redraw=redraw))
+    return pipeline
+
+
+def replay_serial_capture(path, speed="1", **options):
+    """Play a --record capture back through the serial tail pipeline."""
+    try:
+        speed = serial_log.parse_speed(speed)
+    except ValueError as e:
+        print(f"[SERIAL] {e}")
+        return 2
+    options.pop("record", None)
+    pipeline = _serial_pipeline(**options)
+    pace = "max speed" if speed is None else f"{speed:g}x"
+    print(f"[SERIAL] Replaying {path} at {pace}. Press Ctrl+C to stop -")
+    try:
+        header, chunks = serial_log.replay_capture(path, pipeline, speed)
+    except KeyboardInterrupt:
+        print("[SERIAL] Replay stopped by user.")
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"[SERIAL] Replay failed: {e}")
+        return 4
+    finally:
+        pipeline.close()
+    print(f"[SERIAL] Replayed {chunks} chunk(s), {pipeline.lines} line(s) "
+          f"(recorded from {header.get('port', '?')} @ {header.get('baud', '?')}).")
+    return 0
 
 # Copy with progress
+_copy_durability = None
+
 def copy_verbose(src, dst):
     pbar.update(1)
     if DEPLOY_TO_RADIO:
         throttled_copyfile(src, dst)
-        flush_fs()
+        if _copy_durability:
+            _copy_durability.add(dst, os.path.getsize(dst))
+        else:
+            flush_fs()
     else:
         shutil.copy2(src, dst)
 
@@ -1174,36 +2772,116 @@ def count_files(dirpath, ext=None):
         total += len(files)
     return total
 
-def run_step_script(step, out_dir, lang="en"):
-    """
-    Generic step runner.
+def tree_bytes(dirpath):
+    total = 0
+    for r, _, files in os.walk(dirpath):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(r, f))
+            except OSError:
+                pass
+    return total
 
-    Conventions:
-      - If `step` ends with '.py' or contains a path separator,
-          treat it as a path (absolute or relative to git_src).
-      - Otherwise, look for:
-          <git_src>/.vscode/scripts/deploy_step_<step>.py
-    The step script is called as:
-      python <script> --out-dir OUT --lang LANG --git-src GIT_SRC
+class StepContext:
     """
-    git_src = config["git_src"]
+    Shared state handed to in-process steps.
 
-    # Determine script path
-    if step.endswith(".py") or os.sep in step or "/" in step:
-        script_path = step
-        if not os.path.isabs(script_path):
-            script_path = os.path.join(git_src, script_path)
-    else:
-        script_path = os.path.join(
-            git_src, ".vscode", "scripts", f"deploy_step_{step}.py"
-        )
+    One context lives per (git_src, lang) for the whole deploy (and across
+    pushes in --watch), so expensive inputs such as translation JSON are
+    loaded once via load_cached(). Steps never see that shared instance:
+    run_step_script hands each call its own copy from for_run(), so targets
+    deployed in parallel cannot clobber each other's per-run fields.
+    """
 
-    script_path = os.path.normpath(script_path)
+    def __init__(self, git_src, lang):
+        self.git_src = git_src
+        self.lang = lang
+        self.changed_files = None   # paths relative to out_dir, or None = all files
+        self.verify_workers = 1
+        self.radio = False
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def for_run(self, changed=None, verify_workers=1, radio=False):
+        """Return a per-call copy carrying the run fields; the load cache stays shared."""
+        run = copy.copy(self)
+        run.changed_files = list(changed) if changed is not None else None
+        run.verify_workers = verify_workers
+        run.radio = bool(radio)
+        return run
+
+    def load_cached(self, path, loader):
+        """Return loader(path), reusing the previous result while the file is unchanged."""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        sig = (st.st_size, st.st_mtime_ns)
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit and hit[0] == sig:
+                return hit[1]
+            value = loader(path)
+            self._cache[key] = (sig, value)
+            return value
+
+
+_step_contexts = {}
+_step_contexts_lock = threading.Lock()
+_step_modules = {}
+
+def step_context(git_src, lang):
+    key = (os.path.abspath(git_src), lang)
+    with _step_contexts_lock:
+        ctx = _step_contexts.get(key)
+        if ctx is None:
+            ctx = _step_contexts[key] = StepContext(git_src, lang)
+    return ctx
+
+def _load_step_module(script_path):
+    """Import a built-in step script once; None if it cannot be imported."""
+    if script_path in _step_modules:
+        return _step_modules[script_path]
+    mod = None
+    try:
+        import importlib.util
+        module_dir = os.path.dirname(script_path)
+        if module_dir not in sys.path:
+            sys.path.insert(0, module_dir)
+        name = os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        if spec and spec.loader:
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)  # type: ignore
+    except Exception as e:
+        print(f"[STEP] Could not import {script_path} ({type(e).__name__}: {e}); using subprocess.")
+        mod = None
+    _step_modules[script_path] = mod
+    return mod
 
-    if not os.path.isfile(script_path):
-        print(f"[STEP] Skipping '{step}': script not found at {script_path}")
-        return
+def _step_script_path(step, git_src):
+    if step.endswith(".py") or os.sep in step or "/" in step:
+        path = step if os.path.isabs(step) else os.path.join(git_src, step)
+        return os.path.normpath(path), False
+    return os.path.normpath(os.path.join(git_src, ".vscode", "scripts", f"deploy_step_{step}.py")), True
+
+def _step_attr(step, name, default):
+    """Module-level attribute of a built-in step script (default for external scripts)."""
+    script_path, builtin = _step_script_path(step, config["git_src"])
+    if not builtin or not os.path.isfile(script_path):
+        return default
+    return getattr(_load_step_module(script_path), name, default)
+
+def _step_scope(step):
+    """'target' for steps that must run per destination, else 'tree'."""
+    return _step_attr(step, "STEP_SCOPE", "tree")
+
+def steps_allow_delta(steps):
+    """
+    True when every step's output depends only on the changed files it is
+    handed (STEP_INCREMENTAL = True), so a git delta deploy is complete.
+    """
+    return all(_step_attr(step, "STEP_INCREMENTAL", False) for step in steps or ())
 
+def _run_step_subprocess(step, script_path, out_dir, lang, git_src, workers, changed):
     cmd = [
         sys.executable,
         script_path,
@@ -1212,25 +2890,195 @@ def run_step_script(step, out_dir, lang="en"):
         "--git-src", git_src,
     ]
 
-    print(f"[STEP] Running '{step}' -> {script_path}")
+    # Steps that verify trees (e.g. soundpack) honour the same worker policy.
+    env = dict(os.environ)
+    env["DEPLOY_VERIFY_WORKERS"] = str(workers)
+    env.pop("DEPLOY_CHANGED_FILES", None)
+    changed_list = None
     try:
-        subprocess.run(cmd, check=True)
+        if changed is not None:
+            fd, changed_list = tempfile.mkstemp(prefix="rfsuite-changed-", suffix=".txt")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for rel in changed:
+                    f.write(rel + "\n")
+            env["DEPLOY_CHANGED_FILES"] = changed_list
+        subprocess.run(cmd, check=True, env=env)
+        return True
     except subprocess.CalledProcessError as e:
         print(f"[STEP] Step '{step}' failed with exit code {e.returncode}")
     except Exception as e:
         print(f"[STEP] Step '{step}' crashed: {e}")
+    finally:
+        if changed_list:
+            try:
+                os.remove(changed_list)
+            except OSError:
+                pass
+    return False
+
+def run_step_script(step, out_dir, lang="en", radio=None, changed=None):
+    """
+    Generic step runner.
+
+    Conventions:
+      - If `step` ends with '.py' or contains a path separator,
+          treat it as a path (absolute or relative to git_src).
+      - Otherwise, look for:
+          <git_src>/.vscode/scripts/deploy_step_<step>.py
+    Built-in step modules that define
+      run_step(out_dir, lang, git_src, context) -> int
+    are called in-process with the shared StepContext. Anything else is run as:
+      python <script> --out-dir OUT --lang LANG --git-src GIT_SRC
+    `changed` lists (relative to OUT) the only files that changed or were
+    removed since the steps last ran, or None for all files. In-process steps see it as
+    context.changed_files; subprocess steps get env DEPLOY_CHANGED_FILES
+    pointing at a file with one path per line.
+
+    Returns True unless the step failed.
+    """
+    git_src = config["git_src"]
+    script_path, builtin = _step_script_path(step, git_src)
+
+    if not os.path.isfile(script_path):
+        print(f"[STEP] Skipping '{step}': script not found at {script_path}")
+        return True
+
+    # When not staging, a radio deploy runs steps directly on the radio.
+    workers = verify_workers(radio=radio)
+    run_step = getattr(_load_step_module(script_path), "run_step", None) if builtin else None
+
+    print(f"[STEP] Running '{step}' -> {script_path}{'' if run_step else ' (subprocess)'}")
+    with TIMING.phase(f"step {step}"):
+        if not callable(run_step):
+            return _run_step_subprocess(step, script_path, out_dir, lang, git_src, workers, changed)
+        ctx = step_context(git_src, lang).for_run(
+            changed, workers, DEPLOY_TO_RADIO if radio is None else radio)
+        try:
+            rc = run_step(os.path.abspath(out_dir), lang, git_src, ctx)
+        except Exception as e:
+            print(f"[STEP] Step '{step}' crashed: {type(e).__name__}: {e}")
+            return False
+        if rc:
+            print(f"[STEP] Step '{step}' failed with exit code {rc}")
+            return False
+        return True
 
 
-def run_steps(steps, out_dir, lang="en"):
-    """Run all requested steps (if any) for this output directory."""
+def run_steps(steps, out_dir, lang="en", radio=None, changed=None):
+    """Run all requested steps (if any) for this output directory; True if all succeeded."""
     if not steps:
-        return
+        return True
+    ok = True
     for step in steps:
-        run_step_script(step, out_dir, lang=lang)
+        ok = run_step_script(step, out_dir, lang=lang, radio=radio, changed=changed) and ok
+    return ok
+
+
+
+def stage_and_run_steps(git_src, repo_src, stage_name, lang, steps, snapshot=None, hashes=None):
+    """
+    Update the persistent staging cache for stage_name and run steps on it.
+    Returns (staged_tree, steps_ok). With a git `snapshot` the staged tree
+    records its own git state, and the next run restages only the git delta
+    instead of walking repo_src.
+    """
+    tgt = config['tgt_name']
+    stage_root = _stage_cache_root(git_src, tgt, stage_name, lang)
+    staged_out_dir = os.path.join(stage_root, tgt)
+    signature = _stage_signature(git_src, tgt, lang, steps)
+    staged_files = None
+    with TIMING.phase("stage") as timing:
+        delta = None
+        if snapshot is not None and GIT_DELTA_ENABLED and steps_allow_delta(steps):
+            delta = plan_git_delta(repo_src, staged_out_dir, signature, hashes if hashes is not None else {})
+        clear_git_state(staged_out_dir)
+        if delta is not None:
+            staged_files = stage_delta(repo_src, stage_root, staged_out_dir, signature, *delta)
+            changed, full = list(delta[0]) + list(delta[1]), False
+        if staged_files is None:
+            changed, full, staged_files = stage_incremental(repo_src, stage_root, staged_out_dir, signature)
+        timing["files"] = len(changed)
+    if full:
+        print(f"[STAGE] Staging cache rebuilt at {stage_root} ({len(changed)} file(s)); running steps...")
+        changed = None
+    else:
+        print(f"[STAGE] Staging cache {stage_root}: {len(changed)} changed file(s); running steps...")
+    ok = run_steps(steps, staged_out_dir, lang, radio=False, changed=changed)
+    if ok:
+        commit_stage_manifest(stage_root, signature, staged_files)
+        record_git_state(staged_out_dir, signature, snapshot)
+    return staged_out_dir, ok
 
 
+def copy_files_parallel(src_override, targets, lang="en", steps=None, jobs=None, stage_cache=None):
+    """
+    Deploy one staged tree to several targets at once.
+
+    The tree is staged (persistent cache, or a throwaway temp folder when
+    stage_cache is False) and tree-scoped steps run once;
+    then every target is mirrored concurrently with its own throttle,
+    durability batches, verify workers and labelled progress. Radio targets
+    get the incremental mirror (never the rename + full copy of
+    safe_full_copy). Steps whose module sets STEP_SCOPE = "target" (e.g.
+    sensors) run per destination after its copy. Targets with a recorded git
+    state only receive the git delta.
+    """
+    git_src = src_override or config['git_src']
+    tgt = config['tgt_name']
+    repo_src = os.path.join(git_src, 'src', tgt)
+
+    if stage_cache is None:
+        stage_cache = STAGE_CACHE_ENABLED
+
+    tree_steps = [st for st in (steps or []) if _step_scope(st) != "target"]
+    target_steps = [st for st in (steps or []) if _step_scope(st) == "target"]
+
+    signature = _stage_signature(git_src, tgt, lang, steps)
+    hashes = {}
+    snapshot = git_snapshot(repo_src, hashes)
+    # Like copy_files, only a cached stage may be narrowed to the git delta.
+    use_delta = stage_cache and GIT_DELTA_ENABLED and snapshot is not None and steps_allow_delta(steps)
+    if stage_cache:
+        staged_out_dir, stage_ok = stage_and_run_steps(git_src, repo_src, "shared", lang, tree_steps,
+                                                snapshot=snapshot, hashes=hashes)
+    else:
+        print("[STAGE] Staging to local temp (cache disabled), running steps...")
+        staged_out_dir = os.path.join(_stage_mkdir(prefix="rfsuite-stage-"), tgt)
+        with TIMING.phase("stage", files=count_files(repo_src)):
+            shutil.copytree(repo_src, staged_out_dir)
+        stage_ok = run_steps(tree_steps, staged_out_dir, lang, radio=False)
+
+    def _deploy(t):
+        TIMING.set_label(t['name'])
+        radio = bool(t.get('radio'))
+        out_dir = os.path.join(t['dest'], tgt)
+        delta = plan_git_delta(repo_src, out_dir, signature, hashes) if use_delta else None
+        clear_git_state(out_dir)
+        with TIMING.phase("target"):
+            if delta is not None:
+                apply_delta(staged_out_dir, out_dir, *delta, radio=radio, label=t['name'])
+            else:
+                mirror_copy(staged_out_dir, out_dir, delete_stale=True, radio=radio, label=t['name'])
+            if run_steps(target_steps, out_dir, lang, radio=radio) and stage_ok:
+                record_git_state(out_dir, signature, snapshot)
+        print(f"Done: {t['name']}")
+
+    print(f"[MULTI] Deploying to {len(targets)} target(s): " + ", ".join(t['name'] for t in targets))
+    from concurrent.futures import ThreadPoolExecutor
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs or len(targets))) as pool:
+        futures = {pool.submit(_deploy, t): t for t in targets}
+        for fut, t in futures.items():
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"[MULTI] {t['name']} failed: {type(e).__name__}: {e}")
+                failed.append(t['name'])
+    if failed:
+        raise RuntimeError(f"Deploy failed for: {', '.join(failed)}")
+
 
-def copy_files(src_override, fileext, targets, lang="en", steps=None):
+def copy_files(src_override, fileext, targets, lang="en", steps=None, stage_cache=None):
     """
     Copy files to targets.
 
@@ -1240,10 +3088,14 @@ def copy_files(src_override, fileext, targets, lang="en", steps=None):
       3) copy staged results to the mounted radio
 
     This avoids lots of tiny edits + verify cycles directly on removable storage.
+    With the staging cache (default) the staged tree persists between runs and
+    only files changed in the repo are re-staged and passed to the steps.
     """
     global pbar
     git_src = src_override or config['git_src']
     tgt = config['tgt_name']
+    if stage_cache is None:
+        stage_cache = STAGE_CACHE_ENABLED
     print(f"Copy mode: {fileext or 'all'}")
 
     def _local_recreate_tree(src_dir: str, dst_dir: str):
@@ -1261,6 +3113,17 @@ def copy_files(src_override, fileext, targets, lang="en", steps=None):
     def _fast_copy_from_stage(stage_dir: str, dest_dir: str):
         mirror_copy(stage_dir, dest_dir, delete_stale=True)
 
+    def _lua_mirror(src_dir: str, dest_dir: str):
+        mirror_copy(src_dir, dest_dir, delete_stale=True, exts=('.lua',), stale_exts=('.lua', '.luac'))
+
+    # Git delta state: snapshot the repo once, before anything is copied, so
+    # edits made during the deploy are picked up by the next one.
+    repo_src = os.path.join(git_src, 'src', tgt)
+    signature = _stage_signature(git_src, tgt, lang, steps)
+    hashes = {}
+    snapshot = git_snapshot(repo_src, hashes) if fileext != '.lua' else None
+    use_delta = GIT_DELTA_ENABLED and snapshot is not None and steps_allow_delta(steps)
+
     for i, t in enumerate(targets, 1):
         dest = t['dest']; sim = t.get('simulator')
         print(f"[{i}/{len(targets)}] -> {t['name']} @ {dest}")
@@ -1285,79 +3148,79 @@ def copy_files(src_override, fileext, targets, lang="en", steps=None):
         # Decide whether to stage locally (recommended for radio when running steps)
         do_stage = bool(DEPLOY_TO_RADIO and DEPLOY_STAGE and steps)
 
-        # Always source from repo src/<tgt>
-        repo_src = os.path.join(git_src, 'src', tgt)
-
-        if do_stage:
+        # Only mirror-style copies can be narrowed to the git delta.
+        mirrors = fileext == 'fast' or (fileext is None and not DEPLOY_TO_RADIO)
+        delta = None
+        if use_delta and mirrors and (stage_cache or not do_stage):
+            delta = plan_git_delta(repo_src, out_dir, signature, hashes)
+            if delta is not None:
+                print(f"[DELTA] {len(delta[0])} changed, {len(delta[1])} deleted since last deploy "
+                      f"(full verify: --full-verify)")
+        clear_git_state(out_dir)
+
+        if do_stage and stage_cache:
+            staged_out_dir, steps_ok = stage_and_run_steps(git_src, repo_src, t['name'], lang, steps,
+                                                           snapshot=snapshot, hashes=hashes)
+        elif do_stage:
             print("[STAGE] Staging to local temp, running steps, then copying to radio...")
-            stage_root, staged_out_dir = _stage_tree(repo_src)
+            with TIMING.phase("stage", files=count_files(repo_src)):
+                stage_root, staged_out_dir = _stage_tree(repo_src)
 
             # Run steps locally on staged tree
-            run_steps(steps, staged_out_dir, lang)
-
-            # Small settle time before hammering removable media
-            print("[IO] Letting radio storage settle...")
-            time.sleep(1.5)
+            steps_ok = run_steps(steps, staged_out_dir, lang, radio=False)
 
-            if fileext == 'fast':
+        if do_stage:
+            idle = delta is not None and not any(delta)
+            if not idle:
+                # Small settle time before hammering removable media
+                print("[IO] Letting radio storage settle...")
+                with TIMING.phase("settle"):
+                    deliberate_sleep(1.5)
+
+            if fileext == 'fast' and delta is not None:
+                # Copy only the git delta from stage -> radio
+                apply_delta(staged_out_dir, out_dir, *delta)
+
+            elif fileext == 'fast':
                 # Copy only changed files from stage -> radio
                 _fast_copy_from_stage(staged_out_dir, out_dir)
 
             elif fileext == '.lua':
-                # Keep old behavior: remove lua/luac on radio, then copy lua from stage
-                if os.path.isdir(out_dir):
-                    for r, _, files in os.walk(out_dir):
-                        for f in files:
-                            if f.endswith(('.lua', '.luac')):
-                                try:
-                                    os.remove(os.path.join(r, f))
-                                except Exception:
-                                    pass
-                os.makedirs(out_dir, exist_ok=True)
-                for r, _, files in os.walk(staged_out_dir):
-                    for f in files:
-                        if f.endswith('.lua'):
-                            srcf = os.path.join(r, f)
-                            rel = os.path.relpath(srcf, staged_out_dir)
-                            dstf = os.path.join(out_dir, rel)
-                            if DEPLOY_TO_RADIO:
-                                throttled_copyfile(srcf, dstf)
-                                flush_fs()
-                                time.sleep(0.02)
-                            else:
-                                os.makedirs(os.path.dirname(dstf), exist_ok=True)
-                                shutil.copy(srcf, dstf)
+                # Mirror only .lua files from stage -> radio; stale .lua/.luac go
+                _lua_mirror(staged_out_dir, out_dir)
 
             else:
                 # Full safe copy from stage -> radio
                 safe_full_copy(staged_out_dir, out_dir)
 
-            flush_fs()
-            time.sleep(1.0)
+            if not idle:
+                with TIMING.phase("settle"):
+                    flush_fs()
+                    deliberate_sleep(1.0)
+            if steps_ok and fileext != '.lua':
+                record_git_state(out_dir, signature, snapshot)
             print(f"Done: {t['name']}")
             continue
 
         # --- legacy (non-staged) path ---------------------------------------
         if fileext == '.lua':
-            if os.path.isdir(out_dir):
-                for r, _, files in os.walk(out_dir):
-                    for f in files:
-                        if f.endswith(('.lua','.luac')):
-                            os.remove(os.path.join(r,f))
-            scr = repo_src
-            os.makedirs(out_dir, exist_ok=True)
-            for r,_,files in os.walk(scr):
-                for f in files:
-                    if f.endswith('.lua'):
-                        shutil.copy(os.path.join(r,f), out_dir)
+            _lua_mirror(repo_src, out_dir)
 
             run_steps(steps, out_dir, lang)
 
+        elif delta is not None:
+            apply_delta(repo_src, out_dir, *delta)
+            if run_steps(steps, out_dir, lang, changed=delta[0] + delta[1]):
+                record_git_state(out_dir, signature, snapshot)
+            if fileext != 'fast':
+                print(f"Done: {t['name']}")
+
         elif fileext == 'fast':
             scr = repo_src
             mirror_copy(scr, out_dir, delete_stale=True)
 
-            run_steps(steps, out_dir, lang)
+            if run_steps(steps, out_dir, lang):
+                record_git_state(out_dir, signature, snapshot)
 
         else:
             srcall = repo_src
@@ -1365,9 +3228,12 @@ def copy_files(src_override, fileext, targets, lang="en", steps=None):
                 safe_full_copy(srcall, out_dir)
             else:
                 mirror_copy(srcall, out_dir, delete_stale=True)
-            run_steps(steps, out_dir, lang)
-            flush_fs()
-            time.sleep(2)
+            steps_ok = run_steps(steps, out_dir, lang)
+            with TIMING.phase("settle"):
+                flush_fs()
+                deliberate_sleep(2)
+            if steps_ok:
+                record_git_state(out_dir, signature, snapshot)
 
             print(f"Done: {t['name']}")
 
@@ -1413,6 +3279,116 @@ def patch_logger_init(out_root):
         print(f"[PATCH] Failed to edit {target_file}: {e}")
 
 
+# === Watch mode (simulator) ===================================================
+
+WATCH_DEBOUNCE_S = 0.25
+WATCH_POLL_S = 0.5
+# Editor swap/backup/lock files (vim, emacs) are never pushed.
+WATCH_IGNORE = ("*.swp", "*.swo", "*.swx", "*~", ".#*", "#*#", "4913")
+
+
+def _watch_ignored(rel):
+    name = os.path.basename(rel)
+    return any(fnmatch.fnmatch(name, pat) for pat in WATCH_IGNORE)
+
+
+def push_changed_files(repo_src, out_dir, changed, steps, lang, exts=None):
+    """
+    Push only `changed` (paths relative to repo_src) into out_dir: copy
+    files that exist, delete files that vanished, then run the steps with
+    the changed-file list so i18n resolves just those files. `exts` limits
+    the push to those extensions (--fileext .lua). Returns the number of
+    files copied or deleted.
+    """
+    pushed = []
+    removed = 0
+    changed = [rel for rel in changed
+               if not _watch_ignored(rel) and (not exts or rel.endswith(exts))]
+    if changed:
+        # The target no longer matches its recorded git state.
+        clear_git_state(out_dir)
+    for rel in sorted(changed):
+        srcf = os.path.join(repo_src, rel)
+        dstf = os.path.join(out_dir, rel)
+        if os.path.isfile(srcf):
+            os.makedirs(os.path.dirname(dstf), exist_ok=True)
+            shutil.copy2(srcf, dstf)
+            pushed.append(rel.replace(os.sep, "/"))
+            print(f"[WATCH] Copy {rel}")
+        elif os.path.exists(dstf):
+            try:
+                os.remove(dstf)
+                removed += 1
+                print(f"[WATCH] Delete {rel}")
+            except Exception as e:
+                print(f"[WATCH][WARN] Could not delete {rel}: {e}")
+    if pushed:
+        run_steps(steps, out_dir, lang, radio=False, changed=pushed)
+    return len(pushed) + removed
+
+
+def watch_and_deploy(src_override, fileext, targets, lang="en", steps=None, debounce_s=WATCH_DEBOUNCE_S,
+                     launch=False):
+    """
+    Resident simulator deploy: one full deploy (then --launch), then push each
+    debounced burst of changes under src/<tgt> through push_changed_files().
+    A change to the locale JSON, lost watch events or a changed stage
+    signature (step inputs outside src/<tgt> such as the soundpack, or the
+    step scripts themselves; checked while idle) triggers a full copy_files()
+    pass.
+    """
+    git_src = src_override or config['git_src']
+    tgt = config['tgt_name']
+    repo_src = os.path.join(git_src, 'src', tgt)
+    locale_rel = os.path.join("i18n", f"{lang}.json")
+    exts = ('.lua',) if fileext == '.lua' else None
+
+    signature = _stage_signature(git_src, tgt, lang, steps)
+    copy_files(src_override, fileext, targets, lang=lang, steps=steps)
+    if launch:
+        launch_sims(targets)
+
+    watcher = hotplug.DirWatcher([repo_src], poll_interval=WATCH_POLL_S, recursive=True)
+    mode = "inotify" if watcher.event_driven else f"polling every {WATCH_POLL_S}s"
+    print(f"[WATCH] Watching {repo_src} ({mode}); Ctrl+C to stop.")
+    pending = set()
+    rescan = False
+    try:
+        while True:
+            got = watcher.changes(debounce_s if (pending or rescan) else 1.0)
+            if got is None:
+                rescan = True
+                continue
+            if got:
+                for rel in (os.path.relpath(p, repo_src) for p in got):
+                    if rel == locale_rel or (not _watch_ignored(rel) and (not exts or rel.endswith(exts))):
+                        pending.add(rel)
+                continue
+            current = _stage_signature(git_src, tgt, lang, steps)
+            if not pending and not rescan and current == signature:
+                continue
+
+            t0 = time.perf_counter()
+            if rescan or current != signature or locale_rel in pending:
+                print("[WATCH] Step inputs, locale or directory changed; running full deploy...")
+                signature = current
+                copy_files(src_override, fileext, targets, lang=lang, steps=steps)
+                print(f"[WATCH] Full redeploy in {(time.perf_counter() - t0) * 1000:.0f} ms")
+            else:
+                count = 0
+                for t in targets:
+                    out_dir = os.path.join(t['dest'], tgt)
+                    count += push_changed_files(repo_src, out_dir, pending, steps, lang, exts=exts)
+                print(f"[WATCH] Pushed {count} file(s) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+            pending = set()
+            rescan = False
+    except KeyboardInterrupt:
+        print("[WATCH] Stopped by user.")
+        return 0
+    finally:
+        watcher.close()
+
+
 def launch_sims(targets):
     if subprocess_conout is None:
         print("[SIM] subprocess_conout is unavailable on this platform; skipping simulator launch.")
@@ -1425,7 +3401,24 @@ def launch_sims(targets):
             print(out)
 
 
-def main():
+def _serial_tail_options(args):
+    """tail_serial_debug() keyword arguments from the --serial-* options."""
+    return {
+        "timestamps": args.serial_timestamps,
+        "include": args.serial_include,
+        "exclude": args.serial_exclude,
+        "color": args.serial_color,
+        "log_file": args.serial_log,
+        "log_max_bytes": int(args.serial_log_max_mb * 1024 * 1024),
+        "log_backups": args.serial_log_backups,
+        "record": args.record,
+        "dashboard": args.serial_dashboard,
+        "dashboard_interval": args.serial_dashboard_interval,
+        "events_file": args.serial_events,
+    }
+
+
+def main(argv=None):
     global DEPLOY_TO_RADIO
     p = argparse.ArgumentParser(description='Deploy & launch')
     p.add_argument(
@@ -1441,6 +3434,36 @@ def main():
     p.add_argument('--radio-debug', action='store_true')
     p.add_argument('--no-stage', action='store_true',
                    help='Disable local staging; run steps directly on destination (not recommended for radio).')
+    p.add_argument('--no-stage-cache', action='store_true',
+                   help='Stage into a fresh temp folder every run instead of the persistent incremental staging cache.')
+    p.add_argument('--serial-filter', dest='serial_include', action='append', metavar='REGEX',
+                   help='Only show serial debug lines matching REGEX (repeatable).')
+    p.add_argument('--serial-exclude', action='append', metavar='REGEX',
+                   help='Hide serial debug lines matching REGEX (repeatable).')
+    p.add_argument('--serial-color', choices=serial_log.COLOR_MODES, default='auto')
+    p.add_argument('--serial-timestamps', choices=serial_log.TIMESTAMP_MODES, default='wall',
+                   help='Host-side timestamp per serial line (default: wall clock).')
+    p.add_argument('--serial-log', default=config.get('serial_log'), metavar='FILE',
+                   help='Also write serial debug lines to a rotating log file (config: serial_log).')
+    p.add_argument('--serial-log-max-mb', type=float, default=10.0)
+    p.add_argument('--serial-log-backups', type=int, default=5)
+    p.add_argument('--serial-dashboard', action='store_true',
+                   help='Show a rolling MSP rate/retry/timeout/RTT and memory summary instead of raw lines.')
+    p.add_argument('--serial-dashboard-interval', type=float, default=1.0, metavar='SECONDS')
+    p.add_argument('--serial-events', metavar='FILE.csv|FILE.json',
+                   help='Export parsed [msp]/[mem] events (CSV rows, or JSON with a summary).')
+    p.add_argument('--record', metavar='FILE',
+                   help='With --radio-debug/--connect-only: save the raw serial stream (gzip, host timestamps) to FILE.')
+    p.add_argument('--replay', metavar='FILE',
+                   help='Play a --record capture through the serial filters/formatting and exit (no radio needed).')
+    p.add_argument('--replay-speed', default='1', metavar='N|max',
+                   help='Replay pacing: 1 = real time, N = N times faster, max = as fast as possible.')
+    p.add_argument('--no-defer-cleanup', action='store_true',
+                   help='Delete the previous install (<tgt>.old) before copying instead of in the background.')
+    p.add_argument('--full-verify', action='store_true',
+                   help='Ignore the recorded git state and verify every file (env DEPLOY_GIT_DELTA=0 makes this the default).')
+    p.add_argument('--watch', action='store_true',
+                   help='Simulator only: after deploying, keep watching src/<tgt> and push changed files as they are saved.')
     p.add_argument('--connect-only', action='store_true')
     p.add_argument('--lang', default=os.environ.get("RFSUITE_LANG", "en"),
                    help='Locale to resolve (e.g. en, de, fr). Defaults to env RFSUITE_LANG or "en".')
@@ -1452,23 +3475,53 @@ def main():
                    help='Delete ALL deploy-*.lock files in the system temp and exit.')
     p.add_argument('--print-lock', action='store_true',
                    help='Print the lock file path for this project and exit.')
+    p.add_argument('--throttle', choices=THROTTLE_MODES, default=None,
+                   help='Radio write pacing: fixed (legacy constants, default), adaptive (latency-driven) '
+                        'or off. Env DEPLOY_THROTTLE sets the default.')
+    p.add_argument('--verify-workers', type=int, default=None,
+                   help='Threads used to stat/hash files when verifying a deploy '
+                        '(default: 1 for radio, several for simulator/staging).')
+    p.add_argument('--timing-report', choices=('json', 'table'), default=None,
+                   help='Print per-phase wall time, sleep time, files and bytes at the end of the deploy.')
+    p.add_argument('--timing-history', default=os.environ.get("DEPLOY_TIMING_HISTORY"),
+                   help='Append each deploy\'s timing report as one JSON line to this file '
+                        '(env DEPLOY_TIMING_HISTORY).')
     p.add_argument('--step', dest='steps', action='append',
                    help='Additional deploy steps to run (e.g. i18n, soundpack). '
                         'Can be given multiple times.'
     )    
-
-    args = p.parse_args()
+    p.add_argument('--sim', dest='sims', action='append', metavar='FW[@VERSION]',
+                   help='Simulator target (simulators/<fw>@<ver>); repeat to deploy several at once. '
+                        'With --radio, simulators are deployed alongside the radio. '
+                        'Defaults to config "simulator_targets" (simulator-only deploys).')
+    p.add_argument('--jobs', type=int, default=None,
+                   help='Max targets deployed concurrently (default: all).')
+
+    args = p.parse_args(argv)
     DEPLOY_TO_RADIO = args.radio
 
-    global DEPLOY_STAGE
+    if args.replay:
+        return replay_serial_capture(args.replay, args.replay_speed, **_serial_tail_options(args))
+
+    global DEPLOY_STAGE, VERIFY_WORKERS, THROTTLE_MODE, GIT_DELTA_ENABLED, DEFER_CLEANUP
     DEPLOY_STAGE = _staging_is_enabled(args)
+    if args.no_defer_cleanup:
+        DEFER_CLEANUP = False
+    if args.full_verify:
+        GIT_DELTA_ENABLED = False
+    if args.throttle:
+        THROTTLE_MODE = args.throttle
+    if args.verify_workers is not None:
+        VERIFY_WORKERS = max(1, args.verify_workers)
+    # Emitted explicitly before serial tailing; atexit covers early returns.
+    at_run_exit(TIMING.emit, args.timing_report, args.timing_history)
     DEPLOY_PIDFILE = os.path.join(tempfile.gettempdir(), "deploy-copy.pid")
     try:
         with open(DEPLOY_PIDFILE, "w") as f:
             f.write(str(os.getpid()))
     except Exception:
         pass
-    atexit.register(lambda: os.path.exists(DEPLOY_PIDFILE) and os.remove(DEPLOY_PIDFILE))
+    at_run_exit(lambda: os.path.exists(DEPLOY_PIDFILE) and os.remove(DEPLOY_PIDFILE))
 
     if args.config and os.path.abspath(args.config) != os.path.abspath(CONFIG_PATH) and os.path.exists(args.config):
         try:
@@ -1519,7 +3572,8 @@ def main():
     proj_key = md5(os.path.abspath(args.config).encode("utf-8")).hexdigest()[:8]
     lock_name = f"deploy-{proj_key}.lock"
     try:
-        SingleInstance(name=lock_name, force=args.force).acquire()
+        with TIMING.phase("lock"):
+            SingleInstance(name=lock_name, force=args.force).acquire()
     except RuntimeError as e:
         print(str(e), file=sys.stderr)
         return 1
@@ -1532,6 +3586,9 @@ def main():
 
     # --- target selection: RADIO vs SIMULATOR ---------------------------------
     targets = []
+    # Config "simulator_targets" only applies to simulator deploys; a radio
+    # deploy gains simulators only when --sim is given explicitly.
+    sim_specs = list(args.sims or ([] if args.radio else config.get('simulator_targets')) or [])
 
     if args.radio and args.connect_only:
         # Just enable serial & tail logs; no copying
@@ -1545,19 +3602,37 @@ def main():
         existing_port = _find_serial_debug_port(vid_hex=v, pid_hex=p, name_hint=nh)
         if existing_port:
             print(f"[SERIAL] Existing serial debug port detected: {existing_port}; skipping HID mode switch.")
-        else:
-            rc, _, _ = ethos_serial(config.get('ethossuite_bin'), 'start')
-            if rc != 0:
-                print("[SERIAL] USB debug start unavailable; continuing to probe for a serial port anyway.")
+        elif not switch_usb_mode(config.get('ethossuite_bin'), 'start', serial_ids=(v, p, nh)):
+            print("[SERIAL] USB debug mode not confirmed; continuing to probe for a serial port anyway.")
 
-        return tail_serial_debug(vid=v, pid=p, baud=b, retries=r, delay=d, name_hint=nh)
+        return tail_serial_debug(vid=v, pid=p, baud=b, retries=r, delay=d, name_hint=nh,
+                                 **_serial_tail_options(args))
+
+    # Reject unsupported combinations before the radio leaves serial mode.
+    if args.watch and args.radio:
+        print("[WATCH] --watch is only supported for simulator deploys.", file=sys.stderr)
+        return 1
+    target_count = len(sim_specs) + (1 if args.radio or not sim_specs else 0)
+    if target_count > 1 and not args.watch:
+        if args.fileext:
+            print("[MULTI] --fileext is not supported with several targets.", file=sys.stderr)
+            return 1
+        if not DEPLOY_STAGE:
+            print("[MULTI] Staging cannot be disabled with several targets "
+                  "(--no-stage / DEPLOY_STAGE=0): the shared staged tree is what they copy from.",
+                  file=sys.stderr)
+            return 1
 
     if args.radio and not args.connect_only:
         # RADIO DEPLOY: use Ethos Suite to locate the radio SCRIPTS path
         print("[ETHOS] Disabling serial debug before copy to protect filesystem...")
-        ethos_serial(config.get('ethossuite_bin'), 'stop')
+        with TIMING.phase("serial stop"):
+            rd = switch_usb_mode(config.get('ethossuite_bin'), 'stop')
         try:
-            rd = wait_for_scripts_mount(config.get('ethossuite_bin'), attempts=10, delay=2)
+            if not rd:
+                with TIMING.phase("wait_for_scripts_mount"):
+                    rd = wait_for_scripts_mount(config.get('ethossuite_bin'), attempts=10, delay=2,
+                                                serial_ids=_config_serial_ids(config))
         except Exception as e:
             print("[ERROR] Failed to obtain Ethos SCRIPTS path after disabling serial.")
             print(f"        Reason: {e}")
@@ -1568,23 +3643,57 @@ def main():
                 print("\a", end="", flush=True)
             return 1
 
-        targets = [{'name': 'Radio', 'dest': rd, 'simulator': None}]
-    else:
+        targets = [{'name': 'Radio', 'dest': rd, 'simulator': None, 'radio': True}]
+        if DEFER_CLEANUP:
+            # Old trees left by an interrupted cleanup are deleted while we stage.
+            CLEANUP.resume(rd)
+    elif not sim_specs:
         # SIMULATOR DEPLOY: always to <git_src>\simulators\[firmware]@[version]\scripts
         firmware = os.environ.get("ETHOS_FIRMWARE") or _simulator_firmware()
         version = os.environ.get("ETHOS_VERSION") or _simulator_version()
         fixed_dest = _simulator_scripts_dest(config['git_src'], firmware, version)
         os.makedirs(fixed_dest, exist_ok=True)
-        targets = [{'name': 'Simulator', 'dest': fixed_dest, 'simulator': None}]
+        targets = [{'name': 'Simulator', 'dest': fixed_dest, 'simulator': None, 'radio': False}]
+
+    # Extra simulator trees (--sim / simulator_targets) replace the default
+    # simulator, or ride along with the radio.
+    for spec in sim_specs:
+        firmware, _, version = spec.partition('@')
+        version = version or os.environ.get("ETHOS_VERSION") or _simulator_version()
+        dest = _simulator_scripts_dest(config['git_src'], firmware, version)
+        os.makedirs(dest, exist_ok=True)
+        targets.append({'name': f"{firmware}@{version}", 'dest': dest, 'simulator': None, 'radio': False})
 
     # -------------------------------------------------------------------------
-    copy_files(args.src, args.fileext, targets, lang=args.lang, steps=args.steps)
+    if args.watch:
+        return watch_and_deploy(args.src, args.fileext, targets, lang=args.lang, steps=args.steps,
+                                launch=args.launch)
+
+    if len(targets) > 1:
+        try:
+            copy_files_parallel(args.src, targets, lang=args.lang, steps=args.steps, jobs=args.jobs,
+                                stage_cache=STAGE_CACHE_ENABLED and not args.no_stage_cache)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+    else:
+        copy_files(args.src, args.fileext, targets, lang=args.lang, steps=args.steps,
+                   stage_cache=STAGE_CACHE_ENABLED and not args.no_stage_cache)
 
     if args.launch and not args.radio:
         launch_sims(targets)
 
+    if args.radio and CLEANUP.backlog():
+        # The USB mode switch below releases the volume: give the background
+        # cleanup a short grace period; the rest stays journalled.
+        with TIMING.phase("cleanup wait"):
+            CLEANUP.finish(CLEANUP_WAIT_S)
+
     if args.radio and not args.radio_debug:
-        ethos_serial(config.get('ethossuite_bin'), 'start')
+        with TIMING.phase("serial start"):
+            ethos_serial(config.get('ethossuite_bin'), 'start')
+
+    TIMING.emit(args.timing_report, args.timing_history)
 
     if args.radio and args.radio_debug:
         _kill_previous_tail_if_any()
@@ -1598,15 +3707,13 @@ def main():
         existing_port = _find_serial_debug_port(vid_hex=v, pid_hex=p, name_hint=nh)
         if existing_port:
             print(f"[SERIAL] Existing serial debug port detected: {existing_port}; skipping HID mode switch.")
-        else:
-            rc, _, _ = ethos_serial(config.get('ethossuite_bin'), 'start')
-            if rc != 0:
-                print("[ETHOS] First --serial start failed; retrying once...")
-                rc, _, _ = ethos_serial(config.get('ethossuite_bin'), 'start')
-                if rc != 0:
-                    print("[SERIAL] USB debug start unavailable; continuing to probe for a serial port anyway.")
-
-        tail_serial_debug(vid=v, pid=p, baud=b, retries=r, delay=d, name_hint=nh)
+        elif not switch_usb_mode(config.get('ethossuite_bin'), 'start', serial_ids=(v, p, nh)):
+            print("[ETHOS] USB debug mode not observed; requesting it once more...")
+            if not switch_usb_mode(config.get('ethossuite_bin'), 'start', serial_ids=(v, p, nh)):
+                print("[SERIAL] USB debug mode not confirmed; continuing to probe for a serial port anyway.")
+
+        tail_serial_debug(vid=v, pid=p, baud=b, retries=r, delay=d, name_hint=nh,
+                          **_serial_tail_options(args))
 
 if __name__ == '__main__':
     rc = main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optional resident deploy daemon and its thin client.
+
+A normal deploy.py run re-imports everything, reloads deploy.json and the
+VS Code settings, loads connect.py (hid) and the step modules and starts
+with empty caches. The daemon imports deploy.py once and runs each request
+in-process with deploy.main(argv), so these stay warm between VS Code tasks:
+  - the step modules and their StepContext (loaded translation JSON)
+  - connect.py / hid, the serial port cache
+  - the background cleanup worker
+
+Usage:
+  deploy_daemon.py serve [--detach]      start the daemon (one per checkout)
+  deploy_daemon.py deploy <deploy.py args>
+  deploy_daemon.py tail <deploy.py args> deploy.py --radio --connect-only, run
+                                         directly (never inside the daemon)
+  deploy_daemon.py status | stop
+
+Without a running daemon, deploy simply execs deploy.py, so a task can
+always go through this client. DEPLOY_DAEMON_AUTOSTART=1 also starts a
+detached daemon for the next run.
+
+Requests run one at a time on the daemon's main thread. Output (including
+subprocess output) is streamed back to the client. A serial tail only ends
+on Ctrl+C, so tail never occupies the daemon, and while a deploy with
+--radio-debug is running or queued, further requests are refused instead of
+queued behind it. If the client goes
+away (Ctrl+C, VS Code terminating the task), the request is interrupted as
+if Ctrl+C had been pressed in a terminal. When deploy.json,
+.vscode/settings.json, the scripts or the client's DEPLOY_* environment
+change, the modules are reloaded before the next request.
+
+POSIX only (Unix socket); elsewhere the client always runs deploy.py
+directly.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEPLOY_SCRIPT = os.path.join(SCRIPT_DIR, "deploy.py")
+# deploy.py reads DEPLOY_* settings at import time; a change means a reload.
+RELOAD_ENV_PREFIX = "DEPLOY_"
+CONNECT_TIMEOUT_S = 0.5
+
+
+def socket_path():
+    """Per-checkout socket path (env DEPLOY_DAEMON_SOCKET overrides)."""
+    override = os.environ.get("DEPLOY_DAEMON_SOCKET")
+    if override:
+        return override
+    key = hashlib.md5(SCRIPT_DIR.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(tempfile.gettempdir(), f"deploy-daemon-{key}.sock")
+
+
+def log_path():
+    return os.path.splitext(socket_path())[0] + ".log"
+
+
+# --- client ------------------------------------------------------------------
+
+def _connect():
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT_S)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _request(sock, payload):
+    """Send one request; stream output to stdout; return the trailer dict."""
+    sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+    out = getattr(sys.stdout, "buffer", None)
+    trailer = None
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            break
+        if trailer is None:
+            nul = data.find(b"\0")
+            if nul < 0:
+                _write(out, data)
+                continue
+            _write(out, data[:nul])
+            trailer = bytearray(data[nul + 1:])
+        else:
+            trailer += data
+        if trailer is not None and trailer.endswith(b"\n"):
+            # Complete; don't wait for EOF (a child process may still hold the stream).
+            break
+    if trailer is None:
+        return {"rc": 1, "error": "daemon closed the connection"}
+    try:
+        return json.loads(bytes(trailer).decode("utf-8"))
+    except ValueError:
+        return {"rc": 1, "error": "bad trailer from daemon"}
+
+
+def _write(out, data):
+    if out is not None:
+        out.write(data)
+        out.flush()
+    else:
+        sys.stdout.write(data.decode("utf-8", errors="replace"))
+        sys.stdout.flush()
+
+
+def _run_direct(argv):
+    cmd = [sys.executable, DEPLOY_SCRIPT] + list(argv)
+    if os.name == "posix":
+        os.execv(sys.executable, cmd)
+    return subprocess.call(cmd)
+
+
+def _tails_serial(argv):
+    """True if this deploy.py request ends in a serial tail that only Ctrl+C stops."""
+    return "--radio" in argv and ("--connect-only" in argv or "--radio-debug" in argv)
+
+
+def _spawn_daemon():
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve", "--detach"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     close_fds=True)
+
+
+def client_run(argv):
+    sock = _connect()
+    if sock is None:
+        if os.environ.get("DEPLOY_DAEMON_AUTOSTART", "").strip().lower() in ("1", "true", "yes", "on") \
+                and hasattr(socket, "AF_UNIX"):
+            print("[DAEMON] Not running; starting one in the background for the next run.")
+            _spawn_daemon()
+        return _run_direct(argv)
+    payload = {
+        "cmd": "run",
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "tty": sys.stdout.isatty(),
+    }
+    try:
+        with sock:
+            reply = _request(sock, payload)
+    except KeyboardInterrupt:
+        # Closing the socket interrupts the request in the daemon.
+        return 130
+    except BrokenPipeError:
+        # Our own stdout went away (e.g. piped into head); hang up like Ctrl+C.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 141
+    if reply.get("error"):
+        print(f"[DAEMON] {reply['error']}", file=sys.stderr)
+    return int(reply.get("rc") or 0)
+
+
+def client_simple(cmd):
+    sock = _connect()
+    if sock is None:
+        print("[DAEMON] Not running.")
+        return 1 if cmd == "status" else 0
+    with sock:
+        reply = _request(sock, {"cmd": cmd})
+    if cmd == "status":
+        print(json.dumps(reply.get("status", reply), indent=2))
+    return int(reply.get("rc") or 0)
+
+
+# --- daemon ------------------------------------------------------------------
+
+class DeployDaemon:
+    """Serves deploy requests from one warm deploy module."""
+
+    def __init__(self, path):
+        import queue
+        import threading
+
+        self.path = path
+        self.queue = queue.Queue()
+        self.started = time.time()
+        self.served = 0
+        self.reloads = 0
+        self.last_rc = None
+        self.current = None
+        self.pending = []   # queued "run" requests, oldest first
+        self._lock = threading.Lock()
+        self.stopping = False
+        self.hangup_pending = False
+        self._threading = threading
+        self.deploy = None
+        self._baseline = None
+        self._config_snapshot = None
+        self._signature = None
+        self._env_signature = None
+
+    # -- warm state ----------------------------------------------------------
+
+    def _watched_files(self):
+        root = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+        files = [os.path.join(root, "deploy.json"),
+                 os.path.join(root, ".vscode", "deploy.json"),
+                 os.path.join(root, ".vscode", "settings.json")]
+        files += [os.path.join(SCRIPT_DIR, n) for n in os.listdir(SCRIPT_DIR) if n.endswith(".py")]
+        return files
+
+    def _code_signature(self):
+        sig = []
+        for path in self._watched_files():
+            try:
+                st = os.stat(path)
+                sig.append((path, st.st_size, st.st_mtime_ns))
+            except OSError:
+                sig.append((path, None, None))
+        return tuple(sorted(sig))
+
+    @staticmethod
+    def _env_sig(env):
+        return tuple(sorted((k, v) for k, v in env.items()
+                            if k.startswith(RELOAD_ENV_PREFIX) and not k.startswith("DEPLOY_DAEMON_")))
+
+    def load(self, env=None):
+        """(Re)import deploy.py and its sibling modules under `env`."""
+        import importlib
+
+        if env is not None:
+            for key in [k for k in os.environ if k.startswith(RELOAD_ENV_PREFIX)]:
+                del os.environ[key]
+            os.environ.update({k: v for k, v in env.items() if k.startswith(RELOAD_ENV_PREFIX)})
+        if sys.path[0] != SCRIPT_DIR:
+            sys.path.insert(0, SCRIPT_DIR)
+        if self.deploy is None:
+            import deploy
+            self.deploy = deploy
+        else:
+            try:
+                self.deploy._shutdown(self.deploy.CLEANUP_WAIT_S)
+            except Exception:
+                pass
+            for name, mod in list(sys.modules.items()):
+                path = getattr(mod, "__file__", None) or ""
+                if mod is not self.deploy and name != "__main__" \
+                        and os.path.dirname(os.path.abspath(path)) == SCRIPT_DIR:
+                    try:
+                        importlib.reload(mod)
+                    except Exception as e:
+                        print(f"[DAEMON] Could not reload {name} ({type(e).__name__}: {e}).")
+            self.deploy = importlib.reload(self.deploy)
+            self.reloads += 1
+        deploy = self.deploy
+        # Plain module settings that main() overwrites from its flags.
+        self._baseline = {k: v for k, v in vars(deploy).items()
+                          if k.isupper() and isinstance(v, (bool, int, float, str, tuple, type(None)))}
+        self._config_snapshot = dict(deploy.config)
+        self._signature = self._code_signature()
+        self._env_signature = self._env_sig(os.environ)
+        self._warm()
+
+    def _warm(self):
+        deploy = self.deploy
+        deploy._load_connect_module()
+        for name in sorted(os.listdir(SCRIPT_DIR)):
+            if name.startswith("deploy_step_") and name.endswith(".py"):
+                deploy._load_step_module(os.path.join(SCRIPT_DIR, name))
+
+    def _reset(self):
+        deploy = self.deploy
+        for k, v in self._baseline.items():
+            setattr(deploy, k, v)
+        deploy.config.clear()
+        deploy.config.update(self._config_snapshot)
+
+    # -- requests ------------------------------------------------------------
+
+    def status(self):
+        deploy = self.deploy
+        current = None
+        if self.current:
+            current = {"argv": self.current[0], "running_s": round(time.time() - self.current[1], 1)}
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime_s": round(time.time() - self.started, 1),
+            "served": self.served,
+            "queued": self.queue.qsize(),
+            "reloads": self.reloads,
+            "last_rc": self.last_rc,
+            "current": current,
+            "step_modules": sorted(os.path.basename(p) for p, m in deploy._step_modules.items() if m),
+            "cached_inputs": sum(len(ctx._cache) for ctx in deploy._step_contexts.values()),
+            "connect_module": bool(deploy._connect_mod),
+            "serial_ports": dict((":".join(str(x) for x in k), v) for k, v in deploy._SERIAL_PORT_CACHE.items()),
+        }
+
+    def _accept_loop(self, server):
+        while not self.stopping:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            self._threading.Thread(target=self._handshake, args=(conn,), daemon=True).start()
+
+    def _handshake(self, conn):
+        try:
+            f = conn.makefile("rb")
+            line = f.readline()
+            f.close()
+            req = json.loads(line.decode("utf-8")) if line else {}
+        except (OSError, ValueError):
+            conn.close()
+            return
+        cmd = req.get("cmd")
+        if cmd == "status":
+            self._reply(conn, {"rc": 0, "status": self.status()})
+        elif cmd == "stop":
+            self.stopping = True
+            self.queue.put(None)
+            self._reply(conn, {"rc": 0})
+        elif cmd == "run":
+            # Nothing may queue behind a running or queued request that ends in a serial tail.
+            with self._lock:
+                current = self.current
+                ahead = ([current[0]] if current else []) + [[str(a) for a in r.get("argv") or []]
+                                                             for r in self.pending]
+                blocker = next((argv for argv in ahead if _tails_serial(argv)), None)
+                if blocker is None:
+                    self.pending.append(req)
+            if blocker is not None:
+                state = "running" if current and blocker is current[0] else "queued"
+                self._reply(conn, {"rc": 1, "error": (
+                    f"Refused: 'deploy.py {' '.join(blocker)}' is {state} and ends in a serial tail "
+                    "that only Ctrl+C stops; stop it and retry.")})
+                return
+            if current:
+                try:
+                    conn.sendall(f"[DAEMON] Busy with {' '.join(current[0])}; queued.\n".encode("utf-8"))
+                except OSError:
+                    pass
+            self.queue.put((conn, req))
+        else:
+            self._reply(conn, {"rc": 2, "error": f"unknown command {cmd!r}"})
+
+    @staticmethod
+    def _reply(conn, trailer):
+        try:
+            conn.sendall(b"\0" + json.dumps(trailer).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def _watch_disconnect(self, conn, done):
+        """Interrupt the running request if the client hangs up."""
+        import _thread
+        try:
+            while not done.is_set():
+                if not conn.recv(1):
+                    break
+        except OSError:
+            pass
+        if not done.is_set():
+            self.hangup_pending = True
+            _thread.interrupt_main()
+
+    def _dequeued(self, req):
+        """Drop req from the pending list (caller holds the lock)."""
+        for i, queued in enumerate(self.pending):
+            if queued is req:
+                del self.pending[i]
+                return
+
+    def handle(self, conn, req):
+        import io
+
+        env = req.get("env") or {}
+        if self._code_signature() != self._signature or self._env_sig(env) != self._env_signature:
+            print("[DAEMON] Scripts, config or environment changed; reloading.")
+            self.load(env)
+        self._reset()
+
+        argv = [str(a) for a in req.get("argv") or []]
+        saved_env = dict(os.environ)
+        saved_cwd = os.getcwd()
+        saved_streams = (sys.stdout, sys.stderr)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = (os.dup(1), os.dup(2))
+        done = self._threading.Event()
+        rc = 0
+        tty = bool(req.get("tty"))
+
+        class _ClientStream(io.TextIOWrapper):
+            """Client-facing stdout/stderr; output is dropped once the client hangs up."""
+
+            def isatty(self):
+                return tty
+
+            def write(self, text):
+                try:
+                    return super().write(text)
+                except (OSError, ValueError):
+                    return len(text)
+
+            def flush(self):
+                try:
+                    super().flush()
+                except (OSError, ValueError):
+                    pass
+
+        with self._lock:
+            self._dequeued(req)
+            self.current = (argv, time.time())
+        print(f"[DAEMON] Request: deploy.py {' '.join(argv)}")
+        try:
+            os.environ.clear()
+            os.environ.update(env)
+            try:
+                os.chdir(req.get("cwd") or saved_cwd)
+            except OSError:
+                pass
+            os.dup2(conn.fileno(), 1)
+            os.dup2(conn.fileno(), 2)
+            sys.stdout = _ClientStream(io.FileIO(1, "w", closefd=False), encoding="utf-8",
+                                       errors="replace", line_buffering=True)
+            sys.stderr = _ClientStream(io.FileIO(2, "w", closefd=False), encoding="utf-8",
+                                       errors="replace", line_buffering=True)
+            self._threading.Thread(target=self._watch_disconnect, args=(conn, done), daemon=True).start()
+            with self.deploy.daemon_request():
+                try:
+                    result = self.deploy.main(argv)
+                    rc = result if isinstance(result, int) else 0
+                except SystemExit as e:
+                    rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except KeyboardInterrupt:
+                    print("[DAEMON] Request interrupted.")
+                    rc = 130
+                except BaseException:
+                    import traceback
+                    traceback.print_exc()
+                    rc = 1
+        finally:
+            done.set()
+
+            def restore():
+                for stream in (sys.stdout, sys.stderr):
+                    try:
+                        stream.flush()
+                    except (OSError, ValueError):
+                        pass
+                sys.stdout, sys.stderr = saved_streams
+                os.dup2(saved_fds[0], 1)
+                os.dup2(saved_fds[1], 2)
+                os.environ.clear()
+                os.environ.update(saved_env)
+                try:
+                    os.chdir(saved_cwd)
+                except OSError:
+                    pass
+
+            try:
+                restore()
+            except KeyboardInterrupt:
+                # A hang-up interrupt that landed just as the request ended.
+                restore()
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+            self.current = None
+        self.served += 1
+        self.last_rc = rc
+        print(f"[DAEMON] Done (rc={rc}).")
+        self._reply(conn, {"rc": rc})
+
+    def serve(self):
+        if _connect() is not None:
+            print(f"[DAEMON] Already running on {self.path}.")
+            return 1
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        t0 = time.perf_counter()
+        self.load()
+        print(f"[DAEMON] Warm in {time.perf_counter() - t0:.2f}s.")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen(8)
+        self._threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+        print(f"[DAEMON] Listening on {self.path} (pid {os.getpid()}).")
+        try:
+            while True:
+                item = None
+                try:
+                    item = self.queue.get()
+                    if item is None:
+                        break
+                    self.handle(*item)
+                except Exception as e:
+                    print(f"[DAEMON] Request handling failed: {type(e).__name__}: {e}")
+                except KeyboardInterrupt:
+                    if not self.hangup_pending:
+                        break
+                    # A client hang-up that arrived after its request finished.
+                finally:
+                    self.hangup_pending = False
+                    if item is not None:
+                        # handle() may have failed before taking the request off the list.
+                        with self._lock:
+                            self._dequeued(item[1])
+        finally:
+            self.stopping = True
+            server.close()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            print("[DAEMON] Stopped.")
+        return 0
+
+
+def _detach():
+    """Double-fork into the background with output going to the log file."""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+    log = os.open(log_path(), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(log, 1)
+    os.dup2(log, 2)
+    os.close(devnull)
+    os.close(log)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    cmd = argv.pop(0) if argv else "status"
+    if cmd == "deploy":
+        return client_run(argv)
+    if cmd == "tail":
+        extra = [a for a in ("--radio", "--connect-only") if a not in argv]
+        return _run_direct(argv + extra)
+    if cmd in ("status", "stop"):
+        return client_simple(cmd)
+    if cmd == "serve":
+        if not hasattr(socket, "AF_UNIX"):
+            print("[DAEMON] Unix sockets are not available on this platform.")
+            return 2
+        if "--detach" in argv:
+            _detach()
+        return DeployDaemon(socket_path()).serve()
+    print(__doc__)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
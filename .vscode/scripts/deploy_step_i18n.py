@@ -2,9 +2,62 @@
 import os
 import sys
 import argparse
-import subprocess
 from pathlib import Path
 
+# Only the changed files handed over by deploy.py need resolving, so git
+# delta deploys may skip everything else.
+STEP_INCREMENTAL = True
+
+def _changed_from_env():
+    """Changed-file list handed over by deploy.py for subprocess runs, or None."""
+    changed_list = os.environ.get("DEPLOY_CHANGED_FILES")
+    if not changed_list or not os.path.isfile(changed_list):
+        return None
+    with open(changed_list, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_step(out_dir, lang, git_src, context=None):
+    """
+    In-process entry point used by deploy.py.
+
+    `context` is deploy.py's StepContext: translations are loaded through
+    context.load_cached() and compiled to a flat key index once, so
+    repeated runs reuse them, and context.changed_files limits resolving
+    to the files that changed.
+    """
+    # Try language JSON in out_dir first, then fall back to repo i18n folder
+    json_path = os.path.join(out_dir, "i18n", f"{lang}.json")
+    if not os.path.isfile(json_path):
+        json_path = os.path.join(git_src, "scripts", "rfsuite", "i18n", f"{lang}.json")
+
+    if not os.path.isfile(json_path):
+        print(f"[I18N] Skipping: {lang}.json not found at {json_path}")
+        return 0
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    import resolve_i18n_tags as resolver
+
+    changed = context.changed_files if context is not None else _changed_from_env()
+    files = None
+    if changed is not None:
+        if not changed:
+            print(f"[I18N] No changed files to resolve (lang={lang}).")
+            return 0
+        print(f"[I18N] Resolving @i18n(...)@ tags in {len(changed)} changed file(s) (lang={lang})…")
+        root = Path(out_dir)
+        exts = ('.lua', '.ts', '.tsx', '.js', '.jsx', '.json', '.md', '.txt')
+        files = [root / rel for rel in changed if (root / rel).is_file() and (root / rel).suffix.lower() in exts]
+    else:
+        print(f"[I18N] Resolving @i18n(...)@ tags (lang={lang})…")
+
+    load = lambda p: resolver.load_index(Path(p))
+    translations = context.load_cached(json_path, load) if context is not None else load(json_path)
+    resolver.resolve_tree(Path(out_dir), translations, files=files)
+    return 0
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -19,7 +72,6 @@ def main():
     args = parser.parse_args()
 
     out_dir = os.path.abspath(args.out_dir)
-    lang = args.lang
 
     if args.git_src:
         git_src = os.path.abspath(args.git_src)
@@ -27,26 +79,7 @@ def main():
         # Assume this script is: <git_src>/.vscode/scripts/deploy_step_i18n.py
         git_src = str(Path(__file__).resolve().parents[2])
 
-    # Try language JSON in out_dir first, then fall back to repo i18n folder
-    json_path = os.path.join(out_dir, "i18n", f"{lang}.json")
-    if not os.path.isfile(json_path):
-        json_path = os.path.join(git_src, "scripts", "rfsuite", "i18n", f"{lang}.json")
-
-    if not os.path.isfile(json_path):
-        print(f"[I18N] Skipping: {lang}.json not found at {json_path}")
-        return 0
-
-    resolver = os.path.join(git_src, ".vscode", "scripts", "resolve_i18n_tags.py")
-    if not os.path.isfile(resolver):
-        print(f"[I18N] Skipping: resolver not found at {resolver}")
-        return 0
-
-    print(f"[I18N] Resolving @i18n(...)@ tags (lang={lang})…")
-    subprocess.run(
-        [sys.executable, resolver, "--json", json_path, "--root", out_dir],
-        check=True,
-    )
-    return 0
+    return run_step(out_dir, args.lang, git_src)
 
 
 if __name__ == "__main__":
@@ -5,33 +5,27 @@ from pathlib import Path
 import shutil
 import sys
 
+# Writes next to the destination's scripts folder, not into the staged tree,
+# so deploy.py runs it once per target.
+STEP_SCOPE = "target"
+# Does not depend on which source files changed.
+STEP_INCREMENTAL = True
 
 def debug(msg):
     print(f"[SENSORS DEBUG] {msg}")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Ensure sensors.json exists in the simulator root directory."
-    )
-    parser.add_argument("--out-dir", required=True, help="Output directory (scripts/<tgt>)")
-    parser.add_argument("--lang")
-    parser.add_argument("--git-src")
-    args = parser.parse_args()
-
+def run_step(out_dir, lang, git_src, context=None):
+    """In-process entry point used by deploy.py."""
     # out_dir will be: simulators/<fw>@<version>/scripts/rfsuite
-    out_dir = Path(args.out_dir).resolve()
+    out_dir = Path(out_dir).resolve()
     debug(f"Given out_dir = {out_dir}")
 
     # We want: simulators/<fw>@<version>/
     sim_root = out_dir.parents[1]   # one levels up
     debug(f"Computed simulator root = {sim_root}")
 
-    if args.git_src:
-        git_src = Path(args.git_src).resolve()
-    else:
-        git_src = Path(__file__).resolve().parents[2]
-
+    git_src = Path(git_src).resolve()
     src = git_src / ".vscode" / "sensors.json"
     dst = sim_root / "sensors.json"
 
@@ -58,5 +52,18 @@ def main():
     return 0
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ensure sensors.json exists in the simulator root directory."
+    )
+    parser.add_argument("--out-dir", required=True, help="Output directory (scripts/<tgt>)")
+    parser.add_argument("--lang")
+    parser.add_argument("--git-src")
+    args = parser.parse_args()
+
+    git_src = args.git_src or Path(__file__).resolve().parents[2]
+    return run_step(args.out_dir, args.lang, git_src)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -9,6 +9,13 @@ from pathlib import Path
 import shutil
 from tqdm import tqdm
 
+import verify_pool
+
+
+# The pack is part of deploy.py's signature (step_signature), so changing it
+# forces a full run; on incremental runs only repo files under audio/<lang>/
+# can have overwritten or removed copied pack files.
+STEP_INCREMENTAL = True
 
 TS_SLACK = 2.0  # FAT/exFAT timestamp slack (seconds)
 
@@ -57,7 +64,22 @@ def _remove_empty_dirs(root):
             pass
 
 
-def copy_tree_update_only(src, dest, delete_stale=True):
+def _verify_plan(src_files, dest, workers):
+    """Return [(src, dst)] needing a copy, in src_files order."""
+    def _check(item):
+        rel, s = item
+        d = os.path.join(dest, rel)
+        os.makedirs(os.path.dirname(d), exist_ok=True)
+        return (s, d) if needs_copy_with_md5(s, d) else None
+
+    results = verify_pool.run_verify(src_files.items(), _check, workers=workers, desc="Verifying soundpack")
+    return [r for r in results if r]
+
+
+def copy_tree_update_only(src, dest, delete_stale=True, workers=None):
+    # Without a count from deploy.py the destination may be the radio: one reader.
+    if workers is None:
+        workers = verify_pool.resolve_workers(radio=True)
     os.makedirs(dest, exist_ok=True)
 
     src_files = {}
@@ -79,15 +101,7 @@ def copy_tree_update_only(src, dest, delete_stale=True):
                 rel = os.path.relpath(d, dest)
                 dst_files[rel] = d
 
-    to_copy = []
-    bar_verify = tqdm(total=len(src_files), desc="Verifying soundpack")
-    for rel, s in src_files.items():
-        d = os.path.join(dest, rel)
-        os.makedirs(os.path.dirname(d), exist_ok=True)
-        if needs_copy_with_md5(s, d):
-            to_copy.append((s, d))
-        bar_verify.update(1)
-    bar_verify.close()
+    to_copy = _verify_plan(src_files, dest, workers)
 
     if to_copy:
         bar_copy = tqdm(total=len(to_copy), desc="Updating soundpack")
@@ -112,37 +126,46 @@ def copy_tree_update_only(src, dest, delete_stale=True):
             _remove_empty_dirs(dest)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Copy the language-specific soundpack into the output directory."
-    )
-    parser.add_argument("--out-dir", required=True, help="Output directory (root of rfsuite).")
-    parser.add_argument("--lang", default="en", help="Language code, e.g. en, fr, de.")
-    parser.add_argument(
-        "--git-src",
-        help="Workspace root; if omitted, will be inferred from this script location.",
-    )
-    args = parser.parse_args()
+def _soundpack_dir(git_src, lang):
+    return os.path.join(git_src, "bin", "sound-generator", "soundpack", lang)
 
-    out_dir = os.path.abspath(args.out_dir)
-    lang = args.lang
 
-    if args.git_src:
-        git_src = os.path.abspath(args.git_src)
-    else:
-        # Assume this script is: <git_src>/.vscode/scripts/deploy_step_soundpack.py
-        git_src = str(Path(__file__).resolve().parents[2])
+def step_signature(git_src, lang):
+    """Digest of the soundpack deploy.py folds into its stage/delta signature."""
+    src = _soundpack_dir(git_src, lang)
+    h = hashlib.md5()
+    for r, dns, fs in os.walk(src):
+        dns.sort()
+        for f in sorted(fs):
+            path = os.path.join(r, f)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, src).replace(os.sep, "/")
+            h.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
 
-    src = os.path.join(git_src, "bin", "sound-generator", "soundpack", lang)
+
+def run_step(out_dir, lang, git_src, context=None):
+    """In-process entry point used by deploy.py (context: its StepContext)."""
+    src = _soundpack_dir(git_src, lang)
     dest = os.path.join(out_dir, "audio", lang)
 
     if not os.path.isdir(src):
         print(f"[AUDIO] Skipping: soundpack not found at {src}")
         return 0
 
+    changed = getattr(context, "changed_files", None)
+    prefix = f"audio/{lang}/"
+    if changed is not None and not any(rel.replace(os.sep, "/").startswith(prefix) for rel in changed):
+        print(f"[AUDIO] Soundpack unchanged and no repo files under {prefix}; skipping.")
+        return 0
+
+    workers = getattr(context, "verify_workers", None)
     print(f"[AUDIO] Source: {src}")
     print(f"[AUDIO] Dest  : {dest}")
-    copy_tree_update_only(src, dest)
+    copy_tree_update_only(src, dest, workers=workers)
 
     try:
         if hasattr(os, "sync"):
@@ -154,5 +177,37 @@ def main():
     return 0
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy the language-specific soundpack into the output directory."
+    )
+    parser.add_argument("--out-dir", required=True, help="Output directory (root of rfsuite).")
+    parser.add_argument("--lang", default="en", help="Language code, e.g. en, fr, de.")
+    parser.add_argument(
+        "--git-src",
+        help="Workspace root; if omitted, will be inferred from this script location.",
+    )
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        default=None,
+        help="Threads used to verify the soundpack (default: env DEPLOY_VERIFY_WORKERS, else 1).",
+    )
+    args = parser.parse_args()
+
+    out_dir = os.path.abspath(args.out_dir)
+
+    if args.git_src:
+        git_src = os.path.abspath(args.git_src)
+    else:
+        # Assume this script is: <git_src>/.vscode/scripts/deploy_step_soundpack.py
+        git_src = str(Path(__file__).resolve().parents[2])
+
+    context = None
+    if args.verify_workers is not None:
+        context = argparse.Namespace(verify_workers=args.verify_workers)
+    return run_step(out_dir, args.lang, git_src, context)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Device hotplug waiting for deploy.py.
+
+DirWatcher blocks until the entries of one or more directories change
+(e.g. /dev/serial/by-id gaining the radio's ACM port), or, recursively, until
+files under a source tree change (deploy.py --watch). On Linux it uses
+inotify through ctypes, so the wake-up is immediate. Anywhere else, or when
+inotify is unavailable, it compares directory listings on a short poll.
+
+MountWatcher does the same for the Linux mount table, and
+find_radio_volumes() picks the Ethos volumes out of it.
+
+ModeSwitch ties the two together for USB mode changes: it resolves when the
+new mode is observed (ACM port present, radio volume mounted) and records
+how long the radio took.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import time
+
+
+DEFAULT_POLL_S = 0.1
+
+# inotify(7)
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_ATTRIB = 0x00000004
+_IN_DELETE_SELF = 0x00000400
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_ATTRIB | _IN_DELETE_SELF
+_TREE_MASK = _WATCH_MASK | _IN_MODIFY | _IN_CLOSE_WRITE
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = None
+
+
+def _inotify():
+    global _libc
+    if _libc is None:
+        _libc = _load_inotify() or False
+    return _libc or None
+
+
+def _tree_listing(paths):
+    snap = {}
+    for path in paths:
+        for r, _, fs in os.walk(path):
+            for f in fs:
+                p = os.path.join(r, f)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                snap[p] = (st.st_size, st.st_mtime_ns)
+    return snap
+
+
+def _listing(paths):
+    snap = {}
+    for path in paths:
+        try:
+            snap[path] = frozenset(os.listdir(path))
+        except OSError:
+            snap[path] = None
+    return snap
+
+
+class DirWatcher:
+    """
+    Wait for entries to appear/disappear in `paths`. Directories that do not
+    exist yet are watched through their parent, so /dev/serial/by-id being
+    created by udev for the first device also wakes the waiter.
+
+    With recursive=True every subdirectory is watched as well and file
+    writes count as changes; changes() then reports which files changed
+    (deploy.py --watch). The polling fallback diffs (size, mtime) per file.
+    """
+
+    def __init__(self, paths, poll_interval=DEFAULT_POLL_S, recursive=False):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.poll_interval = poll_interval
+        self.recursive = recursive
+        self._fd = None
+        self._watched = set()
+        self._dirs = {}
+        self._mask = _TREE_MASK if recursive else _WATCH_MASK
+        libc = _inotify()
+        if libc is not None:
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                self._add_watches()
+        self._snapshot = self._scan() if self._fd is None else None
+
+    @property
+    def event_driven(self):
+        return self._fd is not None
+
+    def _scan(self):
+        return _tree_listing(self.paths) if self.recursive else _listing(self.paths)
+
+    def _add_watch(self, path):
+        if path in self._watched:
+            return
+        wd = _inotify().inotify_add_watch(self._fd, os.fsencode(path), self._mask)
+        if wd >= 0:
+            self._watched.add(path)
+            self._dirs[wd] = path
+
+    def _add_tree(self, root):
+        """Watch root and every directory below it; return the files found inside."""
+        found = set()
+        for r, _, fs in os.walk(root):
+            self._add_watch(r)
+            found.update(os.path.join(r, f) for f in fs)
+        return found
+
+    def _add_watches(self):
+        for path in self.paths:
+            if self.recursive and os.path.isdir(path):
+                self._add_tree(path)
+                continue
+            target = path
+            while target and not os.path.isdir(target):
+                parent = os.path.dirname(target)
+                if parent == target:
+                    break
+                target = parent
+            if target:
+                self._add_watch(target)
+
+    def _rewatch(self):
+        # A watched directory may have just been created; watch it too. Trees
+        # already watched pick up new subdirectories from their own events.
+        if not self.recursive or any(p not in self._watched for p in self.paths):
+            self._add_watches()
+
+    def _read_events(self):
+        """Changed paths from the queued inotify events, or None if events were lost."""
+        changed = set()
+        lost = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except OSError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + 16 <= len(data):
+                wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + 16:offset + 16 + length].split(b"\0", 1)[0]
+                offset += 16 + length
+                if mask & _IN_Q_OVERFLOW:
+                    lost = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._watched.discard(self._dirs.pop(wd, None))
+                    continue
+                base = self._dirs.get(wd)
+                if base is None or not name:
+                    continue
+                path = os.path.join(base, os.fsdecode(name))
+                if self.recursive and mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        changed |= self._add_tree(path)
+                    elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        # Files under a removed directory are not reported one by one.
+                        lost = True
+                    continue
+                changed.add(path)
+        self._rewatch()
+        return None if lost else changed
+
+    def wait(self, timeout):
+        """
+        Block until something under the watched paths changes or `timeout`
+        seconds pass. Returns True on a change.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._fd is not None:
+                try:
+                    ready, _, _ = select.select([self._fd], [], [], max(0.0, remaining))
+                except (OSError, ValueError):
+                    ready = []
+                if ready:
+                    self._read_events()
+                    return True
+                return False
+            snap = self._scan()
+            if snap != self._snapshot:
+                self._snapshot = snap
+                return True
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def changes(self, timeout):
+        """
+        Like wait(), but return the set of changed paths (empty on timeout),
+        or None when events were lost and the caller should rescan. Without
+        recursive=True the polling fallback reports the watched directories.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._fd is not None:
+                try:
+                    ready, _, _ = select.select([self._fd], [], [], max(0.0, remaining))
+                except (OSError, ValueError):
+                    ready = []
+                return self._read_events() if ready else set()
+            snap = self._scan()
+            if snap != self._snapshot:
+                old, self._snapshot = self._snapshot, snap
+                changed = {p for p, sig in snap.items() if old.get(p) != sig}
+                changed |= {p for p in old if p not in snap}
+                return changed
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- mount table -------------------------------------------------------------
+#
+# The kernel flags /proc/self/mountinfo with POLLPRI|POLLERR whenever the
+# mount table changes, so a poll() on it wakes exactly when a volume is
+# mounted or unmounted. Any other path (a fake table written by a test
+# harness) is watched by comparing its content on a short poll.
+
+MOUNTINFO = "/proc/self/mountinfo"
+
+# Pseudo and network filesystems are never the radio and can be slow to stat.
+_SKIP_FSTYPES = frozenset((
+    "proc", "sysfs", "cgroup", "cgroup2", "devpts", "devtmpfs", "mqueue", "debugfs", "tracefs",
+    "securityfs", "pstore", "bpf", "configfs", "fusectl", "hugetlbfs", "autofs", "binfmt_misc",
+    "efivarfs", "rpc_pipefs", "nsfs", "nfs", "nfs4", "cifs", "smb3", "fuse.sshfs", "fuse.gvfsd-fuse",
+))
+
+RADIO_MARKER_KEYS = ("flash", "sdcard", "radio")
+
+
+def _unescape_mount_field(field):
+    # mountinfo escapes space, tab, newline and backslash as \ooo.
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def read_mounts(path=MOUNTINFO):
+    """Return [(mount_point, fstype, source)] from a mountinfo file; [] if unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return []
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 5:
+            continue
+        try:
+            sep = fields.index("-", 6)
+            fstype = fields[sep + 1]
+            source = _unescape_mount_field(fields[sep + 2]) if len(fields) > sep + 2 else ""
+        except (ValueError, IndexError):
+            fstype = source = ""
+        mounts.append((_unescape_mount_field(fields[4]), fstype, source))
+    return mounts
+
+
+def find_radio_volumes(mounts):
+    """
+    Map Ethos storage keys to mount points from read_mounts() output, using
+    the same <key>.cpuid markers as connect.py; a volume with only radio.bin
+    counts as 'radio'.
+    """
+    drives = {}
+    for mount_point, fstype, *_ in mounts:
+        if fstype in _SKIP_FSTYPES or mount_point == "/":
+            continue
+        try:
+            for key in RADIO_MARKER_KEYS:
+                if key not in drives and os.path.exists(os.path.join(mount_point, key + ".cpuid")):
+                    drives[key] = os.path.normpath(mount_point)
+            if "radio" not in drives and os.path.isfile(os.path.join(mount_point, "radio.bin")):
+                drives["radio"] = os.path.normpath(mount_point)
+        except OSError:
+            continue
+    return drives
+
+
+class MountWatcher:
+    """Wait for the mount table at `path` to change."""
+
+    def __init__(self, path=MOUNTINFO, poll_interval=DEFAULT_POLL_S):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._file = None
+        self._poll = None
+        self._content = None
+        if path.startswith("/proc/") and hasattr(select, "poll"):
+            try:
+                self._file = open(path, "rb")
+                self._file.read()
+                self._poll = select.poll()
+                self._poll.register(self._file.fileno(), select.POLLPRI | select.POLLERR)
+            except OSError:
+                self.close()
+        if self._poll is None:
+            self._content = self._read()
+
+    @property
+    def event_driven(self):
+        return self._poll is not None
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def mounts(self):
+        return read_mounts(self.path)
+
+    def wait(self, timeout):
+        """Block until the mount table changes or `timeout` passes; True on a change."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        if self._poll is not None:
+            try:
+                events = self._poll.poll(max(0.0, timeout) * 1000.0)
+            except OSError:
+                events = []
+            if events:
+                # Re-arm: the flag clears once the file is read from the start.
+                self._file.seek(0)
+                self._file.read()
+                return True
+            return False
+        while True:
+            content = self._read()
+            if content != self._content:
+                self._content = content
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self._poll = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- USB mode switches -------------------------------------------------------
+
+SWITCH_POLL_S = 0.1
+# Event-driven waits still re-probe this often: pyserial / sysfs can trail
+# the /dev node, and a fake mount table may change in place.
+SWITCH_RECHECK_S = 1.0
+
+
+class ModeSwitch:
+    """
+    A USB mode change in flight, resolved by observing its effect.
+
+    `probe()` returns the target state once it is reached (the ACM port, the
+    mounted SCRIPTS dir, the drive map) and a falsy value before. `watcher`
+    is a DirWatcher / MountWatcher that wakes the waiter on device changes;
+    without one the probe is polled every `poll_interval`. Create the switch
+    just before sending the request: latency_s is measured from then.
+    """
+
+    def __init__(self, target, probe, watcher=None, poll_interval=SWITCH_POLL_S):
+        self.target = target
+        self.probe = probe
+        self.watcher = watcher
+        self.poll_interval = poll_interval
+        self.started = time.monotonic()
+        self.result = None
+        self.latency_s = None
+
+    @property
+    def done(self):
+        return self.latency_s is not None
+
+    def wait(self, timeout):
+        """Return probe()'s value once the target state is observed, or None after `timeout`."""
+        if self.done:
+            return self.result
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            value = self.probe()
+            if value:
+                self.result = value
+                self.latency_s = time.monotonic() - self.started
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self.watcher is not None:
+                self.watcher.wait(min(remaining, SWITCH_RECHECK_S))
+            else:
+                time.sleep(min(self.poll_interval, remaining))
+
+    def close(self):
+        """Close the watcher (do not call for a watcher shared with other waits)."""
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
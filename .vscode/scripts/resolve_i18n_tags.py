@@ -7,6 +7,8 @@ Resolve @i18n(...)@ tags into translated strings.
 
 Options:
   --list-transforms        List available transforms and exit
+  --index-cache            Keep the compiled key index next to the JSON
+                           (<json>.index, reused while the JSON's hash matches)
 
 Tag syntax
 -----------
@@ -75,7 +77,7 @@ CLI examples
   python resolve_i18n_tags.py --json scripts/rfsuite/i18n/en.json --root src
 """
 #!/usr/bin/env python3
-import argparse, json, re, sys, os
+import argparse, hashlib, json, re, sys, os
 from pathlib import Path
 import shlex
 import html
@@ -272,18 +274,89 @@ def load_translations(path: Path) -> dict:
     with path.open('r', encoding='utf-8') as f:
         return json.load(f)
 
+# --- flat key index ---------------------------------------------------------
+# The nested translations are compiled once into {dotted key: (text,
+# reverse_flag)}, so resolving a tag is a single dict lookup instead of a
+# walk plus leaf checks per tag.
+
+INDEX_VERSION = 1
+
+class KeyIndex(dict):
+    """Flat dotted key -> (text, reverse_flag) map compiled from a translation tree."""
+
+def build_index(tree: dict) -> KeyIndex:
+    """Compile every key resolve_key() can reach into a KeyIndex."""
+    index = KeyIndex()
+    if not isinstance(tree, dict):
+        return index
+    stack = [('', tree)]
+    while stack:
+        prefix, node = stack.pop()
+        for part, child in node.items():
+            if '.' in part:
+                # resolve_key splits on '.', so such keys are unreachable.
+                continue
+            key = prefix + part
+            resolved = _resolve_leaf(child)
+            if resolved is not None:
+                index[key] = resolved
+            if isinstance(child, dict):
+                stack.append((key + '.', child))
+    return index
+
+def index_cache_path(json_path: Path) -> Path:
+    return json_path.with_name(json_path.name + '.index')
+
+def load_index(json_path: Path, persist: bool = False) -> KeyIndex:
+    """
+    Load the locale JSON as a KeyIndex. With persist=True the index is also
+    stored in <json>.index, tagged with the JSON's SHA-1, and read back from
+    there while the JSON is unchanged.
+    """
+    raw = json_path.read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()
+    cache = index_cache_path(json_path)
+    if persist:
+        try:
+            with cache.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('sha1') == digest:
+                return KeyIndex((k, (text, flag)) for k, (text, flag) in data['index'].items())
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+
+    index = build_index(json.loads(raw.decode('utf-8')))
+    if persist:
+        tmp = cache.with_name(cache.name + '.tmp')
+        try:
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'sha1': digest, 'index': index},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, cache)
+        except OSError as e:
+            print(f"[i18n] NOTE: could not write key index {cache} — {e}")
+    return index
+
+def as_index(translations) -> KeyIndex:
+    return translations if isinstance(translations, KeyIndex) else build_index(translations)
+
 def resolve_key(tree: dict, dotted: str):
     """
     Walk dotted path. If the leaf is a dict like
     { english: "...", translation: "...", reverse_text: true/false },
     prefer 'translation', fall back to 'english'. Otherwise cast to str.
+    A KeyIndex is looked up directly.
     """
+    if isinstance(tree, KeyIndex):
+        return tree.get(dotted)
     node = tree
     for part in dotted.split('.'):
         if not isinstance(node, dict) or part not in node:
             return None
         node = node[part]
+    return _resolve_leaf(node)
 
+def _resolve_leaf(node):
     # Leaf handling
     if isinstance(node, dict):
         reverse_flag = node.get('reverse_text') if isinstance(node.get('reverse_text'), bool) else None
@@ -341,12 +414,14 @@ def _should_reverse_text(text: str, reverse_flag: bool | None) -> bool:
     return _contains_hebrew_chars(text)
 
 def replace_tags_in_text(text: str, translations: dict, stats: dict):
+    index = as_index(translations)
+
     def _sub(m: re.Match):
         key = m.group(1).strip()
         basic_mod = m.group(2)  # upper|lower
         chain = m.group(3) or ''  # like ':truncate(10):suffix("…")'
 
-        resolved = resolve_key(translations, key)
+        resolved = index.get(key)
         if resolved is None:
             stats.setdefault('unresolved', {}).setdefault(key, 0)
             stats['unresolved'][key] += 1
@@ -407,26 +482,51 @@ def iter_source_files(root: Path, exts=('.lua', '.ts', '.tsx', '.js', '.jsx', '.
         if p.is_file() and p.suffix.lower() in exts:
             yield p
 
+def read_files_from(list_path: Path, root: Path, exts=('.lua', '.ts', '.tsx', '.js', '.jsx', '.json', '.md', '.txt')):
+    """Yield files named in list_path (one path per line, relative to root)."""
+    with list_path.open('r', encoding='utf-8') as f:
+        for line in f:
+            rel = line.strip()
+            if not rel:
+                continue
+            p = root / rel
+            if p.is_file() and p.suffix.lower() in exts:
+                yield p
+
 def main():
     ap = argparse.ArgumentParser(description="Resolve @i18n(...)@ tags in a codebase")
     ap.add_argument('--list-transforms', action='store_true', help='List available transforms and exit')
     ap.add_argument('--json', required=True, help='Path to en.json')
     ap.add_argument('--root', required=True, help='Root of codebase to scan')
     ap.add_argument('--dry-run', action='store_true', help='Do not write changes')
+    ap.add_argument('--files-from', help='Only process files listed in this file (paths relative to --root)')
+    ap.add_argument('--index-cache', action='store_true',
+                    help='Keep the compiled key index next to the JSON and reuse it while the JSON is unchanged')
     args = ap.parse_args()
 
     if args.list_transforms:
         print_transform_list()
         return
 
-    translations = load_translations(Path(args.json))
+    translations = load_index(Path(args.json), persist=args.index_cache)
     root = Path(args.root)
+    files = read_files_from(Path(args.files_from), root) if args.files_from else None
+    resolve_tree(root, translations, files=files, dry_run=args.dry_run)
+
+def resolve_tree(root: Path, translations: dict, files=None, dry_run=False):
+    """
+    Resolve tags in `files` (default: every source file under root) and print
+    the summary. Returns (files_changed, replacements, unresolved_counts).
+    Used by main() and, in-process, by deploy_step_i18n.run_step().
+    `translations` is a KeyIndex or a nested tree (compiled once here).
+    """
+    translations = as_index(translations)
     total_files_changed = 0
     total_replacements = 0
     unresolved_agg = {}
 
-    for f in iter_source_files(root):
-        replaced, unresolved = process_file(f, translations, dry_run=args.dry_run)
+    for f in (iter_source_files(root) if files is None else files):
+        replaced, unresolved = process_file(f, translations, dry_run=dry_run)
         if replaced:
             total_files_changed += 1
             total_replacements += replaced
@@ -442,5 +542,7 @@ def main():
         for k, c in sorted(unresolved_agg.items(), key=lambda kv: (-kv[1], kv[0])):
             print(f"  {k}: {c} occurrence(s)")
 
+    return total_files_changed, total_replacements, unresolved_agg
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serial debug log pipeline used by deploy.py's tail.
+
+  raw bytes -> LineSplitter -> SerialPipeline (timestamp, filter, colour)
+            -> one bulk write to stdout per chunk
+            -> RotatingLogWriter (own thread) for the log file
+  raw bytes -> CaptureWriter (--record); replay_capture() feeds a capture
+               back through the same pipeline
+
+The splitter keeps a single bytearray and splits every complete line of a
+chunk at once, so long bursts cost linear time.
+"""
+
+import gzip
+import json
+import os
+import queue
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+
+
+MAX_LINE_BYTES = 64 * 1024      # a line longer than this is flushed as-is
+READ_CHUNK_MAX = 64 * 1024
+
+COLOR_MODES = ("auto", "always", "never")
+TIMESTAMP_MODES = ("wall", "relative", "off")
+
+_RESET = "\x1b[0m"
+COLORS = {
+    "red": "\x1b[31m",
+    "green": "\x1b[32m",
+    "yellow": "\x1b[33m",
+    "blue": "\x1b[34m",
+    "magenta": "\x1b[35m",
+    "cyan": "\x1b[36m",
+    "grey": "\x1b[90m",
+}
+
+# First match wins.
+DEFAULT_COLOR_RULES = (
+    (r"(?i)\b(error|fail(ed|ure)?|timeout|panic)\b", "red"),
+    (r"(?i)\bwarn(ing)?\b", "yellow"),
+    (r"^\[msp\]", "cyan"),
+    (r"(?i)\bmem(stats)?\b", "magenta"),
+)
+
+
+class LineSplitter:
+    """Accumulates raw serial bytes and returns complete lines per chunk."""
+
+    def __init__(self, newline=b"\n", max_line=MAX_LINE_BYTES):
+        self.newline = newline
+        self.max_line = max_line
+        self._buf = bytearray()
+
+    def feed(self, data):
+        """Add data; returns the complete lines (bytes, without newline/CR)."""
+        buf = self._buf
+        buf += data
+        end = buf.rfind(self.newline)
+        if end < 0:
+            if len(buf) <= self.max_line:
+                return []
+            lines = [bytes(buf)]
+            buf.clear()
+            return lines
+        block = bytes(buf[:end])
+        del buf[:end + len(self.newline)]
+        lines = block.split(self.newline)
+        if b"\r" in block:
+            lines = [line.rstrip(b"\r") for line in lines]
+        return lines
+
+    def flush(self):
+        """Return whatever partial line is buffered."""
+        if not self._buf:
+            return []
+        lines = [bytes(self._buf).rstrip(b"\r")]
+        self._buf.clear()
+        return lines
+
+
+class RotatingLogWriter:
+    """
+    Appends lines to `path` from a background thread, rotating to path.1 ..
+    path.N when the file exceeds max_bytes. Lines are written in batches
+    (one write + flush per wake-up), so the reader never blocks on disk.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backups=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="serial-log-writer", daemon=True)
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", newline="\n")
+        self._size = self._file.tell()
+        self._thread.start()
+
+    def write(self, lines):
+        """Queue a batch of already formatted (uncoloured) lines."""
+        if not lines:
+            return
+        try:
+            self._queue.put_nowait(lines)
+        except queue.Full:
+            self.dropped += len(lines)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w" if self.backups <= 0 else "a", encoding="utf-8", newline="\n")
+        self._size = 0
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.extend(item)
+            while not stop:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.extend(item)
+            if batch:
+                text = "\n".join(batch) + "\n"
+                try:
+                    self._file.write(text)
+                    self._file.flush()
+                    self._size += len(text)
+                    if self.max_bytes and self._size >= self.max_bytes:
+                        self._rotate()
+                except Exception as e:
+                    print(f"[SERIAL] Log write failed: {e}", file=sys.stderr)
+            if stop:
+                return
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        if self.dropped:
+            print(f"[SERIAL] Log writer dropped {self.dropped} line(s) (disk too slow).")
+
+
+def _use_color(mode, stream):
+    if mode == "always":
+        return True
+    if mode == "never" or os.environ.get("NO_COLOR"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+class SerialPipeline:
+    """
+    Turns raw serial chunks into output: splits lines, stamps them with the
+    host time of the chunk, applies include/exclude regex filters, colours
+    matches on the console and queues plain lines for the log file.
+
+    Extra consumers (callables taking (timestamp, text)) see every line,
+    before the filters, so metrics stay complete when the console is
+    filtered. A consumer with a close() method is closed with the pipeline.
+    echo=False keeps lines off the console (the log file still gets them).
+    """
+
+    def __init__(self, newline=b"\n", timestamps="wall", include=None, exclude=None,
+                 color="auto", color_rules=DEFAULT_COLOR_RULES, log=None, out=None, echo=True):
+        self.out = out or sys.stdout
+        self.splitter = LineSplitter(newline)
+        self.timestamps = timestamps if timestamps in TIMESTAMP_MODES else "wall"
+        self.include = [re.compile(p) for p in include or ()]
+        self.exclude = [re.compile(p) for p in exclude or ()]
+        self.color = _use_color(color, self.out)
+        self.color_rules = [(re.compile(p), COLORS.get(c, "")) for p, c in color_rules or ()]
+        self.log = log
+        self.echo = echo
+        self.consumers = []
+        self.lines = 0
+        self.bytes = 0
+        self._t0 = None
+
+    def _stamp(self, ts):
+        if self.timestamps == "off":
+            return ""
+        if self._t0 is None:
+            self._t0 = ts
+        if self.timestamps == "relative":
+            return f"{ts - self._t0:10.3f} "
+        return time.strftime("%H:%M:%S", time.localtime(ts)) + f".{int(ts * 1000) % 1000:03d} "
+
+    def _colorize(self, text):
+        for rx, code in self.color_rules:
+            if rx.search(text):
+                return f"{code}{text}{_RESET}"
+        return text
+
+    def _keep(self, text):
+        if self.include and not any(rx.search(text) for rx in self.include):
+            return False
+        return not any(rx.search(text) for rx in self.exclude)
+
+    def feed(self, data, ts=None):
+        """Process one raw chunk read at host time ts (default: now)."""
+        self.bytes += len(data)
+        self._emit(self.splitter.feed(data), time.time() if ts is None else ts)
+
+    def flush(self, ts=None):
+        self._emit(self.splitter.flush(), time.time() if ts is None else ts)
+
+    def _emit(self, raw_lines, ts):
+        if not raw_lines:
+            return
+        stamp = self._stamp(ts)
+        plain = []
+        for raw in raw_lines:
+            text = raw.decode("utf-8", errors="replace")
+            for consumer in self.consumers:
+                consumer(ts, text)
+            if self._keep(text):
+                plain.append(stamp + text)
+        if not plain:
+            return
+        self.lines += len(plain)
+        if self.echo:
+            if self.color:
+                shown = [stamp + self._colorize(line[len(stamp):]) for line in plain]
+            else:
+                shown = plain
+            self.out.write("\n".join(shown) + "\n")
+            self.out.flush()
+        if self.log is not None:
+            self.log.write(plain)
+
+    def close(self):
+        self.flush()
+        for consumer in self.consumers:
+            close = getattr(consumer, "close", None)
+            if close is not None:
+                close()
+        self.consumers = []
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+def read_serial(ser, pipeline, on_chunk=None):
+    """
+    Pump `ser` (a pyserial port) into the pipeline until KeyboardInterrupt
+    or a read error. Reads whatever is waiting (up to READ_CHUNK_MAX) in one
+    call instead of fixed 1 KiB reads. `on_chunk(ts, data)` sees every raw
+    chunk before it is split.
+    """
+    while True:
+        waiting = getattr(ser, "in_waiting", 0) or 0
+        data = ser.read(min(max(waiting, 1), READ_CHUNK_MAX))
+        if not data:
+            continue
+        ts = time.time()
+        if on_chunk is not None:
+            on_chunk(ts, data)
+        pipeline.feed(data, ts)
+
+
+# --- record / replay -------------------------------------------------------
+#
+# Capture file: gzip stream holding a one-line JSON header followed by frames
+# of <float64 host timestamp><uint32 length><raw bytes>. The stream is
+# sync-flushed about once a second, so a capture cut short by a crash or an
+# unplugged cable is still readable up to the last flush.
+
+CAPTURE_MAGIC = b"RFSERIAL1"
+_FRAME = struct.Struct("<dI")
+CAPTURE_FLUSH_S = 1.0
+
+
+class CaptureWriter:
+    """Records raw serial chunks with their host timestamps."""
+
+    def __init__(self, path, meta=None):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.chunks = 0
+        self.bytes = 0
+        self._file = gzip.open(path, "wb", compresslevel=6)
+        header = dict(meta or {})
+        header.setdefault("created", time.time())
+        self._file.write(CAPTURE_MAGIC + b" " + json.dumps(header).encode("utf-8") + b"\n")
+        self._last_flush = time.monotonic()
+
+    def __call__(self, ts, data):
+        """read_serial() on_chunk hook."""
+        self._file.write(_FRAME.pack(ts, len(data)))
+        self._file.write(data)
+        self.chunks += 1
+        self.bytes += len(data)
+        now = time.monotonic()
+        if now - self._last_flush >= CAPTURE_FLUSH_S:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        print(f"[SERIAL] Recorded {self.chunks} chunk(s), {self.bytes} byte(s) to {self.path}")
+
+
+def read_capture(path):
+    """Return (header dict, iterator of (ts, data)) for a capture file."""
+    f = gzip.open(path, "rb")
+    first = f.readline()
+    if not first.startswith(CAPTURE_MAGIC):
+        f.close()
+        raise ValueError(f"{path} is not a serial capture")
+    header = json.loads(first[len(CAPTURE_MAGIC):].strip() or b"{}")
+
+    def frames():
+        with f:
+            while True:
+                try:
+                    head = f.read(_FRAME.size)
+                    if len(head) < _FRAME.size:
+                        return
+                    ts, size = _FRAME.unpack(head)
+                    data = f.read(size)
+                except (EOFError, OSError, zlib.error):
+                    # Truncated capture: stop at the last complete frame.
+                    return
+                if len(data) < size:
+                    return
+                yield ts, data
+
+    return header, frames()
+
+
+def parse_speed(value):
+    """'max' (or 0) -> None, otherwise a positive float multiplier."""
+    if value is None:
+        return 1.0
+    text = str(value).strip().lower()
+    if text in ("max", "0", "inf"):
+        return None
+    if text.endswith("x"):
+        text = text[:-1]
+    speed = float(text)
+    if speed <= 0:
+        raise ValueError(f"invalid replay speed: {value!r}")
+    return speed
+
+
+def replay_capture(path, pipeline, speed=1.0):
+    """
+    Feed a capture through `pipeline` with its original timestamps. speed is a
+    multiplier of the recorded pacing (None = as fast as possible).
+    """
+    header, frames = read_capture(path)
+    start_wall = None
+    start_ts = None
+    chunks = 0
+    last_ts = None
+    for ts, data in frames:
+        if speed is not None:
+            if start_wall is None:
+                start_wall, start_ts = time.monotonic(), ts
+            delay = (ts - start_ts) / speed - (time.monotonic() - start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        pipeline.feed(data, ts)
+        chunks += 1
+        last_ts = ts
+    pipeline.flush(last_ts)
+    return header, chunks
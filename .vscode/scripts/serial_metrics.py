@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structured events and live metrics from rfsuite serial debug lines.
+
+Parses the two line formats the Lua side prints:
+
+  lib/debug_log.lua   [msp] TX 32 {1,2,3} try=1
+                      [msp] RX 32 {..}
+                      [msp] ERR 32 {..} queue_full
+                      [msp] SIM> / SIM< / SIM (simulator)
+  lib/memstats.lua    [mem] tag: lua=812.3KB ramAvail=..KB luaRamAvail=..KB
+                                 bmpRamAvail=..KB stackAvail=..KB
+
+MspMetrics is a SerialPipeline consumer. It pairs TX with the following RX
+for the same command (round-trip time), counts retries (try>1), errors by
+reason, and timeouts, renders a rolling dashboard and exports the events to
+CSV or JSON.
+
+tasks/msp/queue.lua handles one message at a time and does not log when it
+gives up after max_retries. So an outstanding TX is counted as a timeout
+when the next message's TX appears without an RX/ERR in between.
+"""
+
+import collections
+import csv
+import json
+import re
+import time
+
+
+MSP_RE = re.compile(r"\[msp\] (?P<dir>\S+) (?P<cmd>-?\d+|\S+) \{(?P<payload>[^}]*)\}(?: (?P<note>.*))?$")
+MEM_RE = re.compile(r"\[mem\] (?P<tag>.*?): lua=(?P<lua>[\d.]+)KB ramAvail=(?P<ram>[\d.]+)KB "
+                    r"luaRamAvail=(?P<luaram>[\d.]+)KB bmpRamAvail=(?P<bmp>[\d.]+)KB "
+                    r"stackAvail=(?P<stack>[\d.]+)KB")
+_TRY_RE = re.compile(r"\btry=(\d+)\b")
+_TRUNCATED_RE = re.compile(r"\.\.\.\((\d+) bytes\)$")
+
+# Direction aliases: simulator sends/replies count like real TX/RX.
+_DIRS = {"TX": "TX", "SIM>": "TX", "RX": "RX", "SIM<": "RX", "ERR": "ERR", "SIM": "ERR"}
+
+EVENT_FIELDS = ("ts", "kind", "dir", "cmd", "bytes", "try", "note", "rtt_ms",
+                "tag", "lua_kb", "ram_kb", "lua_ram_kb", "bmp_ram_kb", "stack_kb")
+
+RATE_WINDOW_S = 10.0
+MEM_HISTORY = 500
+RTT_HISTORY = 200
+
+
+def _payload_len(payload):
+    payload = payload.strip()
+    if not payload:
+        return 0
+    m = _TRUNCATED_RE.search(payload)
+    if m:
+        return int(m.group(1))
+    return payload.count(",") + 1
+
+
+def parse_line(text, ts=None):
+    """Return an event dict for an [msp] or [mem] line, else None."""
+    if "[msp]" in text:
+        m = MSP_RE.search(text)
+        if not m:
+            return None
+        raw_dir = m.group("dir")
+        cmd = m.group("cmd")
+        note = m.group("note") or ""
+        try_m = _TRY_RE.search(note)
+        return {
+            "ts": ts,
+            "kind": "msp",
+            "dir": _DIRS.get(raw_dir, raw_dir),
+            "raw_dir": raw_dir,
+            "cmd": int(cmd) if cmd.lstrip("-").isdigit() else cmd,
+            "bytes": _payload_len(m.group("payload")),
+            "try": int(try_m.group(1)) if try_m else None,
+            "note": note,
+        }
+    if "[mem]" in text:
+        m = MEM_RE.search(text)
+        if not m:
+            return None
+        return {
+            "ts": ts,
+            "kind": "mem",
+            "tag": m.group("tag"),
+            "lua_kb": float(m.group("lua")),
+            "ram_kb": float(m.group("ram")),
+            "lua_ram_kb": float(m.group("luaram")),
+            "bmp_ram_kb": float(m.group("bmp")),
+            "stack_kb": float(m.group("stack")),
+        }
+    return None
+
+
+class CommandStats:
+    __slots__ = ("tx", "retries", "rx", "timeouts", "errors", "rtts", "tx_times")
+
+    def __init__(self):
+        self.tx = 0
+        self.retries = 0
+        self.rx = 0
+        self.timeouts = 0
+        self.errors = collections.Counter()
+        self.rtts = collections.deque(maxlen=RTT_HISTORY)
+        self.tx_times = collections.deque()
+
+    def rate(self, now):
+        while self.tx_times and now - self.tx_times[0] > RATE_WINDOW_S:
+            self.tx_times.popleft()
+        return len(self.tx_times) / RATE_WINDOW_S
+
+    def summary(self):
+        rtts = sorted(self.rtts)
+        return {
+            "tx": self.tx,
+            "retries": self.retries,
+            "rx": self.rx,
+            "timeouts": self.timeouts,
+            "errors": dict(self.errors),
+            "rtt_ms_avg": round(sum(rtts) / len(rtts), 1) if rtts else None,
+            "rtt_ms_p95": round(_percentile(rtts, 0.95), 1) if rtts else None,
+            "rtt_ms_max": round(rtts[-1], 1) if rtts else None,
+        }
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def _open_export(path):
+    if path.lower().endswith(".csv"):
+        f = open(path, "w", newline="", encoding="utf-8")
+        writer = csv.DictWriter(f, fieldnames=EVENT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        return f, writer
+    return None, None
+
+
+class MspMetrics:
+    """
+    SerialPipeline consumer: turns debug lines into events and keeps rolling
+    metrics. With dashboard=True a summary is redrawn on `out` every
+    `interval` seconds. `export` (a .csv or .json path) receives every event.
+    """
+
+    def __init__(self, dashboard=False, interval=1.0, export=None, out=None, redraw=False):
+        self.dashboard = dashboard
+        self.interval = max(0.1, float(interval))
+        self.out = out
+        self.redraw = redraw
+        self.commands = collections.defaultdict(CommandStats)
+        self.mem = collections.deque(maxlen=MEM_HISTORY)
+        self.events = 0
+        self.first_ts = None
+        self.last_ts = None
+        self._outstanding = None        # (cmd, ts of last attempt)
+        self._tx_times = collections.deque()
+        self._last_render = 0.0
+        self.export = export
+        self._export_events = [] if export and not export.lower().endswith(".csv") else None
+        self._csv_file, self._csv = _open_export(export) if export else (None, None)
+
+    # -- consumer -----------------------------------------------------------
+
+    def __call__(self, ts, text):
+        event = parse_line(text, ts)
+        if event is not None:
+            self.add(event)
+        if self.dashboard and time.monotonic() - self._last_render >= self.interval:
+            self.render_to_out()
+
+    def add(self, event):
+        ts = event["ts"]
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        if event["kind"] == "mem":
+            self.mem.append(event)
+        else:
+            self._add_msp(event)
+        self._record(event)
+
+    def _record(self, event):
+        self.events += 1
+        if self._csv is not None:
+            self._csv.writerow(event)
+        elif self._export_events is not None:
+            self._export_events.append({k: event.get(k) for k in EVENT_FIELDS if event.get(k) is not None})
+
+    def _timeout(self, cmd, ts):
+        self.commands[cmd].timeouts += 1
+        self._record({"ts": ts, "kind": "msp", "dir": "TIMEOUT", "cmd": cmd, "note": "inferred"})
+
+    def _add_msp(self, event):
+        cmd, ts, direction = event["cmd"], event["ts"], event["dir"]
+        stats = self.commands[cmd]
+        pending = self._outstanding
+        if direction == "TX":
+            first_try = (event["try"] or 1) == 1
+            if pending is not None and (pending[0] != cmd or first_try):
+                self._timeout(pending[0], ts)
+            stats.tx += 1
+            if not first_try:
+                stats.retries += 1
+            else:
+                stats.tx_times.append(ts)
+                self._tx_times.append(ts)
+            self._outstanding = (cmd, ts)
+        elif direction == "RX":
+            stats.rx += 1
+            if pending is not None and pending[0] == cmd:
+                rtt = (ts - pending[1]) * 1000.0
+                stats.rtts.append(rtt)
+                event["rtt_ms"] = round(rtt, 1)
+                self._outstanding = None
+        elif direction == "ERR":
+            stats.errors[event["note"] or "error"] += 1
+            if pending is not None and pending[0] == cmd:
+                self._outstanding = None
+
+    # -- reporting ----------------------------------------------------------
+
+    def request_rate(self, now=None):
+        now = self.last_ts if now is None else now
+        if now is None:
+            return 0.0
+        while self._tx_times and now - self._tx_times[0] > RATE_WINDOW_S:
+            self._tx_times.popleft()
+        return len(self._tx_times) / RATE_WINDOW_S
+
+    def mem_trend(self):
+        """Lua heap summary; slope is a least-squares fit in KB/min."""
+        if not self.mem:
+            return None
+        xs = [m["ts"] for m in self.mem]
+        ys = [m["lua_kb"] for m in self.mem]
+        slope = None
+        if len(xs) >= 2 and xs[-1] > xs[0]:
+            mx = sum(xs) / len(xs)
+            my = sum(ys) / len(ys)
+            den = sum((x - mx) ** 2 for x in xs)
+            if den:
+                slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den * 60.0
+        last = self.mem[-1]
+        return {
+            "samples": len(self.mem),
+            "last_tag": last["tag"],
+            "lua_kb": last["lua_kb"],
+            "lua_kb_min": min(ys),
+            "lua_kb_max": max(ys),
+            "lua_kb_per_min": round(slope, 2) if slope is not None else None,
+            "ram_kb": last["ram_kb"],
+            "lua_ram_kb": last["lua_ram_kb"],
+        }
+
+    def summary(self):
+        return {
+            "events": self.events,
+            "duration_s": round(self.last_ts - self.first_ts, 3) if self.first_ts is not None else 0.0,
+            "request_rate": round(self.request_rate(), 2),
+            "commands": {str(cmd): s.summary() for cmd, s in sorted(self.commands.items(), key=lambda kv: str(kv[0]))},
+            "memory": self.mem_trend(),
+        }
+
+    def render(self):
+        now = self.last_ts
+        lines = [f"MSP  {self.request_rate():6.1f} req/s (last {RATE_WINDOW_S:.0f}s)   events {self.events}"]
+        lines.append(f"{'cmd':>6} {'req/s':>6} {'tx':>6} {'retry':>6} {'rx':>6} {'tmo':>5} {'err':>5} "
+                     f"{'rtt avg':>8} {'p95':>7} {'max':>7}")
+        for cmd, stats in sorted(self.commands.items(), key=lambda kv: -kv[1].tx):
+            s = stats.summary()
+            rate = stats.rate(now) if now is not None else 0.0
+
+            def ms(v):
+                return "-" if v is None else f"{v:.0f}"
+            lines.append(f"{cmd!s:>6} {rate:6.1f} {s['tx']:6d} {s['retries']:6d} {s['rx']:6d} "
+                         f"{s['timeouts']:5d} {sum(stats.errors.values()):5d} "
+                         f"{ms(s['rtt_ms_avg']):>8} {ms(s['rtt_ms_p95']):>7} {ms(s['rtt_ms_max']):>7}")
+        mem = self.mem_trend()
+        if mem:
+            slope = "-" if mem["lua_kb_per_min"] is None else f"{mem['lua_kb_per_min']:+.1f}KB/min"
+            lines.append(f"MEM  lua={mem['lua_kb']:.1f}KB (min {mem['lua_kb_min']:.1f}, max {mem['lua_kb_max']:.1f}, "
+                         f"{slope})  ramAvail={mem['ram_kb']:.1f}KB  luaRamAvail={mem['lua_ram_kb']:.1f}KB  "
+                         f"[{mem['last_tag']}]")
+        return "\n".join(lines)
+
+    def render_to_out(self):
+        self._last_render = time.monotonic()
+        if self.out is None:
+            return
+        text = self.render()
+        if self.redraw:
+            self.out.write("\x1b[H\x1b[J" + text + "\n")
+        else:
+            self.out.write("---\n" + text + "\n---\n")
+        self.out.flush()
+
+    def close(self):
+        if self.dashboard:
+            self.render_to_out()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = self._csv = None
+        elif self._export_events is not None:
+            with open(self.export, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.summary(), "events": self._export_events}, f, indent=1)
+            self._export_events = None
+        if self.export:
+            print(f"[SERIAL] Wrote {self.events} event(s) to {self.export}")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel verify shared by deploy.py and its step scripts.
+
+resolve_workers() picks how many threads may stat/hash files at once: an
+explicit count, else env DEPLOY_VERIFY_WORKERS (how deploy.py hands its
+choice to subprocess steps), else 1 for radio targets (slow FAT media hates
+concurrent reads) and a CPU-based count for local disks. run_verify() applies
+a check to every item with that many threads and returns the results in
+input order.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from tqdm import tqdm
+except Exception:
+    tqdm = None
+
+
+VERIFY_WORKERS_LOCAL_MAX = 8
+
+
+def resolve_workers(configured=None, radio=True):
+    """Worker count for a radio (slow) or local (fast) target."""
+    if configured is None:
+        env = os.environ.get("DEPLOY_VERIFY_WORKERS", "").strip()
+        if env:
+            try:
+                configured = int(env)
+            except ValueError:
+                print(f"[WARN] Ignoring invalid DEPLOY_VERIFY_WORKERS={env!r}")
+    if configured is not None:
+        return max(1, configured)
+    if radio:
+        return 1
+    return max(1, min(VERIFY_WORKERS_LOCAL_MAX, os.cpu_count() or 1))
+
+
+def run_verify(items, check, workers=1, desc="Verifying (MD5)"):
+    """
+    Apply check(item) to every item with up to `workers` threads.
+
+    Results come back in input order so the resulting copy plan is identical
+    to a sequential run; the tqdm bar advances as checks complete.
+    """
+    items = list(items)
+    if not items:
+        return []
+    bar = tqdm(total=len(items), desc=desc) if tqdm is not None else None
+    try:
+        if workers <= 1 or len(items) == 1:
+            results = []
+            for item in items:
+                results.append(check(item))
+                if bar is not None:
+                    bar.update(1)
+            return results
+
+        results = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(check, item): i for i, item in enumerate(items)}
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+                if bar is not None:
+                    bar.update(1)
+        return results
+    finally:
+        if bar is not None:
+            bar.close()